@@ -1,16 +1,18 @@
 import re
+import time
 from datetime import datetime
 
 import settings
-from settings import ASYNCOPENAI as CLIENT
-from vectordb.RAG_utils import insertToMemory, retrieveMemoriesWithContext
+
+from event_system.Trace import Trace, traced
 
 
 async def get_response(messages: list, model=settings.chat_model):
     if messages is None:
         raise ValueError("messages cannot be None")
 
-    response = await CLIENT.chat.completions.create(model=model, messages=messages)
+    # the client is created on first use, see settings
+    response = await settings.ASYNCOPENAI.chat.completions.create(model=model, messages=messages)
 
     return response.choices[0].message.content
 
@@ -19,7 +21,7 @@ async def get_response_stream(messages: list, model=settings.chat_model):
     if messages is None:
         raise ValueError("messages cannot be None")
 
-    async for response in await CLIENT.chat.completions.create(
+    async for response in await settings.ASYNCOPENAI.chat.completions.create(
         model=model, messages=messages, stream=True
     ):
         yield response.choices[0].delta.content
@@ -76,13 +78,15 @@ class ConversationSession:
         self.current_context_messages: list[dict[str, str]] = []
         self.memory = {}
 
-    async def stream_query(self, message: str, buffer_size: int):
+    async def stream_query(self, message: str, buffer_size: int, trace: Trace | None = None):
         """
         Asynchronously streams a query message and processes response chunks.
 
         Args:
             message (str): The query message to be sent.
             buffer_size (int): The size of the buffer to accumulate response chunks before processing.
+            trace (Trace | None): If given, the context building and the wait for the first token
+                are recorded on it as the ltm_retrieval and llm_first_token stages.
 
         Yields:
             str: Concatenated response chunks that are processed and stored.
@@ -94,8 +98,14 @@ class ConversationSession:
         self._add_message_to_history(message)
         buffer = []
         buffer_length = 0
-        async for response_chunk in get_response_stream(await self.get_context()):
+        with traced(trace, "ltm_retrieval"):
+            context = await self.get_context()
+        request_started_ns = time.perf_counter_ns()
+        async for response_chunk in get_response_stream(context):
             if response_chunk:
+                if isinstance(trace, Trace) and request_started_ns:
+                    trace.record("llm_first_token", request_started_ns)
+                    request_started_ns = 0
                 buffer.append(response_chunk)
                 buffer_length += len(response_chunk)
                 if re.search(r"[.!?]", response_chunk) or (
@@ -135,6 +145,9 @@ class ConversationSession:
         return context
 
     async def get_long_term_memory(self):
+        # imported on first use, since the vector database is slow to import
+        from vectordb.RAG_utils import retrieveMemoriesWithContext
+
         memory_chunks = await retrieveMemoriesWithContext(
             self.most_recent_message()["content"],
             settings.ltm_retrieval_count,
@@ -161,6 +174,8 @@ class ConversationSession:
         if memory_response is None:
             return
 
+        from vectordb.RAG_utils import insertToMemory
+
         await insertToMemory(
             memory_response, "\n".join([message_dict_to_string(message) for message in messages])
         )
@@ -0,0 +1,290 @@
+import gc
+import sys
+import threading
+from collections.abc import Callable
+from typing import Any
+
+import numpy as np
+from pydub import AudioSegment
+
+from Transcribers import Transcriber
+from TTS import TextToSpeech
+
+ModelKey = tuple[Callable[..., Any], tuple[Any, ...], tuple[tuple[str, Any], ...]]
+
+
+class _LoadedModel:
+    """A model in the registry, with the number of leases on it."""
+
+    __slots__ = ("model", "references", "lock", "warmed", "loaded", "error")
+
+    def __init__(self):
+        self.model: Any = None
+        self.references = 0
+        # serializes every call into the model, since the pipes sharing it call it from their own
+        # worker threads
+        self.lock = threading.Lock()
+        self.warmed = False
+        # set once the factory has returned or raised, which `error` is set to if it did
+        self.loaded = threading.Event()
+        self.error: BaseException | None = None
+
+
+class ModelRegistry:
+    """
+    Process-wide registry of loaded models, so that pipes configured with the same model share one
+    instance instead of each loading their own copy.
+
+    Models are keyed by their factory (usually the model class) and the arguments it's called with.
+    Each :meth:`transcriber` or :meth:`text_to_speech` call returns a new lease on the shared model,
+    which implements the usual Transcriber or TextToSpeech interface and serializes calls into the
+    model. A model is unloaded when the last lease on it is released.
+
+    Example:
+        graph.add("speech_input", SpeechToTextInput,
+                  transcriber=Deferred(shared_transcriber, Transcribers.FasterWhisperTranscriber))
+    """
+
+    _instance: "ModelRegistry | None" = None
+
+    def __init__(self):
+        self._models: dict[ModelKey, _LoadedModel] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def get(cls) -> "ModelRegistry":
+        """
+        Returns the process-wide registry.
+        """
+        if cls._instance is None:
+            cls._instance = ModelRegistry()
+        return cls._instance
+
+    def transcriber(
+        self, factory: Callable[..., Transcriber], *args: Any, **kwargs: Any
+    ) -> "SharedTranscriber":
+        """
+        Returns a lease on the transcriber `factory(*args, **kwargs)` creates, loading it if no
+        lease on it is held yet. The arguments must be hashable.
+        """
+        key, loaded = self._acquire(factory, args, kwargs)
+        return SharedTranscriber(self, key, loaded)
+
+    def text_to_speech(
+        self, factory: Callable[..., TextToSpeech], *args: Any, **kwargs: Any
+    ) -> "SharedTextToSpeech":
+        """
+        Returns a lease on the text to speech model `factory(*args, **kwargs)` creates, loading it
+        if no lease on it is held yet. The arguments must be hashable.
+        """
+        key, loaded = self._acquire(factory, args, kwargs)
+        return SharedTextToSpeech(self, key, loaded)
+
+    def loaded(self) -> dict[ModelKey, int]:
+        """
+        Returns the loaded models' keys with the number of leases on each.
+        """
+        with self._lock:
+            return {key: loaded.references for key, loaded in self._models.items()}
+
+    def unload_all(self):
+        """
+        Unloads every model, whether or not leases on it are still held. Leases on an unloaded
+        model raise RuntimeError when they're used.
+        """
+        with self._lock:
+            models = list(self._models.values())
+            self._models.clear()
+        for loaded in models:
+            loaded.references = 0
+            _unload(loaded)
+
+    def _acquire(
+        self, factory: Callable[..., Any], args: tuple[Any, ...], kwargs: dict[str, Any]
+    ) -> tuple[ModelKey, _LoadedModel]:
+        key = (factory, args, tuple(sorted(kwargs.items())))
+        try:
+            hash(key)
+        except TypeError as e:
+            raise TypeError(f"shared model arguments must be hashable: {e}") from None
+
+        # the first pipe to acquire a model registers it and loads it, outside of the lock so that
+        # other models can be acquired meanwhile. Pipes acquiring the same model wait for it.
+        with self._lock:
+            loaded = self._models.get(key)
+            loads = loaded is None
+            if loads:
+                loaded = self._models[key] = _LoadedModel()
+            loaded.references += 1
+
+        if loads:
+            self._load(key, loaded, factory, args, kwargs)
+        else:
+            loaded.loaded.wait()
+            if loaded.error is not None:
+                raise RuntimeError(f"loading {factory.__name__} failed") from loaded.error
+        return key, loaded
+
+    def _load(
+        self,
+        key: ModelKey,
+        loaded: _LoadedModel,
+        factory: Callable[..., Any],
+        args: tuple[Any, ...],
+        kwargs: dict[str, Any],
+    ):
+        try:
+            loaded.model = factory(*args, **kwargs)
+        except BaseException as e:
+            loaded.error = e
+            # the next acquire tries loading it again
+            with self._lock:
+                if self._models.get(key) is loaded:
+                    del self._models[key]
+            raise
+        finally:
+            loaded.loaded.set()
+
+    def _release(self, key: ModelKey, loaded: _LoadedModel):
+        with self._lock:
+            if self._models.get(key) is not loaded:
+                return
+            loaded.references -= 1
+            if loaded.references > 0:
+                return
+            del self._models[key]
+        _unload(loaded)
+
+
+def _unload(loaded: _LoadedModel):
+    with loaded.lock:
+        model, loaded.model = loaded.model, None
+
+    # e.g. RemoteTranscriber, which stops its worker process
+    close = getattr(model, "close", None)
+    if close is not None:
+        close()
+    del model
+    gc.collect()
+
+    # only if a model already imported torch
+    torch = sys.modules.get("torch")
+    if torch is not None and torch.cuda.is_available():
+        torch.cuda.empty_cache()
+
+
+class SharedModel:
+    """
+    A lease on a model in the :class:`ModelRegistry`.
+    """
+
+    def __init__(self, registry: ModelRegistry, key: ModelKey, loaded: _LoadedModel):
+        self._registry = registry
+        self._key = key
+        self._loaded: _LoadedModel | None = loaded
+
+    def release(self):
+        """
+        Gives up the lease, unloading the model if it was the last one. Safe to call twice.
+        """
+        loaded, self._loaded = self._loaded, None
+        if loaded is not None:
+            self._registry._release(self._key, loaded)
+
+    def _model(self) -> tuple[Any, threading.Lock]:
+        loaded = self._loaded
+        if loaded is None or loaded.model is None:
+            raise RuntimeError(f"{self._key[0].__name__} lease was released or unloaded.")
+        return loaded.model, loaded.lock
+
+    def _warm_up(self):
+        loaded = self._loaded
+        model, lock = self._model()
+        with lock:
+            # the first lease to warm up warms the model up for all of them
+            if not loaded.warmed:
+                model.warmup()
+                loaded.warmed = True
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._key[0].__name__})"
+
+
+class SharedTranscriber(SharedModel, Transcriber):
+    """
+    A Transcriber that shares a transcriber in the :class:`ModelRegistry` with other pipes.
+    """
+
+    def __init__(self, registry: ModelRegistry, key: ModelKey, loaded: _LoadedModel):
+        super().__init__(registry, key, loaded)
+        self.tags: list[str] | None = None
+
+    def transcribe_speech(self, speech_buffer: AudioSegment, input_gain=1.0) -> str:
+        model, lock = self._model()
+        with lock:
+            text = model.transcribe_speech(speech_buffer, input_gain)
+            # read while the lock is held, before another lease transcribes something else
+            self.tags = model.get_extra_tagging() if model.supports_extra_tagging() else None
+        return text
+
+    def transcribe_samples(self, samples: np.ndarray, input_gain=1.0) -> str:
+        model, lock = self._model()
+        with lock:
+            text = model.transcribe_samples(samples, input_gain)
+            self.tags = model.get_extra_tagging() if model.supports_extra_tagging() else None
+        return text
+
+    def warmup(self) -> None:
+        self._warm_up()
+
+    def supports_extra_tagging(self) -> bool:
+        # whether the last transcription made through this lease came with tags
+        return self.tags is not None
+
+    def get_extra_tagging(self) -> list[str]:
+        if self.tags is None:
+            raise RuntimeError("Extra tagging not supported by the shared transcriber")
+        return list(self.tags)
+
+
+class SharedTextToSpeech(SharedModel, TextToSpeech):
+    """
+    A TextToSpeech that shares a text to speech model in the :class:`ModelRegistry` with other
+    pipes.
+    """
+
+    def generate_speech(self, text: str) -> AudioSegment | None:
+        model, lock = self._model()
+        with lock:
+            return model.generate_speech(text)
+
+    def warmup(self) -> None:
+        self._warm_up()
+
+
+def shared_transcriber(
+    factory: Callable[..., Transcriber], *args: Any, **kwargs: Any
+) -> SharedTranscriber:
+    """
+    Returns a lease on a transcriber shared through the process-wide :class:`ModelRegistry`.
+    """
+    return ModelRegistry.get().transcriber(factory, *args, **kwargs)
+
+
+def shared_text_to_speech(
+    factory: Callable[..., TextToSpeech], *args: Any, **kwargs: Any
+) -> SharedTextToSpeech:
+    """
+    Returns a lease on a text to speech model shared through the process-wide
+    :class:`ModelRegistry`.
+    """
+    return ModelRegistry.get().text_to_speech(factory, *args, **kwargs)
+
+
+def release_model(model: Any):
+    """
+    Releases `model` if it's a lease on a shared model, and does nothing otherwise. For pipes
+    closing down, which don't know whether they were given a shared model.
+    """
+    if isinstance(model, SharedModel):
+        model.release()
@@ -0,0 +1,350 @@
+import asyncio
+import itertools
+import multiprocessing
+import threading
+import traceback
+from concurrent.futures import Future
+from multiprocessing.connection import Connection
+from typing import Callable
+
+import numpy as np
+from pydub import AudioSegment
+from settings import INPUT_SAMPLING_RATE
+
+from event_system import Event, EventBus, EventBusSingleton
+from event_system.EventBridge import EventBridge
+from event_system.EventCodec import EventCodec
+from event_system.events.Inference import (
+    ModelErrorEvent,
+    ModelReadyEvent,
+    SpeechSynthesisRequest,
+    SpeechSynthesisResult,
+    TranscriptionRequest,
+    TranscriptionResult,
+)
+from Transcribers import Transcriber
+from TTS import TextToSpeech
+
+# both processes encode with this codec, so the list of event types must not depend on runtime state
+INFERENCE_CODEC = EventCodec(
+    [
+        TranscriptionRequest,
+        TranscriptionResult,
+        SpeechSynthesisRequest,
+        SpeechSynthesisResult,
+        ModelReadyEvent,
+        ModelErrorEvent,
+    ]
+)
+
+_process_ids = itertools.count()
+
+
+class RemoteModelError(RuntimeError):
+    """
+    Raised by :meth:`RemoteModelProcess.request` when handling the request raised an exception in
+    the child process. The message includes the child's traceback.
+    """
+
+
+class RemoteModelProcess:
+    """
+    Hosts a model in a child process and exchanges request and result events with it over an
+    :class:`EventBridge`, so inference runs on its own core instead of competing with the event loop
+    for the GIL.
+
+    The child process is started with the "spawn" method, so `factory` (usually a model class) must be
+    importable by the child. Requests are handled one at a time, in order.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], object],
+        request_type: type[Event],
+        result_type: type[Event],
+        handle: Callable[[object, Event], Event],
+        prepare: Callable[[object], None] | None = None,
+        request_timeout: float | None = 120.0,
+    ):
+        """
+        Parameters:
+        factory (Callable): creates the model in the child process
+        request_type (type[Event]): the event type sent to the child, with `model` and `request_id` fields
+        result_type (type[Event]): the event type the child answers with, with the same fields
+        handle (Callable): a module-level function run in the child that turns a request into a result
+        prepare (Callable | None): a module-level function run in the child once the model is loaded
+        request_timeout (float | None): the seconds a request may take before it raises TimeoutError,
+            or None to wait indefinitely
+        """
+        self.name = f"{getattr(factory, '__name__', 'model')}-{next(_process_ids)}"
+        self.request_type = request_type
+        self.request_timeout = request_timeout
+
+        context = multiprocessing.get_context("spawn")
+        local, remote = context.Pipe()
+        self.process = context.Process(
+            target=_serve,
+            args=(remote, self.name, factory, request_type, result_type, handle, prepare),
+            name=self.name,
+            daemon=True,
+        )
+        self.process.start()
+        remote.close()
+
+        self._request_ids = itertools.count()
+        self._pending: dict[int, Future] = {}
+        self._lock = threading.Lock()
+        # set once the child process has loaded and prepared the model
+        self.ready = threading.Event()
+
+        bus = EventBusSingleton.get()
+        bus.subscribe(result_type(model=self.name), self._on_result)
+        bus.subscribe(ModelErrorEvent(model=self.name), self._on_error)
+        bus.subscribe(ModelReadyEvent(model=self.name), lambda event: self.ready.set())
+        self.bridge = EventBridge(
+            bus,
+            local,
+            INFERENCE_CODEC,
+            forward=[request_type(model=self.name)],
+            on_disconnect=self._on_disconnect,
+        )
+        self.bridge.start()
+
+    def request(self, **fields) -> Event:
+        """
+        Sends a request to the child process and blocks until its result arrives.
+
+        This must be called from a worker thread, since the result is delivered by the event loop.
+
+        Raises:
+            RuntimeError: If called on a thread running an event loop, or if the child process exited.
+            RemoteModelError: If handling the request raised an exception in the child process.
+            TimeoutError: If the result didn't arrive within `request_timeout` seconds.
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            pass
+        else:
+            raise RuntimeError(
+                f"{self.name} requests block, so they can't be made from the event loop."
+            )
+
+        future: Future = Future()
+        with self._lock:
+            if self.bridge.disconnected.is_set():
+                raise RuntimeError(f"{self.name} process has exited.")
+            request_id = next(self._request_ids)
+            self._pending[request_id] = future
+
+        EventBusSingleton.publish_threadsafe(
+            self.request_type(model=self.name, request_id=request_id, **fields)
+        )
+        try:
+            return future.result(timeout=self.request_timeout)
+        except TimeoutError:
+            # a result that arrives later is ignored
+            with self._lock:
+                self._pending.pop(request_id, None)
+            raise TimeoutError(
+                f"{self.name} didn't answer request {request_id} within {self.request_timeout}s."
+            ) from None
+
+    def wait_until_ready(self):
+        """
+        Blocks until the child process has loaded and prepared the model. Like :meth:`request`,
+        this must be called from a worker thread.
+
+        Raises:
+            RuntimeError: If the child process exited before the model was ready.
+        """
+        while not self.ready.wait(timeout=0.1):
+            if self.bridge.disconnected.is_set():
+                raise RuntimeError(f"{self.name} process exited before its model was ready.")
+
+    def close(self):
+        self.bridge.close()
+        self.process.join(timeout=5)
+
+    def _on_result(self, event: Event):
+        with self._lock:
+            future = self._pending.pop(event.request_id, None)
+        if future is not None:
+            future.set_result(event)
+
+    def _on_error(self, event: ModelErrorEvent):
+        with self._lock:
+            future = self._pending.pop(event.request_id, None)
+        if future is not None:
+            future.set_exception(RemoteModelError(f"{self.name} request failed:\n{event.error}"))
+
+    def _on_disconnect(self):
+        with self._lock:
+            pending = list(self._pending.values())
+            self._pending.clear()
+        for future in pending:
+            future.set_exception(RuntimeError(f"{self.name} process exited during a request."))
+
+
+class RemoteTranscriber(Transcriber):
+    """
+    A Transcriber that runs another Transcriber in a child process.
+
+    Example:
+        RemoteTranscriber(Transcribers.FasterWhisperTranscriber)
+    """
+
+    def __init__(self, transcriber_factory: Callable[[], Transcriber]):
+        """
+        Parameters:
+        transcriber_factory (Callable[[], Transcriber]): creates the transcriber in the child process
+        """
+        super().__init__()
+        self.process = RemoteModelProcess(
+            transcriber_factory,
+            TranscriptionRequest,
+            TranscriptionResult,
+            _transcribe,
+            prepare=_warm_up,
+        )
+        self.tags: tuple[str, ...] | None = None
+
+    def transcribe_speech(self, speech_buffer: AudioSegment, input_gain=1.0) -> str:
+        audio = speech_buffer.set_channels(1).set_sample_width(2)
+        result = self.process.request(
+            audio=audio.raw_data, sample_rate=audio.frame_rate, input_gain=input_gain
+        )
+        self.tags = result.tags
+        return result.text
+
+    def transcribe_samples(self, samples: np.ndarray, input_gain=1.0) -> str:
+        # copied once, into the shared memory block the child reads it from
+        result = self.process.request(
+            audio=samples.tobytes(), sample_rate=INPUT_SAMPLING_RATE, input_gain=input_gain
+        )
+        self.tags = result.tags
+        return result.text
+
+    def warmup(self) -> None:
+        # the child process warms the model up as soon as it has loaded it
+        self.process.wait_until_ready()
+
+    def close(self):
+        self.process.close()
+
+    def supports_extra_tagging(self) -> bool:
+        return self.tags is not None
+
+    def get_extra_tagging(self) -> list[str]:
+        if self.tags is None:
+            raise RuntimeError("Extra tagging not supported by the remote transcriber")
+        return list(self.tags)
+
+
+class RemoteTextToSpeech(TextToSpeech):
+    """
+    A TextToSpeech that runs another TextToSpeech in a child process.
+
+    Example:
+        RemoteTextToSpeech(TTS.MeloTTS)
+    """
+
+    def __init__(self, text_to_speech_factory: Callable[[], TextToSpeech]):
+        """
+        Parameters:
+        text_to_speech_factory (Callable[[], TextToSpeech]): creates the model in the child process
+        """
+        self.process = RemoteModelProcess(
+            text_to_speech_factory,
+            SpeechSynthesisRequest,
+            SpeechSynthesisResult,
+            _synthesize,
+            prepare=_warm_up,
+        )
+
+    def generate_speech(self, text: str) -> AudioSegment | None:
+        result = self.process.request(text=text)
+        if result.audio is None:
+            return None
+
+        return AudioSegment(result.audio, frame_rate=result.frame_rate, sample_width=2, channels=1)
+
+    def warmup(self) -> None:
+        # the child process warms the model up as soon as it has loaded it
+        self.process.wait_until_ready()
+
+    def close(self):
+        self.process.close()
+
+
+def _serve(
+    connection: Connection,
+    name: str,
+    factory: Callable[[], object],
+    request_type: type[Event],
+    result_type: type[Event],
+    handle: Callable[[object, Event], Event],
+    prepare: Callable[[object], None] | None,
+):
+    asyncio.run(_serve_async(connection, name, factory, request_type, result_type, handle, prepare))
+
+
+async def _serve_async(connection, name, factory, request_type, result_type, handle, prepare):
+    loop = asyncio.get_running_loop()
+    bus = EventBus()
+    bus.attach_loop(loop)
+
+    model = factory()
+    if prepare is not None:
+        prepare(model)
+
+    async def on_request(request: Event):
+        try:
+            result = await loop.run_in_executor(None, handle, model, request)
+        except Exception:
+            # answered with the error, so that the request doesn't wait for a result forever
+            result = ModelErrorEvent(name, request.request_id, traceback.format_exc())
+        await bus.publish(result)
+
+    bus.subscribe(request_type(model=name), on_request)
+    bridge = EventBridge(
+        bus,
+        connection,
+        INFERENCE_CODEC,
+        forward=[result_type(model=name), ModelReadyEvent(model=name), ModelErrorEvent(model=name)],
+    )
+    bridge.start()
+    await bus.publish(ModelReadyEvent(name))
+
+    # serve until the parent process closes its end of the connection
+    await loop.run_in_executor(None, bridge.disconnected.wait)
+
+
+def _transcribe(transcriber: Transcriber, request: TranscriptionRequest) -> TranscriptionResult:
+    if request.sample_rate == INPUT_SAMPLING_RATE:
+        samples = np.frombuffer(request.audio, dtype=np.int16)
+        text = transcriber.transcribe_samples(samples, request.input_gain)
+    else:
+        speech = AudioSegment(
+            request.audio, sample_width=2, frame_rate=request.sample_rate, channels=1
+        )
+        text = transcriber.transcribe_speech(speech, request.input_gain)
+    tags = tuple(transcriber.get_extra_tagging()) if transcriber.supports_extra_tagging() else None
+    return TranscriptionResult(request.model, request.request_id, text, tags)
+
+
+def _synthesize(
+    text_to_speech: TextToSpeech, request: SpeechSynthesisRequest
+) -> SpeechSynthesisResult:
+    speech = text_to_speech.generate_speech(request.text)
+    if speech is None:
+        return SpeechSynthesisResult(request.model, request.request_id, None, 0)
+
+    speech = speech.set_channels(1).set_sample_width(2)
+    return SpeechSynthesisResult(
+        request.model, request.request_id, speech.raw_data, speech.frame_rate
+    )
+
+
+def _warm_up(model: Transcriber | TextToSpeech):
+    model.warmup()
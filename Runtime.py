@@ -0,0 +1,51 @@
+import asyncio
+from collections.abc import Callable, Coroutine
+from typing import Any
+
+Main = Callable[[], Coroutine[Any, Any, Any]]
+
+
+def run(main: Main, gui: bool = False, use_uvloop: bool = False) -> Any:
+    """
+    Runs `main` to completion on the event loop the pipeline needs.
+
+    Pipelines with GUI pipes (see :attr:`Pipe.requires_gui`) run on a qasync loop, which drives
+    asyncio from Qt's event loop so that widgets stay responsive. Headless pipelines run on the
+    stock asyncio loop, or on uvloop if it's requested and installed, and never import PyQt5.
+
+    Parameters:
+    main (Callable): creates the coroutine to run, once the loop exists
+    gui (bool): whether the pipeline creates Qt widgets
+    use_uvloop (bool): whether to run a headless pipeline on uvloop
+    """
+    if gui:
+        return run_with_qt(main)
+    return run_headless(main, use_uvloop)
+
+
+def run_headless(main: Main, use_uvloop: bool = False) -> Any:
+    loop_factory = None
+    if use_uvloop:
+        try:
+            import uvloop
+        except ImportError:
+            print("uvloop isn't installed, running on the default asyncio loop")
+        else:
+            loop_factory = uvloop.new_event_loop
+
+    with asyncio.Runner(loop_factory=loop_factory) as runner:
+        return runner.run(main())
+
+
+def run_with_qt(main: Main) -> Any:
+    # imported here so that headless pipelines don't need PyQt5 or load it
+    import qasync
+    from PyQt5.QtWidgets import QApplication
+
+    # initialize pyqt5 event loop
+    # this is necessary for compatibility between asyncio and pyqt5
+    app = QApplication([])
+    loop = qasync.QEventLoop(app)
+    asyncio.set_event_loop(loop)
+    with loop:
+        return loop.run_until_complete(main())
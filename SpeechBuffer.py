@@ -0,0 +1,143 @@
+import collections
+import threading
+
+import numpy as np
+
+
+class SpeechBuffer:
+    """
+    Preallocated ring buffer of 16-bit microphone samples, which keeps a pre-roll of recent audio
+    and the utterance being recorded.
+
+    Every frame is written twice, at its position and one capacity further, so that any span of up
+    to `capacity` samples is contiguous in memory. That way appending costs the same however long
+    the utterance is, and :meth:`utterance` returns a view instead of copying.
+
+    An utterance handed to another thread is held with :meth:`hold_utterance` until that thread
+    calls :meth:`release`. Appending waits rather than overwrite a held utterance, so the thread
+    appending must not be the one that releases.
+
+    Example:
+        buffer = SpeechBuffer(pre_roll_samples=3200, max_utterance_samples=16000 * 60)
+        buffer.append(frame)        # for every frame from the microphone
+        buffer.start_utterance()    # when the VAD detects speech
+        samples = buffer.utterance()
+        buffer.end_utterance()
+    """
+
+    def __init__(
+        self, pre_roll_samples: int, max_utterance_samples: int, headroom_samples: int = 0
+    ):
+        """
+        Parameters:
+        pre_roll_samples (int): how many samples from before the start of an utterance it includes
+        max_utterance_samples (int): the most samples an utterance holds, excluding the pre-roll
+        headroom_samples (int): extra room for the samples appended while utterances are held
+        """
+        self.pre_roll_samples = pre_roll_samples
+        self.max_samples = pre_roll_samples + max_utterance_samples
+        self.capacity = self.max_samples + headroom_samples
+        self._samples = np.zeros(2 * self.capacity, dtype=np.int16)
+        # both count every sample ever appended, the position in the ring is taken modulo capacity
+        self._written = 0
+        self._utterance_start: int | None = None
+
+        # the start of each held utterance, oldest first
+        self._held: collections.deque[int] = collections.deque()
+        self._released = threading.Condition()
+
+    @property
+    def recording(self) -> bool:
+        return self._utterance_start is not None
+
+    @property
+    def full(self) -> bool:
+        """
+        Whether the utterance holds `max_samples` samples, so that the next append would drop its
+        start.
+        """
+        return self.recording and self._written - self._utterance_start >= self.max_samples
+
+    def append(self, frame: bytes):
+        """
+        Appends a frame of 16-bit mono audio. If the utterance is full, its oldest samples are
+        dropped. Waits for held utterances to be released if the frame would overwrite them.
+        """
+        samples = np.frombuffer(frame, dtype=np.int16)
+        if len(samples) > self.capacity:
+            samples = samples[-self.capacity :]
+
+        with self._released:
+            while self._held and self._written + len(samples) - self._held[0] > self.capacity:
+                self._released.wait()
+
+        position = self._written % self.capacity
+        # writes that cross the end of the ring wrap around to its start
+        head = min(len(samples), self.capacity - position)
+        self._samples[position : position + head] = samples[:head]
+        self._samples[self.capacity + position : self.capacity + position + head] = samples[:head]
+        tail = len(samples) - head
+        self._samples[:tail] = samples[head:]
+        self._samples[self.capacity : self.capacity + tail] = samples[head:]
+
+        self._written += len(samples)
+        if self.recording:
+            self._utterance_start = max(self._utterance_start, self._written - self.max_samples)
+
+    def start_utterance(self, pre_roll: bool = True):
+        """
+        Starts recording an utterance, which begins `pre_roll_samples` before the end of the last
+        appended frame, or at the end of it without `pre_roll`.
+        """
+        pre_roll_samples = self.pre_roll_samples if pre_roll else 0
+        self._utterance_start = max(self._written - pre_roll_samples, 0)
+
+    def utterance(self) -> np.ndarray:
+        """
+        Returns the samples of the utterance as a read-only view into the buffer. The view is valid
+        until the buffer has been appended enough samples to wrap around to the utterance's start,
+        so hold or copy it to keep it for longer.
+        """
+        if self._utterance_start is None:
+            return self._samples[:0]
+
+        start = self._utterance_start % self.capacity
+        view = self._samples[start : start + self._written - self._utterance_start]
+        view.flags.writeable = False
+        return view
+
+    def end_utterance(self):
+        """
+        Stops recording. The samples stay in the buffer, and a view from :meth:`utterance` stays
+        valid, until they're overwritten.
+        """
+        self._utterance_start = None
+
+    def hold(self) -> np.ndarray:
+        """
+        Returns the utterance like :meth:`utterance`, except that its samples aren't overwritten
+        until it's released. Recording goes on, e.g. for an interim transcription of the utterance.
+        """
+        utterance = self.utterance()
+        with self._released:
+            # an empty utterance is held too, so that every hold is paired with a release
+            start = self._utterance_start if self.recording else self._written
+            self._held.append(start)
+        return utterance
+
+    def hold_utterance(self) -> np.ndarray:
+        """
+        Stops recording and returns the utterance, held like :meth:`hold`.
+        """
+        utterance = self.hold()
+        self.end_utterance()
+        return utterance
+
+    def release(self):
+        """
+        Releases the oldest held utterance.
+        """
+        with self._released:
+            if self._held:
+                self._held.popleft()
+            self._released.notify_all()
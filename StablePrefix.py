@@ -0,0 +1,66 @@
+import collections
+import string
+
+
+class StablePrefix:
+    """
+    Commits the words that the interim transcripts of an utterance agree on, so that a word that was
+    published as stable is never taken back.
+
+    Interim transcripts re-decode the utterance as it grows, and their last words change while the
+    speaker is mid-word or mid-sentence. A word is committed once the last `agreement` transcripts
+    agree on it and on every word before it. When the speaker stops, :meth:`finalize` keeps the
+    committed words and takes the rest from the final transcript.
+
+    Example:
+        prefix = StablePrefix()
+        prefix.update("the quick")            # ("", "the quick")
+        prefix.update("the quick brown fax")  # ("the quick", "brown fax")
+        prefix.finalize("the quick brown fox jumps")
+    """
+
+    def __init__(self, agreement: int = 2):
+        """
+        Parameters:
+        agreement (int): how many transcripts in a row must agree on a word before it's committed
+        """
+        self.agreement = agreement
+        self.committed: list[str] = []
+        self.finalized = False
+        self._hypotheses: collections.deque[list[str]] = collections.deque(maxlen=agreement)
+
+    def update(self, transcript: str) -> tuple[str, str]:
+        """
+        Adds an interim transcript of the utterance so far, and returns its committed words and the
+        words after them that may still change.
+        """
+        words = transcript.split()
+        self._hypotheses.append(words)
+
+        if len(self._hypotheses) == self.agreement:
+            # the words after the committed ones, in each of the last transcripts
+            tails = [hypothesis[len(self.committed) :] for hypothesis in self._hypotheses]
+            for candidates in zip(*tails):
+                if len({_normalize(word) for word in candidates}) > 1:
+                    break
+                # the newest transcript has the newest punctuation and casing
+                self.committed.append(candidates[-1])
+
+        return " ".join(self.committed), " ".join(words[len(self.committed) :])
+
+    def finalize(self, transcript: str) -> str:
+        """
+        Returns the utterance's final transcript: the committed words, followed by the words of
+        `transcript` after them.
+        """
+        self.finalized = True
+        words = self.committed + transcript.split()[len(self.committed) :]
+        return " ".join(words)
+
+
+_PUNCTUATION = str.maketrans("", "", string.punctuation)
+
+
+def _normalize(word: str) -> str:
+    # transcripts of the same words differ in punctuation and casing as the sentence grows
+    return word.translate(_PUNCTUATION).lower()
@@ -1,12 +1,15 @@
 from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING
 
 import numpy as np
-import torch
-from melo.api import TTS as meloModel
 from overrides import override
 from pydub import AudioSegment
 
-from settings import device, language, model_id, sample_rate_out, speaker
+import settings
+from settings import language, model_id, sample_rate_out, speaker
+
+if TYPE_CHECKING:
+    import torch
 
 
 class TextToSpeech(ABC):
@@ -33,10 +36,13 @@ class SileroTTS(TextToSpeech):
         self.speaker = speaker
         self.sample_rate = sample_rate
 
+        # imported here so that only the configured backend is loaded
+        import torch
+
         self.model, _ = torch.hub.load(
             "snakers4/silero-models", "silero_tts", language=language, speaker=model_id
         )
-        self.model.to(device)
+        self.model.to(settings.device)
 
     @override
     def warmup(self) -> None:
@@ -54,7 +60,7 @@ class SileroTTS(TextToSpeech):
     @override
     def generate_speech(self, text: str) -> AudioSegment | None:
         try:
-            audio_tensor: torch.Tensor = self.model.apply_tts(
+            audio_tensor: "torch.Tensor" = self.model.apply_tts(
                 text, speaker=self.speaker, sample_rate=self.sample_rate
             )
         except Exception as e:
@@ -83,7 +89,10 @@ class MeloTTS(TextToSpeech):
         self.speaker = speaker
         self.sample_rate = sample_rate
 
-        self.model = meloModel(language="EN", device=device.type)
+        # imported here so that only the configured backend is loaded
+        from melo.api import TTS as meloModel
+
+        self.model = meloModel(language="EN", device=settings.device.type)
         self.speaker_ids = self.model.hps.data.spk2id
 
     @override
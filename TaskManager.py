@@ -1,22 +1,300 @@
 import asyncio
+import time
+import traceback
+from collections.abc import Callable, Coroutine
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any
 
-from event_system import EventBusSingleton
-from event_system.events.System import TaskCreatedEvent
+from event_system import EventBusSingleton, EventParameterFlag
+from event_system.events.System import CommandEvent, CommandType, RestartPolicy, TaskCreatedEvent
+
+
+class TaskState(Enum):
+    RUNNING = 1
+    BACKING_OFF = 2
+    """The task ended and waits to be restarted."""
+    FINISHED = 3
+    FAILED = 4
+    CANCELLED = 5
+
+
+@dataclass(slots=True)
+class TaskHealth:
+    """
+    A snapshot of a supervised task, see :meth:`TaskManager.health`.
+
+    Parameters:
+    name (str): the pretty sender of the task
+    state (TaskState): what the task is doing
+    restart_policy (RestartPolicy): when the task is restarted
+    restarts (int): how often the task was restarted
+    failures (int): how often the task raised an exception
+    run_time (float): the seconds the task has run for, over all its restarts
+    last_error (str | None): the last exception the task raised, if any
+    """
+
+    name: str
+    state: TaskState
+    restart_policy: RestartPolicy
+    restarts: int
+    failures: int
+    run_time: float
+    last_error: str | None
+
+
+class SupervisedTask:
+    """
+    A task registered with the :class:`TaskManager`, along with how to restart it.
+    """
+
+    def __init__(
+        self,
+        task: asyncio.Task,
+        name: str,
+        restart_policy: RestartPolicy,
+        restart: Callable[[], Coroutine[Any, Any, Any]] | None,
+    ):
+        self.task = task
+        self.name = name
+        self.restart_policy = restart_policy
+        self.restart = restart
+
+        self.state = TaskState.RUNNING
+        self.restarts = 0
+        self.failures = 0
+        # failures since the task last ran for longer than the manager's stable_after
+        self.consecutive_failures = 0
+        self.last_error: str | None = None
+        self.run_time = 0.0
+        self.started = time.monotonic()
+
+    def health(self) -> TaskHealth:
+        run_time = self.run_time
+        if self.state is TaskState.RUNNING:
+            run_time += time.monotonic() - self.started
+
+        return TaskHealth(
+            self.name,
+            self.state,
+            self.restart_policy,
+            self.restarts,
+            self.failures,
+            run_time,
+            self.last_error,
+        )
 
 
 class TaskManager:
-    def __init__(self):
-        self.tasks = []
-        EventBusSingleton.subscribe(TaskCreatedEvent, self.on_task_created)
+    """
+    Supervises the long-running tasks of the pipes, which register them with a TaskCreatedEvent.
+
+    A task that ends is restarted according to its restart policy, after a delay that starts at
+    `initial_backoff` and doubles with every failure in a row, up to `max_backoff`. A task that ran
+    for `stable_after` seconds before failing is restarted after the initial delay again. Every
+    task's state, restarts, failures and run time can be read with :meth:`health`.
+
+    On CommandEvent(STOP), tasks are no longer restarted, and tasks that haven't ended
+    `shutdown_deadline` seconds later are cancelled.
+    """
+
+    def __init__(
+        self,
+        shutdown_deadline: float = 5.0,
+        initial_backoff: float = 0.01,
+        max_backoff: float = 10.0,
+        stable_after: float = 30.0,
+    ):
+        """
+        Parameters:
+        shutdown_deadline (float): the seconds tasks get to end by themselves after STOP
+        initial_backoff (float): the seconds to wait before restarting a task for the first time
+        max_backoff (float): the longest the delay before a restart grows to
+        stable_after (float): the seconds a task must run for before its backoff is reset
+        """
+        self.shutdown_deadline = shutdown_deadline
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+        self.stable_after = stable_after
+
+        self.tasks: list[SupervisedTask] = []
+        self._supervisors: set[asyncio.Task] = set()
+        self._stop_requested = asyncio.Event()
+
+        self._subscriptions = [
+            EventBusSingleton.subscribe(TaskCreatedEvent, self.on_task_created),
+            EventBusSingleton.subscribe(CommandEvent(CommandType.STOP), self.on_stop),
+        ]
+
+    @property
+    def stopping(self) -> bool:
+        return self._stop_requested.is_set()
 
     def on_task_created(self, event: TaskCreatedEvent):
         if not isinstance(event.pretty_sender, str) or not isinstance(event.task, asyncio.Task):
             return
-        
+
+        restart_policy = event.restart_policy
+        if restart_policy is EventParameterFlag.NOT_SPECIFIED:
+            restart_policy = RestartPolicy.NEVER
+        restart = event.restart if callable(event.restart) else None
+        if restart_policy is not RestartPolicy.NEVER and restart is None:
+            print(f"Task for {event.pretty_sender} can't be restarted without a restart callable")
+            restart_policy = RestartPolicy.NEVER
+
         print("Task registered for " + event.pretty_sender)
-        self.tasks.append(event.task)
+        supervised = SupervisedTask(event.task, event.pretty_sender, restart_policy, restart)
+        self.tasks.append(supervised)
+
+        supervisor = asyncio.create_task(self._supervise(supervised))
+        self._supervisors.add(supervisor)
+        supervisor.add_done_callback(self._supervisors.discard)
+
+    def on_stop(self, event: CommandEvent):
+        self._stop_requested.set()
+
+    def close(self):
+        """
+        Stops listening for new tasks and commands. Supervised tasks keep running.
+        """
+        for subscription in self._subscriptions:
+            subscription.cancel()
+        self._subscriptions = []
+
+    def health(self) -> list[TaskHealth]:
+        """
+        Returns a snapshot of every supervised task, in the order they were registered.
+        """
+        return [supervised.health() for supervised in self.tasks]
+
+    def report(self) -> str:
+        """
+        Formats :meth:`health` as a table.
+        """
+        lines = [f"{'task':<28}{'state':<13}{'restarts':>9}{'failures':>9}{'run time':>10}"]
+        for health in self.health():
+            lines.append(
+                f"{health.name:<28}{health.state.name.lower():<13}{health.restarts:>9}"
+                f"{health.failures:>9}{health.run_time:>9.1f}s"
+            )
+            if health.last_error is not None:
+                lines.append(f"  last error: {health.last_error}")
+        return "\n".join(lines)
 
     async def run(self):
-        await asyncio.gather(*self.tasks)
+        """
+        Supervises the registered tasks until they have all ended, or until STOP and the shutdown
+        that follows it.
+        """
+        stop_requested = asyncio.create_task(self._stop_requested.wait())
+        try:
+            # tasks may be registered while running, so the set is read again after every wait
+            while self._supervisors and not self.stopping:
+                await asyncio.wait(
+                    {*self._supervisors, stop_requested}, return_when=asyncio.FIRST_COMPLETED
+                )
+        finally:
+            stop_requested.cancel()
+
+        if self.stopping:
+            await self.shutdown()
 
         print("All tasks gathered")
+
+    async def shutdown(self):
+        """
+        Stops restarting tasks, waits up to `shutdown_deadline` seconds for them to end and then
+        cancels the rest.
+        """
+        self._stop_requested.set()
+        if not self._supervisors:
+            return
+
+        _, pending = await asyncio.wait(set(self._supervisors), timeout=self.shutdown_deadline)
+        if not pending:
+            return
+
+        running = [supervised.name for supervised in self.tasks if not supervised.task.done()]
+        names = ", ".join(running)
+        print(f"Cancelling tasks that didn't stop within {self.shutdown_deadline}s: {names}")
+        for supervisor in pending:
+            supervisor.cancel()
+        # a task that suppresses its cancellation is abandoned rather than blocking shutdown
+        _, pending = await asyncio.wait(pending, timeout=1.0)
+        if pending:
+            print(f"{len(pending)} tasks ignored their cancellation")
+
+    async def _supervise(self, supervised: SupervisedTask):
+        while True:
+            error: BaseException | None = None
+            try:
+                await supervised.task
+            except asyncio.CancelledError:
+                # cancelled by the shutdown deadline, or by its pipe. Either way the task is over,
+                # so the supervisor ends normally rather than propagating the cancellation
+                supervised.state = TaskState.CANCELLED
+                supervised.task.cancel()
+            except Exception as e:
+                error = e
+
+            ran_for = time.monotonic() - supervised.started
+            supervised.run_time += ran_for
+            if supervised.state is TaskState.CANCELLED:
+                return
+
+            self._record_outcome(supervised, error)
+            delay = self._restart_delay(supervised, error, ran_for)
+            if delay is None:
+                return
+
+            supervised.state = TaskState.BACKING_OFF
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                supervised.state = TaskState.CANCELLED
+                return
+            if self.stopping:
+                supervised.state = TaskState.FINISHED if error is None else TaskState.FAILED
+                return
+
+            print(f"Restarting task for {supervised.name} after {delay * 1000:.0f}ms")
+            supervised.task = asyncio.create_task(supervised.restart())
+            supervised.restarts += 1
+            supervised.state = TaskState.RUNNING
+            supervised.started = time.monotonic()
+
+    def _record_outcome(self, supervised: SupervisedTask, error: BaseException | None):
+        if error is None:
+            supervised.state = TaskState.FINISHED
+            return
+
+        supervised.state = TaskState.FAILED
+        supervised.failures += 1
+        supervised.last_error = repr(error)
+        print(f"Task for {supervised.name} failed:")
+        traceback.print_exception(error)
+
+    def _restart_delay(
+        self, supervised: SupervisedTask, error: BaseException | None, ran_for: float
+    ) -> float | None:
+        """
+        Returns how long to back off before restarting the task that ended, or None if it isn't
+        restarted. The delay doubles with every failure in a row, unless the task ran for
+        `stable_after` seconds first.
+        """
+        if not self._should_restart(supervised, error):
+            return None
+
+        if ran_for >= self.stable_after:
+            supervised.consecutive_failures = 0
+        delay = min(self.initial_backoff * 2**supervised.consecutive_failures, self.max_backoff)
+        if error is not None:
+            supervised.consecutive_failures += 1
+        return delay
+
+    def _should_restart(self, supervised: SupervisedTask, error: BaseException | None) -> bool:
+        if self.stopping:
+            return False
+        if supervised.restart_policy is RestartPolicy.ALWAYS:
+            return True
+        return supervised.restart_policy is RestartPolicy.ON_FAILURE and error is not None
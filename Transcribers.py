@@ -1,11 +1,10 @@
 from abc import ABC, abstractmethod
 
 import numpy as np
-import whisper_at as whisper
-from faster_whisper import WhisperModel
 from pydub import AudioSegment
 
-from settings import INPUT_SAMPLING_RATE, device
+import settings
+from settings import INPUT_SAMPLING_RATE
 
 
 class Transcriber(ABC):
@@ -25,6 +24,35 @@ class Transcriber(ABC):
         Transcription of the speech.
         """
 
+    def transcribe_samples(self, samples: np.ndarray, input_gain=1.0) -> str:
+        """
+        Transcribes 16-bit mono samples at INPUT_SAMPLING_RATE, such as a view into the microphone's
+        SpeechBuffer. The samples are only read, and only until this returns.
+
+        Wraps the samples in an AudioSegment for transcribe_speech by default. Transcribers that
+        work on numpy arrays override this to skip that copy.
+
+        Parameters:
+        samples (np.ndarray): the int16 samples of the speech
+        input_gain (float): a float representing the input gain. Default is 1.0.
+
+        Returns:
+        Transcription of the speech.
+        """
+        speech = AudioSegment(
+            data=samples.tobytes(), sample_width=2, frame_rate=INPUT_SAMPLING_RATE, channels=1
+        )
+        return self.transcribe_speech(speech, input_gain)
+
+    def warmup(self) -> None:
+        """
+        Optional method called to warm up the transcriber, so that the first transcription doesn't
+        pay for lazy initialization or JIT compilation. Blocks, so call it from a worker thread.
+
+        Transcribes a second of silence by default.
+        """
+        self.transcribe_samples(np.zeros(INPUT_SAMPLING_RATE, dtype=np.int16))
+
     @abstractmethod
     def supports_extra_tagging(self) -> bool:
         """
@@ -57,7 +85,11 @@ class WhisperTranscriber(Transcriber):
         no_speech_probability_threshold (float): the threshold of likelihood after which the transcribed text will be rejected as not speech. Default is 0.7.
         model_size (str): the size of the Whisper model to load. Default is "small.en".
         """
-        self.transcriber = whisper.load_model(model_size, device=device, in_memory=True)
+        # imported here so that only the configured backend is loaded
+        import whisper_at
+
+        self.whisper = whisper_at
+        self.transcriber = whisper_at.load_model(model_size, device=settings.device, in_memory=True)
         self.no_speech_probability_threshold = no_speech_probability_threshold
         self.result = None
 
@@ -75,11 +107,12 @@ class WhisperTranscriber(Transcriber):
         if not isinstance(audio_bytes, bytes):
             raise RuntimeError("AudioSegment invalid.")
 
-        # Convert the raw bytes to a numpy array of type int16
-        audio_np = np.frombuffer(audio_bytes, dtype=np.int16).flatten().astype(np.float32) / 32768.0
+        return self.transcribe_samples(np.frombuffer(audio_bytes, dtype=np.int16), input_gain)
 
-        # apply input gain
-        audio_np *= input_gain
+    def transcribe_samples(self, samples: np.ndarray, input_gain=1.0):
+        # the one copy on the way to the model, which needs float32, with the gain applied in place
+        audio_np = samples.astype(np.float32)
+        audio_np *= input_gain / 32768.0
 
         # run transcription
         try:
@@ -105,7 +138,7 @@ class WhisperTranscriber(Transcriber):
         return True
 
     def get_extra_tagging(self) -> list[str]:
-        audio_tag_result = whisper.parse_at_label(self.result, top_k=2, p_threshold=-2)
+        audio_tag_result = self.whisper.parse_at_label(self.result, top_k=2, p_threshold=-2)
 
         tags = set()
         for segment in audio_tag_result:
@@ -132,7 +165,10 @@ class FasterWhisperTranscriber(Transcriber):
         no_speech_probability_threshold (float): the threshold of likelihood after which the transcribed text will be rejected as not speech. Default is 0.7.
         model_size (str): the size of the FasterWhisper model to load. Default is "small.en".
         """
-        self.model = WhisperModel(model_size, device=device.type, compute_type="auto")
+        # imported here so that only the configured backend is loaded
+        from faster_whisper import WhisperModel
+
+        self.model = WhisperModel(model_size, device=settings.device.type, compute_type="auto")
         self.no_speech_probability_threshold = no_speech_probability_threshold
         self.result = None
 
@@ -150,11 +186,12 @@ class FasterWhisperTranscriber(Transcriber):
         if not isinstance(audio_bytes, bytes):
             raise RuntimeError("AudioSegment invalid.")
 
-        # Convert the raw bytes to a numpy array of type int16
-        audio_np = np.frombuffer(audio_bytes, dtype=np.int16).flatten().astype(np.float32) / 32768.0
+        return self.transcribe_samples(np.frombuffer(audio_bytes, dtype=np.int16), input_gain)
 
-        # apply input gain
-        audio_np *= input_gain
+    def transcribe_samples(self, samples: np.ndarray, input_gain=1.0):
+        # the one copy on the way to the model, which needs float32, with the gain applied in place
+        audio_np = samples.astype(np.float32)
+        audio_np *= input_gain / 32768.0
 
         # run transcription
         try:
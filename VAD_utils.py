@@ -1,19 +1,47 @@
+import threading
+
 import numpy as np
 import pydub
-import torch
 
-from settings import INPUT_SAMPLING_RATE
+from settings import INPUT_SAMPLING_RATE, FramesPerBuffer
+
+# voice activity detection, loaded by the first call rather than on import
+VAD = None
+_vad_lock = threading.Lock()
+
+
+def load_vad():
+    """
+    Loads the VAD model if it isn't loaded yet and returns it. Safe to call from any thread.
+    """
+    global VAD
+    with _vad_lock:
+        if VAD is None:
+            import torch
 
-# voice activity detection
-VAD, _ = torch.hub.load(repo_or_dir="snakers4/silero-vad", model="silero_vad", onnx=True)
+            VAD, _ = torch.hub.load(
+                repo_or_dir="snakers4/silero-vad", model="silero_vad", onnx=True
+            )
+    return VAD
+
+
+def warmup():
+    """
+    Loads the VAD model and runs it on one silent buffer. Blocks, so call it from a worker thread.
+    """
+    detect_voice_activity(bytes(FramesPerBuffer * 2))
 
 
 def detect_voice_activity(buf) -> float:
+    import torch
+
+    vad = VAD if VAD is not None else load_vad()
+
     if isinstance(buf, torch.Tensor):
-        return VAD(buf, INPUT_SAMPLING_RATE).item()
+        return vad(buf, INPUT_SAMPLING_RATE).item()
 
     elif isinstance(buf, (bytes, bytearray)):
-        return VAD(
+        return vad(
             torch.from_numpy(np.frombuffer(buf, dtype=np.int16).astype(np.float32)), INPUT_SAMPLING_RATE
         ).item()
 
@@ -37,6 +65,6 @@ def detect_voice_activity(buf) -> float:
         audio_tensor = torch.from_numpy(audio_np).float() / 32768.0  # Normalize to [-1, 1]
 
         # Pass the tensor to the VAD model and get the result
-        return VAD(audio_tensor, INPUT_SAMPLING_RATE).item()
+        return vad(audio_tensor, INPUT_SAMPLING_RATE).item()
     else:
         raise RuntimeError("Uhh.. idk man")
@@ -1,16 +1,19 @@
 import threading
 from abc import ABC
 from queue import Queue
+from typing import TYPE_CHECKING
 
 import numpy as np
 import pyaudio
 import pydub.playback
 from pydub import AudioSegment
-from torch import Tensor
+
+if TYPE_CHECKING:
+    from torch import Tensor
 
 
 class AudioPlayer(ABC):
-    def play_audio(self, input_data: Tensor | np.ndarray | bytes | AudioSegment) -> None:
+    def play_audio(self, input_data: "Tensor | np.ndarray | bytes | AudioSegment") -> None:
         """
         Play audio from input data.
 
@@ -44,7 +47,7 @@ class PyAudioPlayer(AudioPlayer):
     def set_volume(self, volume: float) -> None:
         self.volume = volume
 
-    def play_audio(self, input_data: Tensor | np.ndarray | bytes | AudioSegment) -> None:
+    def play_audio(self, input_data: "Tensor | np.ndarray | bytes | AudioSegment") -> None:
         """
         Queues audio data for playback.
         """
@@ -78,15 +81,16 @@ class PyAudioPlayer(AudioPlayer):
         self._playback_thread.join()
 
 
-def audio_reformat(input_data: Tensor | np.ndarray | bytes, volume: float = 1.0) -> bytes:
+def audio_reformat(input_data: "Tensor | np.ndarray | bytes", volume: float = 1.0) -> bytes:
     """Apply volume to audio and convert to bytes format."""
     
-    if isinstance(input_data, Tensor):
-        audio_np: np.ndarray = input_data.numpy()
-    elif isinstance(input_data, np.ndarray):
-        audio_np = input_data
+    if isinstance(input_data, np.ndarray):
+        audio_np: np.ndarray = input_data
     elif isinstance(input_data, (bytes, bytearray)):
         audio_np = np.frombuffer(input_data, dtype=np.float32)
+    elif hasattr(input_data, "numpy"):
+        # a torch tensor, checked without importing torch
+        audio_np = input_data.numpy()
     else:
         raise TypeError(
             f"Input must be a tensor, numpy array, or bytes. Type is {type(input_data)}"
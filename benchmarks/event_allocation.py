@@ -0,0 +1,79 @@
+"""
+Measures what an event costs on the LLM streaming path: bytes allocated per MessageEvent and
+MessageEvents published per second, for the slotted event classes and for a replica of
+MessageEvent declared as a plain dataclass with a per-instance ``__dict__``.
+
+Run with ``python -m benchmarks.event_allocation``.
+"""
+
+import argparse
+import asyncio
+import time
+import tracemalloc
+from dataclasses import field, fields, make_dataclass
+
+from event_system import Event, EventBus
+from event_system.events.Pipeline import MessageEvent
+
+
+class _UnslottedEvent(Event):
+    # declaring no __slots__ gives instances a __dict__, like events had before they were slotted
+    pass
+
+
+UnslottedMessageEvent = make_dataclass(
+    "UnslottedMessageEvent",
+    [(f.name, f.type, field(default=f.default)) for f in fields(MessageEvent)],
+    bases=(_UnslottedEvent,),
+)
+
+
+def bytes_per_event(event_class: type[Event], count: int) -> float:
+    sender = object()
+    chunk = "a streamed chunk of text"
+    events: list[Event | None] = [None] * count
+
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    for i in range(count):
+        events[i] = event_class(chunk, sender)
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return (after - before) / count
+
+
+async def publishes_per_second(event_class: type[Event], count: int, subscribers: int) -> float:
+    bus = EventBus()
+    senders = [object() for _ in range(subscribers)]
+
+    def handler(event: Event):
+        pass
+
+    # one subscriber per sender, like the outputs listening to their processors in main.py
+    for sender in senders:
+        bus.subscribe(event_class(sender=sender), handler)
+    bus.subscribe(event_class, handler)
+
+    sender = senders[0]
+    start = time.perf_counter()
+    for _ in range(count):
+        await bus.publish(event_class("chunk", sender))
+    return count / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--events", type=int, default=100_000, help="events per measurement")
+    parser.add_argument("--subscribers", type=int, default=8, help="sender-filtered subscribers")
+    args = parser.parse_args()
+
+    print(f"{'event class':<24}{'bytes/event':>14}{'publishes/s':>16}")
+    for event_class in (MessageEvent, UnslottedMessageEvent):
+        size = bytes_per_event(event_class, args.events)
+        rate = asyncio.run(publishes_per_second(event_class, args.events, args.subscribers))
+        print(f"{event_class.__name__:<24}{size:>14.1f}{rate:>16,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""
+Compares the event loops the pipeline can run on: the stock asyncio loop and uvloop, which headless
+pipelines use, and the qasync loop that pipelines with GUI pipes need.
+
+    python -m benchmarks.event_loops
+    python -m benchmarks.event_loops --events 50000 --runs 10
+
+Each loop runs in fresh subprocesses, so the startup time includes importing the loop (and PyQt5
+for qasync) and creating it, and the peak memory is that of a process that only ran the benchmark.
+The dispatch measurements publish MessageEvents to a sync and an async subscriber from the loop and
+from another thread, like the audio callbacks do, and time how long a cross-thread wakeup takes.
+Loops that aren't installed are skipped. Qt runs on its offscreen platform.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+import Runtime
+from event_system import EventBus
+from event_system.events.Pipeline import MessageEvent
+
+LOOPS = ("asyncio", "uvloop", "qasync")
+_MISSING = 3
+"""Exit code of a child process whose loop isn't installed."""
+
+
+async def measure_dispatch(events: int) -> dict[str, float]:
+    """
+    Returns the per-event publish costs and the cross-thread wakeup latency in microseconds.
+    """
+    loop = asyncio.get_running_loop()
+    bus = EventBus()
+    bus.attach_loop(loop)
+
+    received = 0
+    all_received = asyncio.Event()
+
+    def on_message(event: MessageEvent):
+        pass
+
+    async def on_message_async(event: MessageEvent):
+        nonlocal received
+        received += 1
+        if received == events:
+            all_received.set()
+
+    bus.subscribe(MessageEvent, on_message)
+    bus.subscribe(MessageEvent, on_message_async)
+
+    started = time.perf_counter_ns()
+    for i in range(events):
+        await bus.publish(MessageEvent("chunk"))
+    publish_us = (time.perf_counter_ns() - started) / events / 1000
+
+    received = 0
+    all_received.clear()
+
+    def publish_from_thread():
+        for i in range(events):
+            bus.publish_threadsafe(MessageEvent("chunk"))
+
+    started = time.perf_counter_ns()
+    threading.Thread(target=publish_from_thread).start()
+    await all_received.wait()
+    threadsafe_us = (time.perf_counter_ns() - started) / events / 1000
+
+    # one thread wakes the loop and waits for it to answer, like an audio callback handing off work
+    answered = threading.Event()
+    wakeups: list[float] = []
+
+    def ping():
+        for i in range(min(events, 2000)):
+            answered.clear()
+            sent = time.perf_counter_ns()
+            loop.call_soon_threadsafe(answered.set)
+            answered.wait()
+            wakeups.append((time.perf_counter_ns() - sent) / 1000)
+
+    await loop.run_in_executor(None, ping)
+
+    return {
+        "publish_us": publish_us,
+        "threadsafe_publish_us": threadsafe_us,
+        "wakeup_p50_us": statistics.median(wakeups),
+    }
+
+
+def child(loop_name: str, events: int):
+    try:
+        if loop_name == "qasync":
+            os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+            results = Runtime.run_with_qt(lambda: measure_dispatch(events))
+        else:
+            if loop_name == "uvloop":
+                import uvloop  # noqa: F401
+            results = Runtime.run_headless(lambda: measure_dispatch(events), loop_name == "uvloop")
+    except ImportError as e:
+        print(e, file=sys.stderr)
+        sys.exit(_MISSING)
+
+    # ru_maxrss is in kilobytes on Linux
+    results["peak_rss_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(json.dumps(results))
+
+
+def run_child(loop_name: str, events: int) -> tuple[float, dict[str, float]] | None:
+    """
+    Runs one child process and returns its wall time in milliseconds and its results, or None if
+    the loop isn't installed.
+    """
+    command = [sys.executable, "-m", "benchmarks.event_loops", "--child", loop_name]
+    started = time.perf_counter()
+    process = subprocess.run(
+        command + ["--events", str(events)], capture_output=True, text=True, check=False
+    )
+    elapsed = (time.perf_counter() - started) * 1000
+    if process.returncode == _MISSING:
+        return None
+    if process.returncode != 0:
+        raise RuntimeError(f"{loop_name} benchmark failed:\n{process.stderr}")
+    return elapsed, json.loads(process.stdout.splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--events", type=int, default=20_000, help="events per dispatch run")
+    parser.add_argument("--runs", type=int, default=5, help="processes per loop")
+    parser.add_argument("--child", choices=LOOPS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child, args.events)
+        return
+
+    print(
+        f"{'loop':<10}{'startup':>10}{'peak rss':>10}{'publish':>10}"
+        f"{'threadsafe':>12}{'wakeup p50':>12}"
+    )
+    for loop_name in LOOPS:
+        # a run without events measures startup alone
+        startups = [run_child(loop_name, 1) for _ in range(args.runs)]
+        if startups[0] is None:
+            print(f"{loop_name:<10}not installed")
+            continue
+        dispatch = [run_child(loop_name, args.events)[1] for _ in range(args.runs)]
+
+        def median(key: str) -> float:
+            return statistics.median(results[key] for results in dispatch)
+
+        startup_ms = statistics.median(elapsed for elapsed, _ in startups)
+        print(
+            f"{loop_name:<10}{startup_ms:>8.0f}ms{startups[0][1]['peak_rss_mb']:>8.1f}MB"
+            f"{median('publish_us'):>8.2f}us{median('threadsafe_publish_us'):>10.2f}us"
+            f"{median('wakeup_p50_us'):>10.1f}us"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+"""
+Measures EventBus publish throughput and per-handler dispatch latency under realistic topologies,
+and compares the results with a stored baseline.
+
+The scenarios use stand-in pipes that subscribe to the same events as the real ones, so the suite
+runs headless, without models or network access.
+
+    python -m benchmarks.eventbus_suite                      # print results as JSON
+    python -m benchmarks.eventbus_suite --check              # fail on regressions against the baseline
+    python -m benchmarks.eventbus_suite --update-baseline    # store the results as the new baseline
+
+Baselines are machine specific, so update the stored one before comparing on a different machine.
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import statistics
+import sys
+import time
+from collections.abc import Callable, Coroutine
+from pathlib import Path
+from typing import Any
+
+from event_system import DispatchMode, Event, EventBus, Mailbox
+from event_system.events.Audio import AudioDirection, AudioType, VolumeUpdatedEvent
+from event_system.events.Pipeline import (
+    MessageEvent,
+    OutputAvailabilityEvent,
+    OutputDeliveryEvent,
+    SystemInputType,
+    UserInputEvent,
+)
+from event_system.events.System import CommandEvent, CommandType
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+
+Workload = Callable[[EventBus, "LatencyProbe"], Coroutine[Any, Any, int]]
+
+
+class LatencyProbe:
+    """
+    Records how long after the start of a publish each handler is called.
+    """
+
+    def __init__(self):
+        self.published_at = 0
+        self.samples: list[int] = []
+
+    async def publish(self, bus: EventBus, event: Event):
+        self.published_at = time.perf_counter_ns()
+        await bus.publish(event)
+
+    def sync_handler(self, event: Event):
+        self.samples.append(time.perf_counter_ns() - self.published_at)
+
+    async def async_handler(self, event: Event):
+        self.samples.append(time.perf_counter_ns() - self.published_at)
+
+
+class StandInPipe:
+    """A named stand-in for a pipe, usable as a `sender` filter value."""
+
+    def __init__(self, name: str):
+        self.name = name
+
+
+async def _ignore(event: Event):
+    pass
+
+
+async def main_graph(bus: EventBus, probe: LatencyProbe) -> int:
+    """
+    The graph built by main.py: speech input feeding the conversation processor, whose streamed
+    chunks go to text to speech and the admin panel, with the pipeline monitor printing everything.
+    """
+    speech_input = StandInPipe("SpeechToTextInput")
+    processor = StandInPipe("ConversationSessionProcessor")
+    mailbox = Mailbox(16)
+
+    bus.subscribe(MessageEvent, probe.sync_handler, include_subclasses=True)  # PipelineMonitor
+    # ConversationSessionProcessor handles inputs from its mailbox, after the publish has returned,
+    # so its handler isn't probed
+    bus.subscribe(UserInputEvent, _ignore, mailbox=mailbox)
+    bus.subscribe(MessageEvent(sender=processor), probe.async_handler)  # TextToSpeechOutput
+    bus.subscribe(MessageEvent(sender=processor), probe.async_handler)  # AdminPanel
+    bus.subscribe(OutputDeliveryEvent, probe.async_handler)  # ConversationSessionProcessor
+    bus.subscribe(OutputAvailabilityEvent, probe.async_handler)  # ConversationSessionProcessor
+    for direction in AudioDirection:  # speech input and output volume
+        bus.subscribe(
+            VolumeUpdatedEvent(audio_type=AudioType.SYSTEM, audio_direction=direction),
+            probe.async_handler,
+        )
+    for _ in range(6):  # every pipe that stops on shutdown
+        bus.subscribe(CommandEvent(CommandType.STOP), probe.sync_handler)
+
+    published = 0
+    for utterance in range(200):
+        await probe.publish(
+            bus, UserInputEvent(f"utterance {utterance}", speech_input, SystemInputType.VOICE)
+        )
+        for chunk in range(50):
+            await probe.publish(bus, MessageEvent(f"chunk {chunk}", processor))
+        await probe.publish(bus, OutputDeliveryEvent("reply", processor))
+        published += 52
+
+    mailbox.close()
+    return published
+
+
+async def filtered_fan_out(bus: EventBus, probe: LatencyProbe) -> int:
+    """
+    Many subscribers that each only listen to one sender, of which a single one matches a publish.
+    """
+    senders = [StandInPipe(f"pipe {i}") for i in range(500)]
+    for sender in senders:
+        bus.subscribe(MessageEvent(sender=sender), probe.sync_handler)
+
+    for i in range(10_000):
+        await probe.publish(bus, MessageEvent("chunk", senders[i % len(senders)]))
+    return 10_000
+
+
+async def mixed_handlers(bus: EventBus, probe: LatencyProbe) -> int:
+    """
+    Sync, sequential async and concurrent async handlers all receiving every event.
+    """
+    for i in range(24):
+        if i % 3 == 0:
+            bus.subscribe(MessageEvent, probe.sync_handler)
+        elif i % 3 == 1:
+            bus.subscribe(MessageEvent, probe.async_handler)
+        else:
+            bus.subscribe(MessageEvent, probe.async_handler, mode=DispatchMode.CONCURRENT)
+
+    for _ in range(2_000):
+        await probe.publish(bus, MessageEvent("chunk"))
+    return 2_000
+
+
+SCENARIOS: dict[str, Workload] = {
+    "main_graph": main_graph,
+    "filtered_fan_out": filtered_fan_out,
+    "mixed_handlers": mixed_handlers,
+}
+
+
+def run_scenario(workload: Workload) -> dict[str, float]:
+    probe = LatencyProbe()
+
+    async def timed() -> float:
+        bus = EventBus()
+        start = time.perf_counter()
+        published = await workload(bus, probe)
+        return published / (time.perf_counter() - start)
+
+    throughput = asyncio.run(timed())
+    quantiles = statistics.quantiles(probe.samples, n=100)
+    return {
+        "publishes_per_second": throughput,
+        "dispatch_latency_p50_us": quantiles[49] / 1000,
+        "dispatch_latency_p99_us": quantiles[98] / 1000,
+    }
+
+
+def run_suite(repeats: int) -> dict[str, dict[str, float]]:
+    """
+    Runs every scenario `repeats` times and keeps the median of each metric.
+    """
+    results = {}
+    for name, workload in SCENARIOS.items():
+        runs = [run_scenario(workload) for _ in range(repeats)]
+        results[name] = {metric: statistics.median(run[metric] for run in runs) for metric in runs[0]}
+    return results
+
+
+def find_regressions(
+    results: dict[str, dict[str, float]], baseline: dict[str, dict[str, float]], tolerance: float
+) -> list[str]:
+    """
+    Returns a description of every metric that is more than `tolerance` worse than its baseline.
+    Throughput is worse when lower, latencies when higher.
+    """
+    regressions = []
+    for scenario, metrics in results.items():
+        for metric, value in metrics.items():
+            expected = baseline.get(scenario, {}).get(metric)
+            if expected is None:
+                continue
+
+            higher_is_better = metric == "publishes_per_second"
+            change = (expected - value) / expected if higher_is_better else (value - expected) / expected
+            if change > tolerance:
+                regressions.append(
+                    f"{scenario}.{metric}: {value:,.2f} vs baseline {expected:,.2f} ({change:+.0%} worse)"
+                )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeats", type=int, default=3, help="runs per scenario (median is kept)")
+    parser.add_argument("--output", type=Path, help="also write the results to this JSON file")
+    parser.add_argument("--check", action="store_true", help="exit with 1 if a metric regressed")
+    parser.add_argument("--tolerance", type=float, default=0.3, help="allowed relative slowdown")
+    parser.add_argument("--update-baseline", action="store_true", help="store results as baseline")
+    args = parser.parse_args()
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": run_suite(args.repeats),
+    }
+    text = json.dumps(report, indent=2)
+    print(text)
+
+    if args.output:
+        args.output.write_text(text + "\n")
+
+    if args.update_baseline:
+        BASELINE_PATH.write_text(text + "\n")
+
+    if args.check:
+        baseline = json.loads(BASELINE_PATH.read_text())["results"]
+        regressions = find_regressions(report["results"], baseline, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Measures how long a cold start takes to get to a built pipeline graph, and which imports the time
+goes to, for a console-only pipeline and for the speech pipeline main.py configures.
+
+    python -m benchmarks.import_time
+    python -m benchmarks.import_time --runs 10 --top 15
+
+Each configuration runs in fresh subprocesses with ``-X importtime``, so nothing is cached between
+runs except by the OS. The time is from interpreter start until the graph is declared, i.e. until
+the pipeline could start creating its pipes; models load later, on warmup. The breakdown lists the
+top-level packages with the most cumulative import time in the first run.
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+CONFIGURATIONS = {
+    "console": """
+from pipesys import PipelineGraph
+graph = PipelineGraph()
+graph.add("console_input", "ConsoleInput")
+graph.add("conversation_session_processor", "ConversationSessionProcessor",
+          listen_to="UserInputEvent")
+graph.add("console_output", "ConsoleOutput", listen_to="conversation_session_processor")
+""",
+    "main": """
+import main
+graph = main.build_graph()
+""",
+}
+
+
+def parse_import_times(stderr: str) -> dict[str, float]:
+    """
+    Returns the cumulative import time of each top-level package in milliseconds.
+    """
+    totals: dict[str, float] = defaultdict(float)
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        # nested imports are indented, and are already counted in their parent's cumulative time
+        if name.startswith("  ") or not cumulative.strip().isdigit():
+            continue
+        totals[name.strip().split(".")[0]] += int(cumulative) / 1000
+    return totals
+
+
+def run_child(code: str) -> tuple[float, dict[str, float]]:
+    """
+    Runs `code` in a fresh interpreter and returns its wall time in milliseconds and its import
+    times.
+    """
+    started = time.perf_counter()
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True, check=False
+    )
+    elapsed = (time.perf_counter() - started) * 1000
+    if process.returncode != 0:
+        # the last line of the traceback names the missing module or the error
+        raise RuntimeError(process.stderr.strip().splitlines()[-1])
+    return elapsed, parse_import_times(process.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=5, help="processes per configuration")
+    parser.add_argument("--top", type=int, default=10, help="packages to list per configuration")
+    args = parser.parse_args()
+
+    for name, code in CONFIGURATIONS.items():
+        try:
+            runs = [run_child(code) for _ in range(args.runs)]
+        except RuntimeError as e:
+            print(f"{name}: failed, {e}")
+            continue
+
+        wall_ms = statistics.median(elapsed for elapsed, _ in runs)
+        imports = runs[0][1]
+        print(f"{name}: {wall_ms:.0f}ms to a declared graph, {sum(imports.values()):.0f}ms importing")
+        for package, ms in sorted(imports.items(), key=lambda item: -item[1])[: args.top]:
+            print(f"  {package:<30}{ms:>8.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Measures how long a message takes to travel through a chain of pipes, with the chain's static edges
+connected directly by a PipelineGraph and with every hop going through the event bus.
+
+    python -m benchmarks.pipeline_hops
+    python -m benchmarks.pipeline_hops --hops 8 --messages 20000
+
+Both runs also have a PipelineMonitor-like subscriber receiving every message from the bus, as in
+main.py, so the comparison includes the publish that direct dispatch still makes for it.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from event_system import EventBusSingleton
+from event_system.events.Pipeline import MessageEvent
+from pipesys import Pipe, PipelineGraph
+
+
+class Relay(Pipe):
+    """Passes every message on unchanged, like a processor that does no work."""
+
+    emits_directly = True
+
+    @classmethod
+    async def create(cls, listen_to):
+        self = cls()
+        self.subscribe_to_message_sources(listen_to, self.on_message)
+        return self
+
+    async def on_message(self, event: MessageEvent):
+        await self.emit(MessageEvent(event.message, self))
+
+
+class Sink(Pipe):
+    """Records when each message arrives at the end of the chain."""
+
+    @classmethod
+    async def create(cls, listen_to):
+        self = cls()
+        self.arrived_at = 0
+        self.subscribe_to_message_sources(listen_to, self.on_message)
+        return self
+
+    async def on_message(self, event: MessageEvent):
+        self.arrived_at = time.perf_counter_ns()
+
+
+class Source(Relay):
+    """The start of the chain, which the benchmark emits from."""
+
+    @classmethod
+    async def create(cls):
+        return cls()
+
+
+def _ignore(event: MessageEvent):
+    pass
+
+
+async def run_chain(hops: int, messages: int, direct_dispatch: bool) -> list[float]:
+    """
+    Returns the time in microseconds each message took to go through all hops, per hop.
+    """
+    graph = PipelineGraph()
+    previous = graph.add("source", Source)
+    for hop in range(hops - 1):
+        previous = graph.add(f"relay {hop}", Relay, listen_to=previous)
+    graph.add("sink", Sink, listen_to=previous)
+    pipes = await graph.build(direct_dispatch)
+
+    monitor = EventBusSingleton.subscribe(MessageEvent, _ignore, include_subclasses=True)
+    source, sink = pipes["source"], pipes["sink"]
+
+    samples = []
+    for i in range(messages):
+        started = time.perf_counter_ns()
+        await source.emit(MessageEvent(f"message {i}", source))
+        samples.append((sink.arrived_at - started) / hops / 1000)
+
+    monitor.cancel()
+    for pipe in pipes.values():
+        pipe.close()
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--hops", type=int, default=4, help="pipes a message passes through")
+    parser.add_argument("--messages", type=int, default=10_000, help="messages per run")
+    args = parser.parse_args()
+
+    for direct_dispatch in (False, True):
+        samples = asyncio.run(run_chain(args.hops, args.messages, direct_dispatch))
+        quantiles = statistics.quantiles(samples, n=100)
+        label = "direct" if direct_dispatch else "bus"
+        print(
+            f"{label:<8}per hop: mean {statistics.fmean(samples):6.2f}us  "
+            f"p50 {quantiles[49]:6.2f}us  p99 {quantiles[98]:6.2f}us"
+        )
+
+
+if __name__ == "__main__":
+    main()
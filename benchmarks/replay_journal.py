@@ -0,0 +1,76 @@
+"""
+Replays a recorded session into the processing pipes and reports how long each handler took, so
+processors can be benchmarked without microphones, Discord or OpenAI.
+
+Record a session by enabling the journal in main.py, then:
+
+    python -m benchmarks.replay_journal session.journal --speed 10
+    python -m benchmarks.replay_journal session.journal --max-speed
+    python -m benchmarks.replay_journal session.journal --with-llm    # also query the LLM
+
+By default, the messages recorded in the journal are fed to the MessageRouter in place of a live
+ConversationSessionProcessor. Senders aren't recorded, so that includes the chunker's recorded output.
+"""
+
+import argparse
+import asyncio
+import time
+from pathlib import Path
+
+from event_system import EventBusSingleton
+from event_system.EventJournal import EventJournal
+from event_system.events.Audio import SpeakingStateUpdate
+from event_system.events.Pipeline import MessageEvent, UserInputEvent
+from event_system.events.System import CommandEvent
+from pipesys import Pipe
+from pipesys.processors import ConversationSessionProcessor, MessageRouter, RealtimeMessageChunker
+
+
+class RecordedOutput(Pipe):
+    """Stands in for the ConversationSessionProcessor whose output was recorded."""
+
+
+async def replay(args: argparse.Namespace):
+    bus = EventBusSingleton.get()
+    bus.attach_loop(asyncio.get_running_loop())
+    instrumentation = bus.enable_instrumentation()
+
+    replayed = [UserInputEvent, SpeakingStateUpdate, CommandEvent]
+    chunker = await RealtimeMessageChunker.create(
+        listen_to=UserInputEvent, processor_delay=args.processor_delay
+    )
+
+    if args.with_llm:
+        processor = await ConversationSessionProcessor.create(listen_to=chunker)
+        MessageRouter(listen_to=processor)
+        sender = None
+    else:
+        recorded_output = RecordedOutput()
+        MessageRouter(listen_to=recorded_output)
+        replayed.append(MessageEvent)
+        sender = recorded_output
+
+    speed = None if args.max_speed else args.speed
+    started = time.perf_counter()
+    published = await EventJournal(args.journal).replay(bus, speed, replayed, sender)
+    elapsed = time.perf_counter() - started
+
+    # give the chunker time to flush what it has queued
+    await asyncio.sleep(args.processor_delay + 0.2)
+
+    print(f"Replayed {published} events in {elapsed:.2f}s")
+    print(instrumentation.report())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("journal", type=Path, help="a journal recorded with EventJournal")
+    parser.add_argument("--speed", type=float, default=1.0, help="replay speed multiplier")
+    parser.add_argument("--max-speed", action="store_true", help="replay without delays")
+    parser.add_argument("--with-llm", action="store_true", help="run the LLM processor live")
+    parser.add_argument("--processor-delay", type=float, default=0.2, help="chunker delay in seconds")
+    asyncio.run(replay(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Measures what buffering one microphone frame costs as a monologue goes on, for the SpeechBuffer
+the SpeechToTextInput records into and for growing a bytes object, as it used to.
+
+    python -m benchmarks.speech_buffer
+    python -m benchmarks.speech_buffer --seconds 60 300 900
+
+For each monologue length, frames of FramesPerBuffer samples are appended until the monologue is
+that long, and the cost is the mean over the frames of its last second, which are the most
+expensive ones to buffer with bytes. The hand-off is what it costs to get the utterance to a
+transcriber: a view into the SpeechBuffer, and an AudioSegment wrapping the bytes.
+"""
+
+import argparse
+import time
+
+import numpy as np
+from pydub import AudioSegment
+from settings import INPUT_SAMPLING_RATE, FramesPerBuffer
+
+from SpeechBuffer import SpeechBuffer
+
+FRAMES_PER_SECOND = INPUT_SAMPLING_RATE // FramesPerBuffer
+
+
+def frame_bytes() -> bytes:
+    rng = np.random.default_rng(0)
+    return rng.integers(-2000, 2000, FramesPerBuffer, dtype=np.int16).tobytes()
+
+
+def measure_bytes(frame: bytes, frames: int) -> tuple[float, float]:
+    """
+    Returns the microseconds per frame over the last second and the hand-off time.
+    """
+    buffer = b""
+    for _ in range(frames - FRAMES_PER_SECOND):
+        buffer += frame
+
+    started = time.perf_counter_ns()
+    for _ in range(FRAMES_PER_SECOND):
+        buffer += frame
+    per_frame_us = (time.perf_counter_ns() - started) / FRAMES_PER_SECOND / 1000
+
+    started = time.perf_counter_ns()
+    AudioSegment(data=buffer, sample_width=2, frame_rate=INPUT_SAMPLING_RATE, channels=1)
+    return per_frame_us, (time.perf_counter_ns() - started) / 1000
+
+
+def measure_speech_buffer(frame: bytes, frames: int) -> tuple[float, float]:
+    """
+    Returns the microseconds per frame over the last second and the hand-off time.
+    """
+    buffer = SpeechBuffer(pre_roll_samples=0, max_utterance_samples=frames * FramesPerBuffer)
+    buffer.start_utterance()
+    for _ in range(frames - FRAMES_PER_SECOND):
+        buffer.append(frame)
+
+    started = time.perf_counter_ns()
+    for _ in range(FRAMES_PER_SECOND):
+        buffer.append(frame)
+    per_frame_us = (time.perf_counter_ns() - started) / FRAMES_PER_SECOND / 1000
+
+    started = time.perf_counter_ns()
+    buffer.utterance()
+    return per_frame_us, (time.perf_counter_ns() - started) / 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--seconds", type=int, nargs="+", default=[10, 60, 300], help="monologue lengths"
+    )
+    args = parser.parse_args()
+
+    frame = frame_bytes()
+    print(
+        f"{'monologue':>10}{'bytes/frame':>14}{'ring/frame':>14}{'bytes hand-off':>16}"
+        f"{'ring hand-off':>16}"
+    )
+    for seconds in args.seconds:
+        frames = max(seconds * FRAMES_PER_SECOND, FRAMES_PER_SECOND)
+        bytes_frame_us, bytes_handoff_us = measure_bytes(frame, frames)
+        ring_frame_us, ring_handoff_us = measure_speech_buffer(frame, frames)
+        print(
+            f"{seconds:>9}s{bytes_frame_us:>12.2f}us{ring_frame_us:>12.2f}us"
+            f"{bytes_handoff_us:>14.1f}us{ring_handoff_us:>14.1f}us"
+        )
+
+
+if __name__ == "__main__":
+    main()
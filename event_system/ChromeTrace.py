@@ -0,0 +1,252 @@
+import itertools
+import json
+import os
+import threading
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from event_system.Event import Event
+
+if TYPE_CHECKING:
+    from event_system.EventBus import EventBus
+    from event_system.SubscriptionIndex import Subscription
+
+Deliver = Callable[["Subscription", Event], Awaitable[None]]
+
+_active: "ChromeTraceRecorder | None" = None
+"""The recorder that :func:`record_span` and :func:`record_complete` record to, if any."""
+
+
+async def _deliver(subscription: "Subscription", event: Event):
+    await subscription.deliver(event)
+
+
+class ChromeTraceRecorder:
+    """
+    Records what the pipeline is doing on a timeline, as Chrome trace event JSON that can be opened
+    in https://ui.perfetto.dev or chrome://tracing.
+
+    While recording, the bus records every dispatch of an event and every handler call it makes,
+    and the speech pipes record their inference calls and audio thread callbacks with
+    :func:`record_span`. Each thread gets its own track, so the timeline shows where transcription,
+    LLM streaming and speech synthesis overlap and where they wait on each other. Coroutines that
+    interleave on the event loop's thread are recorded as async slices, which get their own rows.
+
+    Recording can be started and stopped at any time, e.g. with CommandEvent(TRACE) once
+    :meth:`listen` was called. Stopping writes the trace to `path`. At most `max_events` trace
+    events are kept, the oldest being dropped first.
+    """
+
+    def __init__(self, path: str | Path = "pipeline.trace.json", max_events: int = 500_000):
+        """
+        Parameters:
+        path (str | Path): where the trace is written when recording stops
+        max_events (int): how many of the most recent trace events to keep
+        """
+        self.path = Path(path)
+        self._events: deque[dict[str, Any]] = deque(maxlen=max_events)
+        self._thread_names: dict[int, str] = {}
+        self._async_ids = itertools.count(1)
+        self._bus: "EventBus | None" = None
+        self._pid = os.getpid()
+
+    @property
+    def recording(self) -> bool:
+        return _active is self
+
+    def listen(self, bus: "EventBus", start: bool = False):
+        """
+        Makes CommandEvent(TRACE) on `bus` toggle recording, and CommandEvent(STOP) end it.
+
+        Parameters:
+        bus (EventBus): the bus to record and to listen for commands on
+        start (bool): whether to start recording right away
+        """
+        # imported here because the event definitions import this package
+        from event_system.events.System import CommandEvent, CommandType
+
+        bus.subscribe(CommandEvent(CommandType.TRACE), lambda event: self.toggle(bus))
+        bus.subscribe(CommandEvent(CommandType.STOP), lambda event: self.stop())
+        if start:
+            self.start(bus)
+
+    def toggle(self, bus: "EventBus"):
+        if self.recording:
+            self.stop()
+        else:
+            self.start(bus)
+
+    def start(self, bus: "EventBus"):
+        """
+        Starts recording, discarding anything recorded before. Only one recorder records at a time,
+        so a recorder that is already recording is stopped first.
+        """
+        global _active
+        if _active is not None:
+            _active.stop()
+
+        self._events.clear()
+        self._thread_names.clear()
+        self._bus = bus
+        bus.chrome_trace = self
+        _active = self
+        print(f"Recording a pipeline trace to {self.path}")
+
+    def stop(self) -> Path | None:
+        """
+        Stops recording and writes the trace to `path`.
+
+        Returns:
+            Path | None: Where the trace was written, or None if the recorder wasn't recording.
+        """
+        global _active
+        if not self.recording:
+            return None
+
+        _active = None
+        if self._bus is not None and self._bus.chrome_trace is self:
+            self._bus.chrome_trace = None
+        self._bus = None
+
+        self.write(self.path)
+        print(f"Wrote a pipeline trace with {len(self._events)} events to {self.path}")
+        return self.path
+
+    def complete(
+        self,
+        name: str,
+        category: str,
+        start_ns: int,
+        end_ns: int | None = None,
+        asynchronous: bool = False,
+        **args: Any,
+    ):
+        """
+        Records something that ran on the current thread from `start_ns` until `end_ns` (or now),
+        both ``time.perf_counter_ns()`` timestamps. Safe to call from any thread.
+
+        Slices on one thread's row must nest, so pass `asynchronous` for coroutines, which may
+        overlap other coroutines on the same thread without nesting in them.
+        """
+        if end_ns is None:
+            end_ns = time.perf_counter_ns()
+
+        tid = self._thread_id()
+        event = {"name": name, "cat": category, "ts": start_ns / 1000, "pid": self._pid, "tid": tid}
+        if args:
+            event["args"] = args
+
+        if not asynchronous:
+            event["ph"] = "X"
+            event["dur"] = (end_ns - start_ns) / 1000
+            self._events.append(event)
+            return
+
+        event["ph"] = "b"
+        event["id"] = next(self._async_ids)
+        end = {"name": name, "cat": category, "ph": "e", "id": event["id"], "ts": end_ns / 1000}
+        self._events.append(event)
+        self._events.append(end | {"pid": self._pid, "tid": tid})
+
+    def instant(self, name: str, category: str, **args: Any):
+        """
+        Records something that happened now on the current thread.
+        """
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "i",
+            "s": "t",
+            "ts": time.perf_counter_ns() / 1000,
+            "pid": self._pid,
+            "tid": self._thread_id(),
+        }
+        if args:
+            event["args"] = args
+        self._events.append(event)
+
+    @contextmanager
+    def span(
+        self, name: str, category: str, asynchronous: bool = False, **args: Any
+    ) -> Iterator[None]:
+        """
+        Records the time spent in the ``with`` block, even if the block raises.
+        """
+        start_ns = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.complete(name, category, start_ns, asynchronous=asynchronous, **args)
+
+    async def call(
+        self, subscription: "Subscription", event: Event, deliver: Deliver = _deliver
+    ):
+        """
+        Dispatches `event` to one subscription with `deliver` and records the handler call.
+        """
+        start_ns = time.perf_counter_ns()
+        try:
+            await deliver(subscription, event)
+        finally:
+            handler = getattr(subscription.handler, "__qualname__", repr(subscription.handler))
+            awaited = subscription.is_async or subscription.mailbox is not None
+            self.complete(
+                handler, "handler", start_ns, asynchronous=awaited, event=type(event).__name__
+            )
+
+    def to_json(self) -> dict[str, Any]:
+        """
+        Returns the recorded trace in the Chrome trace event format.
+        """
+        metadata = [
+            {"name": "thread_name", "ph": "M", "pid": self._pid, "tid": tid, "args": {"name": name}}
+            for tid, name in list(self._thread_names.items())
+        ]
+        return {"traceEvents": metadata + list(self._events), "displayTimeUnit": "ms"}
+
+    def write(self, path: str | Path):
+        Path(path).write_text(json.dumps(self.to_json()))
+
+    def _thread_id(self) -> int:
+        tid = threading.get_ident()
+        if tid not in self._thread_names:
+            self._thread_names[tid] = threading.current_thread().name
+        return tid
+
+
+def active_recorder() -> ChromeTraceRecorder | None:
+    """
+    Returns the recorder that is currently recording, if any.
+    """
+    return _active
+
+
+@contextmanager
+def record_span(
+    name: str, category: str, asynchronous: bool = False, **args: Any
+) -> Iterator[None]:
+    """
+    Records the ``with`` block to the recorder that is currently recording, if there is one.
+    Costs one global lookup otherwise, so pipes can use it in audio callbacks.
+    """
+    recorder = _active
+    if recorder is None:
+        yield
+        return
+
+    with recorder.span(name, category, asynchronous, **args):
+        yield
+
+
+def record_complete(name: str, category: str, start_ns: int, **args: Any):
+    """
+    Records something that started at `start_ns` and ended now, if a recorder is recording. For
+    work whose start and end are in different functions, e.g. audio playback and its callback.
+    """
+    recorder = _active
+    if recorder is not None:
+        recorder.complete(name, category, start_ns, **args)
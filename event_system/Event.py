@@ -1,13 +1,87 @@
 from abc import ABC
+from collections.abc import Hashable, Iterable
+from dataclasses import fields, is_dataclass
 from enum import Enum
+from functools import cache
+from typing import Any, ClassVar
+
+
+class EventLane(Enum):
+    """
+    The lane an event travels in wherever events wait in a queue before being handled.
+    """
+
+    CONTROL = 0
+    """Commands and interrupts. Queued control events are handled before any queued data events."""
+    DATA = 1
+    """Everything else, e.g. message chunks and state updates."""
 
 
 class Event(ABC):
     """
     Marker interface for events.
+
+    Subclasses may override these class-level settings:
+
+    coalesce_key: names of the fields that identify which state an event updates. When several events
+        of the type with equal values for these fields are waiting to be published from another thread,
+        only the latest one is delivered. Empty (the default) means events are never coalesced.
+        Only declare it for events that describe a level (like a volume), not an edge that handlers
+        react to (like speech starting), since coalescing drops all but the latest event.
+
+    lane: the :class:`EventLane` the event is queued in. Defaults to EventLane.DATA. Control events
+        skip ahead of queued data events, so reserve EventLane.CONTROL for rare events that something
+        has to react to promptly, like shutdown or a user interrupting speech.
+
+    Event declares no instance attributes, so subclasses declared with ``@dataclass(slots=True)``
+    don't get a per-instance ``__dict__``.
+    """
+
+    __slots__ = ()
+
+    coalesce_key: ClassVar[tuple[str, ...]] = ()
+    lane: ClassVar[EventLane] = EventLane.DATA
+
+
+def coalescing_key(event: Event) -> Hashable | None:
+    """
+    Returns the key identifying the state `event` updates, built from the fields named by its type's
+    :attr:`Event.coalesce_key`, or None if the type doesn't coalesce or a key value is unhashable.
+    """
+    key_fields = event.coalesce_key
+    if not key_fields:
+        return None
+
+    key = (type(event), *(getattr(event, name, None) for name in key_fields))
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+def event_fields(event: Event) -> Iterable[tuple[str, Any]]:
+    """
+    Returns the (name, value) pairs of an event's fields.
+
+    Dataclass events are read through a tuple of field names computed once per type, since slotted
+    instances have no ``__dict__``. Other events fall back to ``vars()``.
     """
+    names = event_field_names(type(event))
+    if names is None:
+        return vars(event).items()
+    return ((name, getattr(event, name)) for name in names)
 
-    pass
+
+@cache
+def event_field_names(event_class: type) -> tuple[str, ...] | None:
+    """
+    Returns the field names of a dataclass event type, in declaration order, or None if the type
+    isn't a dataclass.
+    """
+    if not is_dataclass(event_class):
+        return None
+    return tuple(field.name for field in fields(event_class))
 
 
 class EventParameterFlag(Enum):
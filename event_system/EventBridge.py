@@ -0,0 +1,113 @@
+import threading
+import traceback
+from collections.abc import Iterable
+from multiprocessing.connection import Connection
+from typing import Callable
+
+from event_system.Event import Event
+from event_system.EventBus import EventBus
+from event_system.EventCodec import EventCodec
+
+
+class EventBridge:
+    """
+    Connects an EventBus to the EventBus of another process over a multiprocessing connection.
+
+    Events published on the local bus that match one of the `forward` subscriptions are encoded with
+    the codec and sent through the connection. Events received from the connection are published on
+    the local bus with :meth:`EventBus.publish_threadsafe` by a reader thread.
+
+    The two sides of a bridge must forward disjoint sets of events, otherwise an event would be
+    bounced back and forth between the processes.
+
+    Closing either side sends an empty message that tells the other side to stop and close its end,
+    so both readers finish even if neither process exits.
+    """
+
+    def __init__(
+        self,
+        bus: EventBus,
+        connection: Connection,
+        codec: EventCodec,
+        forward: Iterable[Event | type[Event]],
+        on_disconnect: Callable[[], None] | None = None,
+    ):
+        """
+        Parameters:
+        bus (EventBus): the local event bus
+        connection (Connection): one end of a multiprocessing Pipe
+        codec (EventCodec): a codec created with the same event types as the other side's
+        forward (Iterable[Event | type[Event]]): event types or filter instances to send to the other side
+        on_disconnect (Callable | None): called from the reader thread once the other side is gone
+        """
+        self.bus = bus
+        self.connection = connection
+        self.codec = codec
+        self.forward = list(forward)
+        self.on_disconnect = on_disconnect
+
+        self.disconnected = threading.Event()
+        """Set once the other side has closed its end of the connection."""
+        self._reader: threading.Thread | None = None
+
+    def start(self):
+        """
+        Starts forwarding events in both directions.
+
+        The local bus must already have an event loop attached.
+        """
+        for event in self.forward:
+            self.bus.subscribe(event, self.send)
+
+        self._reader = threading.Thread(target=self._receive, name="EventBridge reader", daemon=True)
+        self._reader.start()
+
+    def close(self):
+        """
+        Stops forwarding local events, tells the other side to stop, and closes the connection.
+        """
+        for event in self.forward:
+            self.bus.unsubscribe(event, self.send)
+
+        if not self.disconnected.is_set():
+            try:
+                self.connection.send_bytes(b"")
+            except (OSError, EOFError):
+                pass
+
+            # the reader finishes once the other side has closed its end
+            if self._reader is not None and self._reader is not threading.current_thread():
+                self._reader.join(timeout=1)
+
+        self.connection.close()
+
+    def send(self, event: Event):
+        if self.disconnected.is_set():
+            return
+
+        try:
+            self.connection.send_bytes(self.codec.encode(event))
+        except (OSError, EOFError):
+            self.disconnected.set()
+
+    def _receive(self):
+        while True:
+            try:
+                data = self.connection.recv_bytes()
+            except (OSError, EOFError):
+                break
+
+            if not data:
+                break
+
+            try:
+                self.bus.publish_threadsafe(self.codec.decode(data))
+            except Exception:
+                print("EventBridge couldn't publish an event received from the other process:")
+                traceback.print_exc()
+
+        # closed before flagging the disconnect, so close() never closes the connection concurrently
+        self.connection.close()
+        self.disconnected.set()
+        if self.on_disconnect is not None:
+            self.on_disconnect()
@@ -1,8 +1,19 @@
 import asyncio
-from collections.abc import Coroutine
+import itertools
+import time
+import traceback
+from collections import deque
+from collections.abc import Coroutine, Hashable
+from dataclasses import dataclass, replace
+from functools import partial
 from typing import Any, Callable, TypeVar, Union
 
-from event_system import Event, EventParameterFlag
+from event_system import Event
+from event_system.ChromeTrace import ChromeTraceRecorder, Deliver
+from event_system.Event import EventLane, coalescing_key
+from event_system.Instrumentation import HandlerStats, Instrumentation
+from event_system.Mailbox import Mailbox, MailboxStats
+from event_system.SubscriptionIndex import DispatchMode, Subscription, SubscriptionIndex
 
 AnyEvent = TypeVar("AnyEvent", bound=Event)
 """
@@ -14,6 +25,27 @@ We do this because, by default, using the Event class directly refers to only th
 EventHandler = Union[Callable[[AnyEvent], None], Callable[[AnyEvent], Coroutine[Any, Any, None]]]
 
 
+@dataclass
+class LaneStats:
+    """
+    How long events published from other threads waited in one lane before being dispatched.
+    """
+
+    lane: EventLane
+    dispatched: int = 0
+    total_latency: float = 0.0
+    max_latency: float = 0.0
+
+    @property
+    def mean_latency(self) -> float:
+        return self.total_latency / self.dispatched if self.dispatched else 0.0
+
+    def record(self, latency: float):
+        self.dispatched += 1
+        self.total_latency += latency
+        self.max_latency = max(self.max_latency, latency)
+
+
 class EventBus:
     """
     EventBus is a class that facilitates a publish-subscribe pattern for event handling.
@@ -21,19 +53,124 @@ class EventBus:
     It allows subscribing handlers to specific dataclass events and publishing events to
     notify all relevant subscribers. The EventBus supports filtering of events based on
     dataclass field values.
+
+    Filters are compiled when a handler subscribes. Exact-match fields (such as ``sender`` or
+    ``command``) are hashed into a per-type :class:`SubscriptionIndex`, so publishing looks up the
+    matching handlers instead of testing every subscriber's filter.
+
+    Subscriptions match the exact event type unless they opt into subclass delivery. The index used
+    for a concrete event type merges its own subscriptions with the subclass-delivery subscriptions of
+    its base classes. It is built on the first publish of that type and cached until a subscribe or
+    unsubscribe touches one of those classes, so publishing never walks the MRO.
+
+    Coroutine handlers are awaited one after another by default. A publish or a subscription can
+    ask for :attr:`DispatchMode.CONCURRENT`, in which case the matching handlers run as tasks in an
+    :class:`asyncio.TaskGroup` and any exceptions they raise are aggregated into an ExceptionGroup.
+
+    A subscription can also be given its own bounded :class:`Mailbox`. Publishing to it only
+    enqueues the event, and a worker task feeds the handler, so slow consumers don't hold up
+    producers unless their mailbox is full and its policy says to wait.
+
+    Threads other than the event loop's publish with :meth:`publish_threadsafe`, which appends to a
+    queue that the loop drains in batches, waking the loop once per burst of events. Within a batch,
+    events of types that declare an :attr:`Event.coalesce_key` are coalesced so that only the latest
+    one per key is delivered.
+
+    Queued events travel in the :class:`EventLane` their type declares. Each lane is drained by its
+    own task, so a control event such as ``CommandEvent(STOP)`` is dispatched as soon as the loop
+    gets to it, even while a queued data event is still being handled. Events keep their order
+    within a lane, but not across lanes. Mailboxes likewise hand control events to their handler
+    ahead of any pending data events.
+
+    Per-handler call counts, timings and filter rejections can be recorded by enabling
+    :class:`Instrumentation`. While it's disabled, publishing only pays for one attribute check.
+    Likewise, while a :class:`ChromeTraceRecorder` is recording, every dispatch and handler call is
+    recorded on a timeline.
     """
 
-    EventFilter = Callable[[AnyEvent], bool]
-    Subscriber = tuple[EventHandler, EventFilter]
-    EventSubscriptions = dict[type[AnyEvent], list[Subscriber]]
+    EventSubscriptions = dict[type[AnyEvent], dict[int, Subscription]]
+    DispatchTables = dict[type[AnyEvent], SubscriptionIndex]
 
     def __init__(self):
         self._subscribers: EventBus.EventSubscriptions = {}
-        """A dictionary that maps an event type to pairs of :class:`EventHandler` and :class:`EventFilter`.
+        """A dictionary that maps the event type each handler subscribed to onto its :class:`Subscription` objects."""
+        self._dispatch_tables: EventBus.DispatchTables = {}
+        """A dictionary that maps a concrete event type to a :class:`SubscriptionIndex` of every subscription that receives it.
             The :meth:`publish` method notifies subscribers from this dictionary by looking up the published event by type,
-            checking the published event against all :class:`EventFilter` functions, and calling the corresponding :class:`EventHandler` functions."""
+            asking the index for the subscriptions whose filters match, and calling their :class:`EventHandler` functions."""
+        self._subscription_counter = itertools.count()
+
+        self._loop: asyncio.AbstractEventLoop | None = None
+        """The loop that events published from other threads are delivered on."""
+        self._deferred: dict[EventLane, deque[tuple[float, Event]]] = {
+            lane: deque() for lane in EventLane
+        }
+        """Events published from other threads that the loop hasn't drained yet, per lane, with the
+            time they were queued. Appending to and popping from a deque are atomic, so producers
+            never take a lock."""
+        self._wakeup_pending = False
+        self._drain_tasks: dict[EventLane, asyncio.Task] = {}
+        self._lane_stats: dict[EventLane, LaneStats] = {lane: LaneStats(lane) for lane in EventLane}
+
+        self.instrumentation: Instrumentation | None = None
+        """Records per-handler timings while enabled. See :meth:`enable_instrumentation`."""
+        self.chrome_trace: ChromeTraceRecorder | None = None
+        """Records dispatches and handler calls while set. See :class:`ChromeTraceRecorder`."""
+
+    def attach_loop(self, loop: asyncio.AbstractEventLoop):
+        """
+        Sets the event loop that :meth:`publish_threadsafe` delivers events on.
+
+        This happens automatically on the first :meth:`publish`, so it only needs to be called
+        if another thread might publish before anything has been published from the loop.
+        """
+        self._loop = loop
+
+    def enable_instrumentation(self, dump_on_stop: bool = False) -> Instrumentation:
+        """
+        Starts recording call counts, timings and filter rejections for every handler.
+
+        Args:
+            dump_on_stop: If True, the report is printed when CommandEvent(STOP) is published.
+
+        Returns:
+            Instrumentation: The recorder, which can be queried at any time.
+        """
+        if self.instrumentation is None:
+            self.instrumentation = Instrumentation()
+
+        if dump_on_stop:
+            # imported here because the event definitions import this package
+            from event_system.events.System import CommandEvent, CommandType
+
+            self.subscribe(CommandEvent(CommandType.STOP), self._dump_instrumentation)
 
-    def subscribe(self, event: Event | type[Event], handler: EventHandler):
+        return self.instrumentation
+
+    def disable_instrumentation(self):
+        """
+        Stops recording handler timings and discards what was recorded.
+        """
+        self.instrumentation = None
+
+    def handler_stats(self, event_type: type[Event] | None = None) -> list[HandlerStats]:
+        """
+        Returns the recorded per-handler stats, or an empty list if instrumentation is disabled.
+        """
+        if self.instrumentation is None:
+            return []
+        return self.instrumentation.handler_stats(event_type)
+
+    def subscribe(
+        self,
+        event: Event | type[Event],
+        handler: EventHandler,
+        mode: DispatchMode = DispatchMode.SEQUENTIAL,
+        ordered: bool = False,
+        include_subclasses: bool = False,
+        mailbox: Mailbox | None = None,
+        weak: bool = False,
+    ) -> Subscription:
         """
         Subscribes a handler to a specific event type with optional filtering based on event fields.
 
@@ -42,9 +179,24 @@ class EventBus:
                    In the case of an instance, the instance fields are used for filtering events.
             handler: A callable that handles the event. It must accept a single
                      argument, which is the event instance.
+            mode: How the handler is dispatched when a publish doesn't specify a mode.
+                  Use DispatchMode.CONCURRENT for slow handlers that others shouldn't wait on.
+            ordered: If True, the handler is always awaited in subscription order, even when the
+                     event is published with DispatchMode.CONCURRENT.
+            include_subclasses: If True, the handler also receives events whose type is a subclass of
+                                the subscribed type, e.g. UserInputEvent for a MessageEvent subscription.
+            mailbox: If given, events are queued in this mailbox and delivered to the handler by its
+                     worker task instead of being handled during the publish.
+            weak: If True, the handler must be a bound method, and the subscription only holds a weak
+                  reference to its object. It is cancelled when the object is garbage collected.
+
+        Returns:
+            Subscription: A handle whose cancel() method unsubscribes the handler.
 
         Raises:
-            TypeError: If event is not an instance of Event or a type inheriting from Event.
+            TypeError: If event is not an instance of Event or a type inheriting from Event, or if
+                       `weak` is True and the handler is not a bound method.
+            ValueError: If the mailbox is already used by a different handler.
         """
 
         if not isinstance(event, Event) and not (
@@ -55,12 +207,23 @@ class EventBus:
             )
 
         event_class = event if isinstance(event, type) else type(event)
-        if event_class not in self._subscribers:
-            self._subscribers[event_class] = []
-        filter_func = (
-            self._create_filter_func(event) if not isinstance(event, type) else lambda _: True
+        subscription = Subscription(
+            handler,
+            next(self._subscription_counter),
+            event if not isinstance(event, type) else None,
+            mode,
+            ordered,
+            include_subclasses,
+            mailbox,
+            weak,
+            event_class,
+            self._remove,
         )
-        self._subscribers[event_class].append((handler, filter_func))
+        if event_class not in self._subscribers:
+            self._subscribers[event_class] = {}
+        self._subscribers[event_class][subscription.seq] = subscription
+        self._invalidate_dispatch_tables(event_class, include_subclasses)
+        return subscription
 
     def unsubscribe(self, event: Event | type[Event], handler: EventHandler):
         """
@@ -70,68 +233,265 @@ class EventBus:
             event (Any): Either an instance of a dataclass or a dataclass type representing
                          the event type to unsubscribe from.
             handler (Callable[[Any], None]): The handler to be removed from the list of subscribers.
+
+        Cancelling the :class:`Subscription` returned by :meth:`subscribe` does the same without
+        searching the type's subscribers.
         """
 
         event_class = event if isinstance(event, type) else type(event)
+        subscriptions = self._subscribers.get(event_class)
+        if not subscriptions:
+            return
+
+        for subscription in [s for s in subscriptions.values() if s.handler == handler]:
+            subscription.cancel()
+
+    def mailboxes(self) -> list[Mailbox]:
+        """
+        Returns every mailbox used by a current subscription.
+        """
+        mailboxes: dict[int, Mailbox] = {}
+        for subscriptions in self._subscribers.values():
+            for subscription in subscriptions.values():
+                if subscription.mailbox is not None:
+                    mailboxes[id(subscription.mailbox)] = subscription.mailbox
+        return list(mailboxes.values())
+
+    def mailbox_stats(self) -> list[MailboxStats]:
+        """
+        Returns the queue depth and delivery/drop counters of every mailbox.
+        """
+        return [mailbox.stats() for mailbox in self.mailboxes()]
 
-        if event_class in self._subscribers:
-            self._subscribers[event_class] = [
-                (h, f) for h, f in self._subscribers[event_class] if h != handler
-            ]
+    def lane_stats(self) -> list[LaneStats]:
+        """
+        Returns, per lane, how many events published from other threads were dispatched and how long
+        they waited to be.
+        """
+        return [replace(stats) for stats in self._lane_stats.values()]
 
-    async def publish(self, event: Event):
+    async def publish(self, event: Event, mode: DispatchMode | None = None):
         """
         Publishes an event to all subscribed handlers that match the event's type and filter criteria.
 
         Args:
             event (Any): An instance of a dataclass representing the event to be published.
+            mode: Overrides the dispatch mode of every matching subscription (except ordered ones).
+                  If None, each subscription's own mode is used.
+
+        Raises:
+            ExceptionGroup: If any handler raises while handlers are being dispatched concurrently.
+                This follows TaskGroup semantics: the first failure, whether from a concurrent
+                handler or from the sequential chain awaited alongside them, cancels every handler
+                still running, and all of the failures are raised together once they have stopped.
+                Publishers that handle specific exceptions should use ``except*``.
 
         Example:
             await event_bus.publish(CustomEvent(channel=Channel.CONSOLE_INPUT, message="Hello", user_id=1))
         """
-        event_class = type(event)
-        if event_class in self._subscribers:
-            for handler, filter_func in self._subscribers[event_class]:
-                if filter_func(event):
-                    if asyncio.iscoroutinefunction(handler):
-                        await handler(event)
-                    else:
-                        handler(event)
+        if self._loop is None:
+            self._loop = asyncio.get_running_loop()
 
-    def _create_filter_func(self, event_filter: Event) -> EventFilter:
+        index = self._dispatch_tables.get(type(event))
+        if index is None:
+            index = self._build_dispatch_table(type(event))
+
+        subscriptions = index.match(event)
+
+        instrumentation = self.instrumentation
+        if instrumentation is not None:
+            instrumentation.count_rejections(event, index.subscriptions, subscriptions)
+
+        await self.dispatch(event, subscriptions, mode)
+
+    async def dispatch(
+        self, event: Event, subscriptions: list[Subscription], mode: DispatchMode | None = None
+    ):
         """
-        Creates a filter function for the given event instance.
+        Delivers an event to subscriptions that have already been matched, in the order given, the
+        same way :meth:`publish` delivers to the subscriptions whose filters accept it.
 
-        The returned function checks:
-          - If a field value in `event_filter` is EventParameterFlag.NOT_SPECIFIED, it does not filter on that field.
-          - If a field value is a type, the corresponding event's field must be an instance of that type.
-          - Otherwise, the event's field must match the `event_filter` value exactly.
+        This lets pipes that know their listeners call them without a lookup, see :meth:`Pipe.emit`.
+        """
+        instrumentation = self.instrumentation
+        call = instrumentation.call if instrumentation is not None else None
+
+        recorder = self.chrome_trace
+        if recorder is not None:
+            # record each handler call, still timing it if instrumentation is enabled too
+            call = partial(recorder.call, deliver=call) if call is not None else recorder.call
+            name = f"dispatch {type(event).__name__}"
+            with recorder.span(name, "bus", asynchronous=True, handlers=len(subscriptions)):
+                if not any(s.runs_concurrently(mode) for s in subscriptions):
+                    await self._dispatch_in_order(event, subscriptions, call)
+                else:
+                    await self._dispatch_concurrently(event, subscriptions, mode, call)
+            return
+
+        if not any(s.runs_concurrently(mode) for s in subscriptions):
+            await self._dispatch_in_order(event, subscriptions, call)
+        else:
+            await self._dispatch_concurrently(event, subscriptions, mode, call)
+
+    async def _dispatch_concurrently(
+        self,
+        event: Event,
+        subscriptions: list[Subscription],
+        mode: DispatchMode | None,
+        call: Deliver | None,
+    ):
+        async with asyncio.TaskGroup() as group:
+            in_order: list[Subscription] = []
+            for subscription in subscriptions:
+                if not subscription.runs_concurrently(mode):
+                    in_order.append(subscription)
+                elif call is not None:
+                    group.create_task(call(subscription, event))
+                else:
+                    group.create_task(subscription.handler(event))
+
+            await self._dispatch_in_order(event, in_order, call)
+
+    def publish_threadsafe(self, *events: Event):
+        """
+        Publishes events from any thread, e.g. an audio callback or a transcription worker.
+
+        The events are appended to a queue and the call returns immediately. The event loop is woken
+        once per burst and publishes everything queued by then, in order within each
+        :class:`EventLane`. If several queued events share a type and coalesce key, only the latest
+        of them is published. Exceptions raised by handlers are printed, since there's no caller
+        left to receive them.
+
+        This is also the cheapest way to publish from synchronous code on the loop's own thread,
+        e.g. Qt signal handlers, since it doesn't create a task per event.
 
         Args:
-            event_filter: An Event instance with field values used for filtering.
+            events: The events to publish, in order.
 
-        Returns:
-            A callable that takes an Event and returns True if it matches the filter criteria,
-            and False otherwise.
+        Raises:
+            RuntimeError: If no event loop is attached yet. See :meth:`attach_loop`.
+            TypeError: If any of the arguments is not an Event. Nothing is queued in that case.
         """
+        for event in events:
+            if not isinstance(event, Event):
+                raise TypeError(
+                    f"publish_threadsafe expects Event instances, got {type(event).__name__}"
+                )
 
-        def filter_func(event: Event) -> bool:
-            for field_name, filter_value in vars(event_filter).items():
-                # Skip fields explicitly set to EventParameterFlag.NOT_SPECIFIED, meaning "ignore this field"
-                if filter_value == EventParameterFlag.NOT_SPECIFIED:
-                    continue
+        loop = self._loop
+        if loop is None:
+            raise RuntimeError(
+                "EventBus has no event loop attached yet. Call attach_loop() before publishing from another thread."
+            )
 
-                event_value = getattr(event, field_name, None)
+        queued_at = time.perf_counter()
+        for event in events:
+            self._deferred[event.lane].append((queued_at, event))
 
-                # If the filter_value is a type, ensure the event_value is an instance of that type
-                if isinstance(filter_value, type):
-                    if not isinstance(event_value, filter_value):
-                        return False
-                else:
-                    # Otherwise, require an exact match
-                    if event_value != filter_value:
-                        return False
+        if not self._wakeup_pending:
+            self._wakeup_pending = True
+            loop.call_soon_threadsafe(self._on_wakeup)
+
+    def _on_wakeup(self):
+        # Clear the flag before draining so events appended from now on schedule another wakeup
+        # if the drain task has already finished by then.
+        self._wakeup_pending = False
+        # EventLane.CONTROL comes first, so its drain task is scheduled to run first
+        for lane, queue in self._deferred.items():
+            task = self._drain_tasks.get(lane)
+            if queue and (task is None or task.done()):
+                self._drain_tasks[lane] = self._loop.create_task(self._drain_deferred(lane))
+
+    async def _drain_deferred(self, lane: EventLane):
+        queue = self._deferred[lane]
+        stats = self._lane_stats[lane]
+        while queue:
+            batch: list[tuple[float, Event]] = []
+            while queue:
+                batch.append(queue.popleft())
+
+            for queued_at, event in self._coalesce(batch):
+                stats.record(time.perf_counter() - queued_at)
+                try:
+                    await self.publish(event)
+                except Exception:
+                    print(f"Exception while publishing {type(event).__name__} from another thread:")
+                    traceback.print_exc()
+
+    @staticmethod
+    def _coalesce(batch: list[tuple[float, Event]]) -> list[tuple[float, Event]]:
+        """
+        Drops every event in `batch` that is followed by a later event with the same coalesce key.
+        """
+        keys = [coalescing_key(event) for _, event in batch]
+        latest: dict[Hashable, int] = {key: i for i, key in enumerate(keys) if key is not None}
+
+        # nothing to drop if every key only occurred once
+        if len(latest) == sum(key is not None for key in keys):
+            return batch
+
+        return [
+            queued
+            for i, (queued, key) in enumerate(zip(batch, keys))
+            if key is None or latest[key] == i
+        ]
+
+    def _build_dispatch_table(self, event_class: type[Event]) -> SubscriptionIndex:
+        """
+        Collects every subscription that receives events of exactly `event_class` into one index.
+        """
+        subscriptions = list(self._subscribers.get(event_class, {}).values())
+        for base in event_class.__mro__[1:]:
+            subscriptions.extend(
+                s for s in self._subscribers.get(base, {}).values() if s.include_subclasses
+            )
+
+        table = SubscriptionIndex()
+        for subscription in sorted(subscriptions, key=lambda s: s.seq):
+            table.add(subscription)
+
+        self._dispatch_tables[event_class] = table
+        return table
+
+    def _remove(self, subscription: Subscription):
+        subscriptions = self._subscribers.get(subscription.event_class)
+        if subscriptions is None or subscriptions.pop(subscription.seq, None) is None:
+            return
+        if not subscriptions:
+            del self._subscribers[subscription.event_class]
+
+        self._invalidate_dispatch_tables(subscription.event_class, subscription.include_subclasses)
+        if subscription.mailbox is not None:
+            subscription.mailbox.release()
+
+    def _dump_instrumentation(self, event: Event):
+        if self.instrumentation is not None:
+            print("EventBus handler timings (ms):")
+            print(self.instrumentation.report())
+
+    def _invalidate_dispatch_tables(self, event_class: type[Event], include_subclasses: bool):
+        """
+        Drops the cached dispatch tables that a (un)subscription to `event_class` can affect.
+        """
+        if not include_subclasses:
+            self._dispatch_tables.pop(event_class, None)
+            return
+
+        for cached_class in [c for c in self._dispatch_tables if issubclass(c, event_class)]:
+            del self._dispatch_tables[cached_class]
 
-            return True
+    async def _dispatch_in_order(
+        self, event: Event, subscriptions: list[Subscription], call: Deliver | None = None
+    ):
+        if call is not None:
+            for subscription in subscriptions:
+                await call(subscription, event)
+            return
 
-        return filter_func
+        for subscription in subscriptions:
+            if subscription.mailbox is not None:
+                await subscription.mailbox.put(event)
+            elif subscription.is_async:
+                await subscription.handler(event)
+            else:
+                subscription.handler(event)
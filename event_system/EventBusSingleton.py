@@ -1,5 +1,7 @@
 from event_system import Event
 from event_system.EventBus import EventBus, EventHandler
+from event_system.Mailbox import Mailbox
+from event_system.SubscriptionIndex import DispatchMode, Subscription
 
 
 class EventBusSingleton:
@@ -30,7 +32,15 @@ class EventBusSingleton:
         return cls._instance
 
     @staticmethod
-    def subscribe(event: Event | type[Event], handler: EventHandler) -> None:
+    def subscribe(
+        event: Event | type[Event],
+        handler: EventHandler,
+        mode: DispatchMode = DispatchMode.SEQUENTIAL,
+        ordered: bool = False,
+        include_subclasses: bool = False,
+        mailbox: Mailbox | None = None,
+        weak: bool = False,
+    ) -> Subscription:
         """
         Subscribes a handler to a specific event type with optional filtering based on event fields.
 
@@ -39,11 +49,21 @@ class EventBusSingleton:
                          In the case of an instance, the instance fields are used for filtering events.
             handler (Callable[[Any], None]): A callable that handles the event. It must accept a single
                                              argument, which is the event instance.
+            mode (DispatchMode): how the handler is dispatched when a publish doesn't specify a mode.
+            ordered (bool): whether the handler stays in subscription order during concurrent publishes.
+            include_subclasses (bool): whether the handler also receives subclasses of the event type.
+            mailbox (Mailbox | None): a bounded queue that decouples the handler from publishers.
+            weak (bool): whether to only hold a weak reference to the bound method's object.
+
+        Returns:
+            Subscription: A handle whose cancel() method unsubscribes the handler.
 
         Raises:
             TypeError: If filter_event is not a dataclass instance or type.
         """
-        EventBusSingleton.get().subscribe(event, handler)
+        return EventBusSingleton.get().subscribe(
+            event, handler, mode, ordered, include_subclasses, mailbox, weak
+        )
 
     @staticmethod
     def unsubscribe(event: Event | type[Event], handler: EventHandler) -> None:
@@ -58,11 +78,22 @@ class EventBusSingleton:
         EventBusSingleton.get().unsubscribe(event, handler)
 
     @staticmethod
-    async def publish(event: Event) -> None:
+    async def publish(event: Event, mode: DispatchMode | None = None) -> None:
         """
         Publishes an event to all subscribers.
 
         Args:
             event (Any): An instance of a dataclass representing the event to publish.
+            mode (DispatchMode | None): overrides the dispatch mode of the matching subscriptions.
+        """
+        await EventBusSingleton.get().publish(event, mode)
+
+    @staticmethod
+    def publish_threadsafe(*events: Event) -> None:
+        """
+        Publishes events from any thread without waiting for them to be handled.
+
+        Args:
+            events (Event): the events to publish, in order.
         """
-        await EventBusSingleton.get().publish(event)
+        EventBusSingleton.get().publish_threadsafe(*events)
@@ -0,0 +1,130 @@
+import pickle
+from collections.abc import Iterable
+from enum import Enum
+from multiprocessing import resource_tracker, shared_memory
+from typing import Any, NamedTuple
+
+from event_system.Event import Event, EventParameterFlag, event_field_names
+
+_PLAIN_TYPES = (str, int, float, bool, type(None), Enum)
+
+
+class _SharedBytes(NamedTuple):
+    """Stands in for a large bytes value that was copied into a shared memory block."""
+
+    name: str
+    size: int
+
+
+class EventCodec:
+    """
+    Serializes events into compact bytes so they can be passed to another process.
+
+    Both processes must create their codec with the same event types in the same order, since an
+    event's type is encoded as its position in that list. Field values are encoded in declaration
+    order without their names.
+
+    Only plain values cross the process boundary: strings, numbers, booleans, None, enum members,
+    bytes, and lists or tuples of those. Anything else, such as a ``sender`` pipe or a task, only
+    means something in the process that created it and is decoded as
+    EventParameterFlag.NOT_SPECIFIED.
+
+    Bytes values of at least `shared_memory_threshold` bytes (e.g. audio) are copied into a shared
+    memory block instead of being written into the message, and the decoding process releases the
+    block once it has read it.
+    """
+
+    def __init__(
+        self,
+        event_types: Iterable[type[Event]] = (),
+        shared_memory_threshold: int | None = 64 * 1024,
+    ):
+        """
+        Parameters:
+        event_types (Iterable[type[Event]]): the dataclass event types this codec can encode
+        shared_memory_threshold (int | None): the size from which bytes values are passed in shared
+            memory, or None to always write them into the message, e.g. when encoding to a file
+
+        Raises:
+            TypeError: If one of the event types isn't a dataclass.
+        """
+        self.event_types: list[type[Event]] = []
+        self.shared_memory_threshold = shared_memory_threshold
+
+        self._type_ids: dict[type[Event], int] = {}
+        self._field_names: list[tuple[str, ...]] = []
+        for event_type in event_types:
+            self.register(event_type)
+
+    def register(self, event_type: type[Event]) -> int:
+        """
+        Adds an event type to the codec, if it isn't registered yet, and returns its type id.
+
+        Raises:
+            TypeError: If the event type isn't a dataclass.
+        """
+        type_id = self._type_ids.get(event_type)
+        if type_id is not None:
+            return type_id
+
+        names = event_field_names(event_type)
+        if names is None:
+            raise TypeError(f"{event_type.__name__} must be a dataclass to be encoded.")
+
+        type_id = self._type_ids[event_type] = len(self.event_types)
+        self.event_types.append(event_type)
+        self._field_names.append(names)
+        return type_id
+
+    def encode(self, event: Event) -> bytes:
+        """
+        Raises:
+            TypeError: If the event's type wasn't registered with this codec.
+        """
+        type_id = self._type_ids.get(type(event))
+        if type_id is None:
+            raise TypeError(f"{type(event).__name__} is not registered with this codec.")
+
+        values = tuple(self._portable(getattr(event, name)) for name in self._field_names[type_id])
+        return pickle.dumps((type_id, values), protocol=pickle.HIGHEST_PROTOCOL)
+
+    def decode(self, data: bytes) -> Event:
+        type_id, values = pickle.loads(data)
+        fields = {
+            name: _read_shared(value) if isinstance(value, _SharedBytes) else value
+            for name, value in zip(self._field_names[type_id], values)
+        }
+        return self.event_types[type_id](**fields)
+
+    def _portable(self, value: Any) -> Any:
+        if isinstance(value, _PLAIN_TYPES):
+            return value
+
+        if isinstance(value, (bytes, bytearray)):
+            threshold = self.shared_memory_threshold
+            if threshold is None or len(value) < threshold:
+                return value
+            return _write_shared(value)
+
+        if isinstance(value, (list, tuple)) and all(isinstance(v, _PLAIN_TYPES) for v in value):
+            return value
+
+        return EventParameterFlag.NOT_SPECIFIED
+
+
+def _write_shared(value: bytes | bytearray) -> _SharedBytes:
+    block = shared_memory.SharedMemory(create=True, size=len(value))
+    block.buf[: len(value)] = value
+    # the decoding process unlinks the block, so this process must not clean it up at exit
+    resource_tracker.unregister(block._name, "shared_memory")
+    block.close()
+    return _SharedBytes(block.name, len(value))
+
+
+def _read_shared(shared: _SharedBytes) -> bytes:
+    block = shared_memory.SharedMemory(name=shared.name)
+    try:
+        return bytes(block.buf[: shared.size])
+    finally:
+        block.close()
+        block.unlink()
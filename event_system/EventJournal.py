@@ -0,0 +1,167 @@
+import asyncio
+import importlib
+import struct
+import time
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import BinaryIO
+
+from event_system.Event import Event, EventParameterFlag
+from event_system.EventBus import EventBus
+from event_system.EventCodec import EventCodec
+
+_MAGIC = b"NYAKOJ1\n"
+_RECORD = struct.Struct("<BqI")
+"""Record header: kind, nanoseconds since recording started, payload length."""
+_TYPE_RECORD = 0
+_EVENT_RECORD = 1
+
+
+class EventJournal:
+    """
+    A compact binary log of published events, with monotonic timestamps, that can be replayed later.
+
+    Recording subscribes to the recorded event types (including their subclasses) on a bus and
+    appends every event it receives, encoded with an :class:`EventCodec`. Each event type is written
+    once, by name, before its first event, so a journal can be read without knowing its contents.
+    Field values that only mean something in the recording process, such as ``sender`` pipes, are
+    stored as NOT_SPECIFIED; events that aren't dataclasses are skipped. An event is timestamped when
+    the journal's subscription is called, after the subscribers that subscribed before it.
+
+    Replaying publishes the journal's events on a bus at the original speed, a multiple of it, or as
+    fast as possible. This reproduces a session's inputs without microphones, Discord or an LLM.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+
+        self._file: BinaryIO | None = None
+        self._bus: EventBus | None = None
+        self._recorded_types: list[type[Event]] = []
+        self._codec = EventCodec(shared_memory_threshold=None)
+        self._skipped_types: set[type] = set()
+        self._started_ns = 0
+
+    def record(self, bus: EventBus, event_types: Iterable[type[Event]] = (Event,)):
+        """
+        Starts appending the events published on `bus` to a new journal file.
+
+        Args:
+            bus: The bus to record.
+            event_types: The event types to record, including their subclasses. Defaults to all events.
+                         The types shouldn't be subclasses of each other, or events are recorded twice.
+        """
+        self._file = self.path.open("wb")
+        self._file.write(_MAGIC)
+        self._started_ns = time.monotonic_ns()
+
+        self._bus = bus
+        self._recorded_types = list(event_types)
+        for event_type in self._recorded_types:
+            bus.subscribe(event_type, self._append, include_subclasses=True)
+
+    def stop(self):
+        """
+        Stops recording and closes the journal file.
+        """
+        if self._bus is not None:
+            for event_type in self._recorded_types:
+                self._bus.unsubscribe(event_type, self._append)
+            self._bus = None
+
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def read(self) -> Iterator[tuple[float, Event]]:
+        """
+        Yields every event in the journal, with the time in seconds since recording started.
+
+        Raises:
+            ValueError: If the file isn't an event journal.
+            ImportError: If an event type in the journal can't be imported.
+        """
+        codec = EventCodec(shared_memory_threshold=None)
+        with self.path.open("rb") as file:
+            if file.read(len(_MAGIC)) != _MAGIC:
+                raise ValueError(f"{self.path} is not an event journal.")
+
+            while header := file.read(_RECORD.size):
+                kind, timestamp_ns, length = _RECORD.unpack(header)
+                payload = file.read(length)
+                if kind == _TYPE_RECORD:
+                    codec.register(_import_type(payload.decode()))
+                else:
+                    yield timestamp_ns / 1e9, codec.decode(payload)
+
+    async def replay(
+        self,
+        bus: EventBus,
+        speed: float | None = 1.0,
+        include: Iterable[type[Event]] | None = None,
+        sender: object | None = None,
+    ) -> int:
+        """
+        Publishes the journal's events on `bus`, in order.
+
+        Args:
+            bus: The bus to publish on.
+            speed: How much faster than recorded to replay, e.g. 1.0 for the original timing or 10.0
+                   for ten times as fast. None publishes every event as soon as the previous one
+                   has been handled.
+            include: If given, only events of exactly these types are replayed.
+            sender: If given, replayed events with a ``sender`` field get it in place of the sender
+                    that couldn't be recorded, so subscriptions filtering on a pipe receive them.
+
+        Returns:
+            int: The number of events published.
+        """
+        include = set(include) if include is not None else None
+        started = time.monotonic()
+        published = 0
+
+        for timestamp, event in self.read():
+            if include is not None and type(event) not in include:
+                continue
+
+            unrecorded_sender = getattr(event, "sender", None) is EventParameterFlag.NOT_SPECIFIED
+            if sender is not None and unrecorded_sender:
+                event.sender = sender
+
+            if speed is not None:
+                delay = started + timestamp / speed - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+            await bus.publish(event)
+            published += 1
+
+        return published
+
+    def _append(self, event: Event):
+        event_type = type(event)
+        if event_type in self._skipped_types or self._file is None:
+            return
+
+        timestamp_ns = time.monotonic_ns() - self._started_ns
+        known_types = len(self._codec.event_types)
+        try:
+            self._codec.register(event_type)
+        except TypeError:
+            self._skipped_types.add(event_type)
+            return
+
+        if len(self._codec.event_types) > known_types:
+            name = f"{event_type.__module__}:{event_type.__qualname__}".encode()
+            self._file.write(_RECORD.pack(_TYPE_RECORD, timestamp_ns, len(name)) + name)
+
+        payload = self._codec.encode(event)
+        self._file.write(_RECORD.pack(_EVENT_RECORD, timestamp_ns, len(payload)) + payload)
+
+
+def _import_type(name: str) -> type[Event]:
+    module_name, qualname = name.split(":")
+    event_type = importlib.import_module(module_name)
+    for attribute in qualname.split("."):
+        event_type = getattr(event_type, attribute)
+    return event_type
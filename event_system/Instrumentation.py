@@ -0,0 +1,181 @@
+import time
+from dataclasses import dataclass
+
+from event_system.Event import Event
+from event_system.SubscriptionIndex import Subscription
+
+_SUB_BUCKETS = 4
+"""Histogram buckets per power of two, which bounds the error of a percentile to 12.5%."""
+
+
+class LatencyHistogram:
+    """
+    A log-linear histogram of durations in nanoseconds. Recording is O(1) and memory is bounded.
+    """
+
+    __slots__ = ("counts", "count")
+
+    def __init__(self):
+        self.counts: dict[int, int] = {}
+        self.count = 0
+
+    def add(self, duration_ns: int):
+        bucket = _bucket(duration_ns)
+        self.counts[bucket] = self.counts.get(bucket, 0) + 1
+        self.count += 1
+
+    def percentile(self, fraction: float) -> float:
+        """
+        Returns an estimate of the given percentile (e.g. 0.99) in seconds.
+        """
+        if not self.count:
+            return 0.0
+
+        rank = fraction * self.count
+        seen = 0
+        for bucket in sorted(self.counts):
+            seen += self.counts[bucket]
+            if seen >= rank:
+                return _bucket_midpoint(bucket) / 1e9
+        return _bucket_midpoint(max(self.counts)) / 1e9
+
+
+def _bucket(duration_ns: int) -> int:
+    duration_ns = max(duration_ns, 0)
+    bits = duration_ns.bit_length()
+    if bits <= 3:
+        return duration_ns
+    # the two bits after the leading one select one of four linear sub-buckets in the octave
+    return bits * _SUB_BUCKETS + ((duration_ns >> (bits - 3)) & (_SUB_BUCKETS - 1))
+
+
+def _bucket_midpoint(bucket: int) -> float:
+    if bucket < 8:
+        return bucket
+    bits, sub_bucket = divmod(bucket, _SUB_BUCKETS)
+    width = 1 << (bits - 3)
+    return (_SUB_BUCKETS + sub_bucket) * width + width / 2
+
+
+@dataclass
+class HandlerStats:
+    """
+    A snapshot of how one handler performed for one event type. Times are in seconds.
+    """
+
+    event_type: str
+    handler: str
+    calls: int
+    total_time: float
+    p50: float
+    p95: float
+    p99: float
+    rejections: int
+    """Events of this type the handler's filter didn't accept."""
+
+
+class _HandlerRecord:
+    __slots__ = ("event_type", "handler", "total_ns", "histogram", "rejections")
+
+    def __init__(self, event_type: type[Event], handler: str):
+        self.event_type = event_type
+        self.handler = handler
+        self.total_ns = 0
+        self.histogram = LatencyHistogram()
+        self.rejections = 0
+
+    def stats(self) -> HandlerStats:
+        histogram = self.histogram
+        return HandlerStats(
+            self.event_type.__name__,
+            self.handler,
+            histogram.count,
+            self.total_ns / 1e9,
+            histogram.percentile(0.50),
+            histogram.percentile(0.95),
+            histogram.percentile(0.99),
+            self.rejections,
+        )
+
+
+class Instrumentation:
+    """
+    Records, for each (event type, handler), how often the handler was called, how long its calls
+    took, and how many events of that type its filter rejected.
+
+    An EventBus only pays for this while instrumentation is enabled, see
+    :meth:`EventBus.enable_instrumentation`. For subscribers with a mailbox, the recorded time is the
+    time the publish spent enqueuing the event, not the time the worker spent handling it.
+    """
+
+    def __init__(self):
+        self._records: dict[tuple[type[Event], int], _HandlerRecord] = {}
+        """(event type, subscription seq) -> record. Keyed by seq rather than by handler so that
+            instrumentation doesn't keep handlers alive."""
+
+    async def call(self, subscription: Subscription, event: Event):
+        """
+        Dispatches `event` to one subscription and records how long that took.
+        """
+        start = time.perf_counter_ns()
+        try:
+            await subscription.deliver(event)
+        finally:
+            record = self._record(type(event), subscription)
+            elapsed = time.perf_counter_ns() - start
+            record.total_ns += elapsed
+            record.histogram.add(elapsed)
+
+    def count_rejections(
+        self, event: Event, candidates: list[Subscription], matched: list[Subscription]
+    ):
+        """
+        Counts a rejection for every subscription in `candidates` that isn't in `matched`.
+        """
+        if len(candidates) == len(matched):
+            return
+
+        accepted = {subscription.seq for subscription in matched}
+        for subscription in candidates:
+            if subscription.seq not in accepted:
+                self._record(type(event), subscription).rejections += 1
+
+    def handler_stats(self, event_type: type[Event] | None = None) -> list[HandlerStats]:
+        """
+        Returns the stats of every handler (optionally only for one event type), the handlers that
+        took the most time in total first.
+        """
+        records = [
+            record
+            for record in self._records.values()
+            if event_type is None or record.event_type is event_type
+        ]
+        records.sort(key=lambda record: record.total_ns, reverse=True)
+        return [record.stats() for record in records]
+
+    def report(self) -> str:
+        """
+        Formats the handler stats as a table, with times in milliseconds.
+        """
+        lines = [
+            f"{'event type':<28}{'handler':<48}{'calls':>8}{'total':>10}"
+            f"{'p50':>9}{'p95':>9}{'p99':>9}{'rejected':>10}"
+        ]
+        for stats in self.handler_stats():
+            lines.append(
+                f"{stats.event_type:<28}{stats.handler:<48}{stats.calls:>8}"
+                f"{stats.total_time * 1e3:>10.2f}{stats.p50 * 1e3:>9.3f}{stats.p95 * 1e3:>9.3f}"
+                f"{stats.p99 * 1e3:>9.3f}{stats.rejections:>10}"
+            )
+        return "\n".join(lines)
+
+    def reset(self):
+        self._records.clear()
+
+    def _record(self, event_type: type[Event], subscription: Subscription) -> _HandlerRecord:
+        key = (event_type, subscription.seq)
+        record = self._records.get(key)
+        if record is None:
+            name = getattr(subscription.handler, "__qualname__", repr(subscription.handler))
+            record = self._records[key] = _HandlerRecord(event_type, name)
+        return record
@@ -0,0 +1,89 @@
+import json
+from collections import OrderedDict
+from pathlib import Path
+
+from event_system.EventBus import EventBus
+from event_system.events.Pipeline import OutputDeliveryEvent
+from event_system.events.System import CommandEvent, CommandType
+from event_system.SubscriptionIndex import Subscription
+from event_system.Trace import Trace
+
+
+class LatencyTracer:
+    """
+    Collects the traces of turns whose replies were delivered, and reports a latency waterfall for
+    each of them.
+
+    Input pipes start a :class:`Trace` when the user stops speaking, and every pipe the turn passes
+    through records its stages on it. When an OutputDeliveryEvent carrying a trace is published, the
+    tracer marks the delivery and keeps the trace. A turn usually has several deliveries, one per
+    reply chunk, so a turn's waterfall grows until its last chunk has been delivered.
+    """
+
+    def __init__(
+        self, max_turns: int = 100, path: str | Path | None = None, print_turns: bool = False
+    ):
+        """
+        Parameters:
+        max_turns (int): how many of the most recent turns to keep
+        path (str | Path | None): if given, the kept turns are written there as JSON on STOP
+        print_turns (bool): whether to print a turn's waterfall when its first chunk is delivered
+        """
+        self.max_turns = max_turns
+        self.path = Path(path) if path is not None else None
+        self.print_turns = print_turns
+
+        self._turns: OrderedDict[int, Trace] = OrderedDict()
+        self._subscriptions: list[Subscription] = []
+
+    def start(self, bus: EventBus):
+        """
+        Starts collecting the traces of delivered outputs published on `bus`.
+        """
+        self._subscriptions = [
+            bus.subscribe(OutputDeliveryEvent, self._on_delivery),
+            bus.subscribe(CommandEvent(CommandType.STOP), self._on_stop),
+        ]
+
+    def stop(self):
+        for subscription in self._subscriptions:
+            subscription.cancel()
+        self._subscriptions = []
+
+    def turns(self) -> list[Trace]:
+        """
+        Returns the kept turns, oldest first.
+        """
+        return list(self._turns.values())
+
+    def report(self) -> str:
+        """
+        Formats the waterfall of every kept turn.
+        """
+        return "\n\n".join(trace.waterfall() for trace in self._turns.values())
+
+    def export(self, path: str | Path):
+        """
+        Writes the kept turns to a JSON file, with offsets and durations in milliseconds.
+        """
+        turns = [trace.to_dict() for trace in self._turns.values()]
+        Path(path).write_text(json.dumps({"turns": turns}, indent=2) + "\n")
+
+    def _on_delivery(self, event: OutputDeliveryEvent):
+        trace = event.trace
+        if not isinstance(trace, Trace):
+            return
+
+        trace.mark("output_delivery")
+        first_delivery = trace.trace_id not in self._turns
+        self._turns[trace.trace_id] = trace
+        self._turns.move_to_end(trace.trace_id)
+        while len(self._turns) > self.max_turns:
+            self._turns.popitem(last=False)
+
+        if first_delivery and self.print_turns:
+            print(trace.waterfall())
+
+    def _on_stop(self, event: CommandEvent):
+        if self.path is not None:
+            self.export(self.path)
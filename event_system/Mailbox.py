@@ -0,0 +1,223 @@
+import asyncio
+import time
+import traceback
+from collections import deque
+from collections.abc import Hashable
+from dataclasses import dataclass
+from enum import Enum
+from typing import Callable
+
+from event_system import ChromeTrace
+from event_system.Event import Event, EventLane, coalescing_key
+
+
+class OverflowPolicy(Enum):
+    """
+    What a :class:`Mailbox` does with a new event when it is full.
+    """
+
+    BLOCK = 1
+    """The publisher waits until the subscriber has made room."""
+    DROP_OLDEST = 2
+    """The oldest pending event is discarded to make room for the new one."""
+    DROP_NEWEST = 3
+    """The new event is discarded."""
+    COALESCE = 4
+    """The new event replaces a pending event with the same coalesce key. If there is none, the
+    oldest pending event is discarded."""
+
+
+@dataclass
+class MailboxStats:
+    name: str
+    depth: int
+    max_depth: int
+    delivered: int
+    dropped: int
+    coalesced: int
+
+
+class Mailbox:
+    """
+    A bounded queue and worker task that decouple a slow subscriber from the publishers feeding it.
+
+    Publishing to a subscriber with a mailbox only enqueues the event; the worker task calls the
+    handler with one event at a time, in order. When the mailbox is full, the :class:`OverflowPolicy`
+    decides whether the publisher waits or which event is lost.
+
+    Control events (see :class:`EventLane`) are queued separately and handled before any pending
+    data events. They don't count towards `maxsize`, so a full mailbox never delays or drops them.
+
+    A mailbox belongs to a single handler, but that handler may use it for several subscriptions.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 32,
+        policy: OverflowPolicy = OverflowPolicy.BLOCK,
+        coalesce_key: Callable[[Event], Hashable] | None = None,
+    ):
+        """
+        Parameters:
+        maxsize (int): the number of events that can be pending before the policy applies
+        policy (OverflowPolicy): what to do with events that arrive while the mailbox is full
+        coalesce_key (Callable): maps an event to the key used by OverflowPolicy.COALESCE. By default, the key
+            the event's type declares with Event.coalesce_key is used, or the event type if it declares none.
+        """
+        if maxsize < 1:
+            raise ValueError("A mailbox must be able to hold at least one event.")
+
+        self.maxsize = maxsize
+        self.policy = policy
+        self.coalesce_key = coalesce_key or _declared_or_type_key
+
+        self.handler: Callable | None = None
+        self.name = "unbound"
+        self._bindings = 0
+        """The number of subscriptions using this mailbox."""
+
+        self._pending: deque[Event] = deque()
+        self._pending_control: deque[Event] = deque()
+        self._not_empty = asyncio.Event()
+        self._not_full = asyncio.Event()
+        self._not_full.set()
+        self._worker: asyncio.Task | None = None
+        self.closed = False
+        """Set by close(). A closed mailbox discards everything put into it."""
+
+        self.max_depth = 0
+        self.delivered = 0
+        self.dropped = 0
+        self.coalesced = 0
+
+    @property
+    def depth(self) -> int:
+        """The number of events waiting to be handled."""
+        return len(self._pending) + len(self._pending_control)
+
+    def bind(self, handler: Callable) -> None:
+        """
+        Attaches the handler that the worker task delivers events to.
+
+        Raises:
+            ValueError: If the mailbox is already bound to a different handler.
+        """
+        if self.handler is not None and self.handler != handler:
+            raise ValueError(f"Mailbox is already bound to {self.name}.")
+
+        self.handler = handler
+        self.name = getattr(handler, "__qualname__", repr(handler))
+        self._bindings += 1
+
+    def release(self) -> None:
+        """
+        Called when a subscription using this mailbox is cancelled. Closes the mailbox once no
+        subscription uses it anymore.
+        """
+        self._bindings -= 1
+        if self._bindings <= 0:
+            self.close()
+
+    async def put(self, event: Event) -> None:
+        """
+        Enqueues an event for the handler, applying the overflow policy if the mailbox is full.
+
+        Events put into a closed mailbox, including by publishers that were waiting for room when it
+        was closed, are counted as dropped.
+        """
+        if self.closed:
+            self.dropped += 1
+            return
+
+        self._ensure_worker()
+
+        if event.lane is EventLane.CONTROL:
+            self._pending_control.append(event)
+            self.max_depth = max(self.max_depth, self.depth)
+            self._not_empty.set()
+            return
+
+        if self.policy is OverflowPolicy.COALESCE and self._replace_pending(event):
+            return
+
+        if len(self._pending) >= self.maxsize:
+            if self.policy is OverflowPolicy.BLOCK:
+                while len(self._pending) >= self.maxsize:
+                    self._not_full.clear()
+                    await self._not_full.wait()
+                    if self.closed:
+                        self.dropped += 1
+                        return
+            elif self.policy is OverflowPolicy.DROP_NEWEST:
+                self.dropped += 1
+                return
+            else:
+                self._pending.popleft()
+                self.dropped += 1
+
+        self._pending.append(event)
+        self.max_depth = max(self.max_depth, self.depth)
+        self._not_empty.set()
+
+    def stats(self) -> MailboxStats:
+        return MailboxStats(
+            self.name, self.depth, self.max_depth, self.delivered, self.dropped, self.coalesced
+        )
+
+    def close(self) -> None:
+        """
+        Stops the worker task. Pending events are discarded, and so is anything put afterwards.
+        """
+        self.closed = True
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+        self._pending.clear()
+        self._pending_control.clear()
+        self._not_full.set()
+
+    def _replace_pending(self, event: Event) -> bool:
+        key = self.coalesce_key(event)
+        for i, pending in enumerate(self._pending):
+            if self.coalesce_key(pending) == key:
+                self._pending[i] = event
+                self.coalesced += 1
+                return True
+        return False
+
+    def _ensure_worker(self) -> None:
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self) -> None:
+        while True:
+            while not self._pending and not self._pending_control:
+                self._not_empty.clear()
+                await self._not_empty.wait()
+
+            if self._pending_control:
+                event = self._pending_control.popleft()
+            else:
+                event = self._pending.popleft()
+                self._not_full.set()
+
+            recorder = ChromeTrace.active_recorder()
+            started_ns = time.perf_counter_ns() if recorder is not None else 0
+            try:
+                result = self.handler(event)
+                if asyncio.iscoroutine(result):
+                    await result
+            except Exception:
+                print(f"Mailbox handler {self.name} raised while handling {type(event).__name__}:")
+                traceback.print_exc()
+            else:
+                self.delivered += 1
+            finally:
+                if recorder is not None:
+                    name = type(event).__name__
+                    recorder.complete(self.name, "mailbox", started_ns, asynchronous=True, event=name)
+
+
+def _declared_or_type_key(event: Event) -> Hashable:
+    key = coalescing_key(event)
+    return type(event) if key is None else key
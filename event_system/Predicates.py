@@ -0,0 +1,126 @@
+from abc import ABC, abstractmethod
+from collections.abc import Hashable
+from typing import Any, Callable
+
+
+class Predicate(ABC):
+    """
+    A condition on a single event field, used in place of a value in a subscription filter.
+
+    Example:
+        # Only voice input, which speech to text publishes with priority 2
+        EventBusSingleton.subscribe(UserInputEvent(priority=AtLeast(2)), self.on_voice_input)
+
+        # Messages from any of several pipes, with a single subscription
+        EventBusSingleton.subscribe(MessageEvent(sender=InSet(chunker, router)), self.on_message)
+
+    Like exact-match values, predicates are evaluated when an event is published, before any handler
+    is called or scheduled. An :class:`InSet` of hashable values is hashed into the dispatch index
+    under each of its values, so it costs the same as an exact match. Other predicates are checked
+    only for subscriptions the index has already selected.
+    """
+
+    __slots__ = ()
+
+    @abstractmethod
+    def __call__(self, value: Any) -> bool:
+        """
+        Returns True if an event whose field has `value` should be delivered.
+        """
+
+
+class InSet(Predicate):
+    """
+    Accepts values equal to one of the given values.
+    """
+
+    __slots__ = ("values",)
+
+    def __init__(self, *values: Any):
+        self.values = values
+
+    def __call__(self, value: Any) -> bool:
+        return value in self.values
+
+    def hashable_values(self) -> tuple[Hashable, ...] | None:
+        """
+        Returns the values to index the subscription under, or None if one of them isn't hashable.
+        """
+        try:
+            return tuple(set(self.values))
+        except TypeError:
+            return None
+
+    def __repr__(self) -> str:
+        return f"InSet{self.values!r}"
+
+
+class NotEqual(Predicate):
+    """
+    Accepts any value that isn't equal to the given one.
+    """
+
+    __slots__ = ("value",)
+
+    def __init__(self, value: Any):
+        self.value = value
+
+    def __call__(self, value: Any) -> bool:
+        return value != self.value
+
+    def __repr__(self) -> str:
+        return f"NotEqual({self.value!r})"
+
+
+class Range(Predicate):
+    """
+    Accepts values with ``minimum <= value < maximum``. Either bound may be None for no bound.
+    Values that can't be compared with the bounds, such as NOT_SPECIFIED, are rejected.
+    """
+
+    __slots__ = ("minimum", "maximum")
+
+    def __init__(self, minimum: Any = None, maximum: Any = None):
+        self.minimum = minimum
+        self.maximum = maximum
+
+    def __call__(self, value: Any) -> bool:
+        try:
+            return (self.minimum is None or value >= self.minimum) and (
+                self.maximum is None or value < self.maximum
+            )
+        except TypeError:
+            return False
+
+    def __repr__(self) -> str:
+        return f"Range({self.minimum!r}, {self.maximum!r})"
+
+
+class AtLeast(Range):
+    """
+    Accepts values ``>= minimum``.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, minimum: Any):
+        super().__init__(minimum)
+
+
+class Where(Predicate):
+    """
+    Accepts values for which `condition` returns True. Keep the condition cheap, since it runs for
+    every published event the subscription's other fields haven't already ruled out.
+    """
+
+    __slots__ = ("condition",)
+
+    def __init__(self, condition: Callable[[Any], bool]):
+        self.condition = condition
+
+    def __call__(self, value: Any) -> bool:
+        return bool(self.condition(value))
+
+    def __repr__(self) -> str:
+        name = getattr(self.condition, "__qualname__", repr(self.condition))
+        return f"Where({name})"
@@ -0,0 +1,323 @@
+import asyncio
+import inspect
+import weakref
+from collections.abc import Hashable
+from enum import Enum
+from operator import attrgetter
+from typing import Any, Callable
+
+from event_system.Event import Event, EventParameterFlag, event_fields
+from event_system.Mailbox import Mailbox
+from event_system.Predicates import InSet, Predicate
+
+
+class DispatchMode(Enum):
+    """
+    How a publish delivers an event to its matching coroutine handlers.
+    """
+
+    SEQUENTIAL = 1
+    """Each handler is awaited in subscription order before the next one starts."""
+    CONCURRENT = 2
+    """Handlers run as concurrent tasks in a TaskGroup; the publish completes when all of them have."""
+
+
+class WeakHandler:
+    """
+    Calls a bound method without keeping the object it's bound to alive.
+
+    When the object is garbage collected, `on_collected` is called, which cancels the subscription.
+    """
+
+    __slots__ = ("_target", "_function", "_is_async")
+
+    def __init__(self, method: Callable, on_collected: Callable[[], None]):
+        if not inspect.ismethod(method):
+            raise TypeError("Only bound methods can be subscribed weakly.")
+
+        self._target = weakref.ref(method.__self__, lambda _: on_collected())
+        self._function = method.__func__
+        self._is_async = asyncio.iscoroutinefunction(method)
+
+    def __call__(self, event: Event):
+        target = self._target()
+        if target is None:
+            # collected, but the subscription hasn't been cancelled yet
+            return _skip() if self._is_async else None
+        return self._function(target, event)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, WeakHandler):
+            return self._target == other._target and self._function is other._function
+        target = self._target()
+        return (
+            target is not None
+            and getattr(other, "__self__", None) is target
+            and getattr(other, "__func__", None) is self._function
+        )
+
+    def __hash__(self) -> int:
+        return hash((self._target, self._function))
+
+    def __repr__(self) -> str:
+        return self._function.__qualname__
+
+
+async def _skip():
+    pass
+
+
+class Subscription:
+    """
+    A handler together with its filter, compiled once at subscribe time.
+
+    :meth:`EventBus.subscribe` returns the subscription as a handle, whose :meth:`cancel` removes it
+    from the bus without searching for it.
+
+    The filter is split into one field that the owning :class:`SubscriptionIndex` hashes on (an
+    exact match, or an :class:`InSet` of hashable values) and a small residual of checks (further
+    exact matches, ``isinstance`` tests, unhashable values, other :class:`Predicate` objects) that
+    is only evaluated for subscriptions the index has already selected as candidates.
+    """
+
+    __slots__ = (
+        "handler",
+        "seq",
+        "is_async",
+        "mode",
+        "ordered",
+        "include_subclasses",
+        "mailbox",
+        "event_class",
+        "_on_cancel",
+        "index_field",
+        "index_values",
+        "equals",
+        "instance_of",
+        "predicates",
+    )
+
+    def __init__(
+        self,
+        handler: Callable,
+        seq: int,
+        event_filter: Event | None = None,
+        mode: DispatchMode = DispatchMode.SEQUENTIAL,
+        ordered: bool = False,
+        include_subclasses: bool = False,
+        mailbox: Mailbox | None = None,
+        weak: bool = False,
+        event_class: type[Event] = Event,
+        on_cancel: Callable[["Subscription"], None] | None = None,
+    ):
+        self.is_async: bool = asyncio.iscoroutinefunction(handler)
+        self.handler: Callable = WeakHandler(handler, self.cancel) if weak else handler
+        """The handler, or a :class:`WeakHandler` for it if the subscription is weak."""
+        self.seq = seq
+        """Subscription order. Handlers are always called in the order they subscribed."""
+        self.mode = mode
+        """The dispatch mode used when a publish doesn't specify one."""
+        self.ordered = ordered
+        """If True, the handler keeps its place in the sequential chain even during concurrent publishes."""
+        self.include_subclasses = include_subclasses
+        """If True, the handler also receives subclasses of the event type it subscribed to."""
+        self.mailbox = mailbox
+        """If set, publishing only enqueues the event and the mailbox's worker task calls the handler."""
+        if mailbox is not None:
+            mailbox.bind(self.handler)
+        self.event_class = event_class
+        """The event type the handler subscribed to."""
+        self._on_cancel = on_cancel
+
+        equals, instance_of, predicates, in_sets = _split_filter(event_filter)
+        self.index_field: str | None = None
+        self.index_values: tuple[Hashable, ...] = ()
+        """The values of the index field that the subscription accepts."""
+
+        # The first hashable exact match becomes the index key
+        for position, (field_name, filter_value) in enumerate(equals):
+            if _is_hashable(filter_value):
+                self.index_field = field_name
+                self.index_values = (filter_value,)
+                del equals[position]
+                break
+
+        # Without an exact-match field, index the first set of hashable values under each of them
+        for field_name, in_set in in_sets:
+            values = in_set.hashable_values() if self.index_field is None else None
+            if values is not None:
+                self.index_field = field_name
+                self.index_values = values
+            else:
+                predicates.append((field_name, in_set))
+
+        self.equals: tuple[tuple[str, Any], ...] = tuple(equals)
+        self.instance_of: tuple[tuple[str, type], ...] = tuple(instance_of)
+        self.predicates: tuple[tuple[str, Predicate], ...] = tuple(predicates)
+
+    @property
+    def active(self) -> bool:
+        """False once the subscription has been cancelled."""
+        return self._on_cancel is not None
+
+    def cancel(self) -> None:
+        """
+        Removes the subscription from its bus. Cancelling it again does nothing.
+        """
+        on_cancel, self._on_cancel = self._on_cancel, None
+        if on_cancel is not None:
+            on_cancel(self)
+
+    def accepts(self, event: Event) -> bool:
+        """
+        Checks the whole filter, including the event type and the index field, without an index.
+        """
+        if type(event) is not self.event_class and not (
+            self.include_subclasses and isinstance(event, self.event_class)
+        ):
+            return False
+
+        if self.index_field is not None:
+            if getattr(event, self.index_field, None) not in self.index_values:
+                return False
+
+        return self.matches(event)
+
+    def matches(self, event: Event) -> bool:
+        """
+        Checks the residual part of the filter. The index field is assumed to have matched already.
+        """
+        for field_name, filter_value in self.equals:
+            if getattr(event, field_name, None) != filter_value:
+                return False
+
+        for field_name, filter_type in self.instance_of:
+            if not isinstance(getattr(event, field_name, None), filter_type):
+                return False
+
+        for field_name, predicate in self.predicates:
+            if not predicate(getattr(event, field_name, None)):
+                return False
+
+        return True
+
+    def runs_concurrently(self, mode: DispatchMode | None) -> bool:
+        """
+        Whether this handler gets its own task when an event is published with `mode`.
+        """
+        if self.ordered or not self.is_async or self.mailbox is not None:
+            return False
+
+        return (mode or self.mode) is DispatchMode.CONCURRENT
+
+    async def deliver(self, event: Event) -> None:
+        """
+        Hands an event to the handler, or to its mailbox if it has one.
+        """
+        if self.mailbox is not None:
+            await self.mailbox.put(event)
+        elif self.is_async:
+            await self.handler(event)
+        else:
+            self.handler(event)
+
+
+class SubscriptionIndex:
+    """
+    All subscriptions for a single event type, indexed by their exact-match field values.
+
+    A subscription filtering on an :class:`InSet` is stored in the bucket of each of its values. An
+    event only has one value per field, so it still finds the subscription at most once.
+
+    Publishing looks up one hash bucket per indexed field instead of evaluating every subscriber's
+    filter, so the cost of a publish depends on how many subscribers match rather than how many exist.
+    """
+
+    _by_seq = attrgetter("seq")
+
+    def __init__(self):
+        self._indexed: dict[str, dict[Hashable, dict[int, Subscription]]] = {}
+        """field name -> field value -> subscriptions (keyed by seq, in subscription order)"""
+        self._unindexed: dict[int, Subscription] = {}
+        """Subscriptions with no hashable exact-match field, e.g. plain type subscriptions."""
+        self.subscriptions: list[Subscription] = []
+        """Every subscription in the index, in subscription order."""
+
+    def add(self, subscription: Subscription) -> None:
+        self.subscriptions.append(subscription)
+        if subscription.index_field is None:
+            self._unindexed[subscription.seq] = subscription
+            return
+
+        buckets = self._indexed.setdefault(subscription.index_field, {})
+        for value in subscription.index_values:
+            buckets.setdefault(value, {})[subscription.seq] = subscription
+
+    def match(self, event: Event) -> list[Subscription]:
+        """
+        Returns the subscriptions whose filters accept `event`, in subscription order.
+        """
+        matched = [s for s in self._unindexed.values() if s.matches(event)]
+        sources = 1 if matched else 0
+
+        for field_name, buckets in self._indexed.items():
+            try:
+                bucket = buckets.get(getattr(event, field_name, None))
+            except TypeError:
+                # An unhashable event value can't be equal to any of the (hashable) indexed values.
+                continue
+
+            if bucket:
+                matched.extend(s for s in bucket.values() if s.matches(event))
+                sources += 1
+
+        if sources > 1:
+            matched.sort(key=self._by_seq)
+
+        return matched
+
+
+def _split_filter(
+    event_filter: Event | None,
+) -> tuple[
+    list[tuple[str, Any]],
+    list[tuple[str, type]],
+    list[tuple[str, Predicate]],
+    list[tuple[str, InSet]],
+]:
+    """
+    Sorts the fields set in a filter into exact matches, ``isinstance`` tests, predicates and
+    :class:`InSet` predicates, each in field order.
+    """
+    equals: list[tuple[str, Any]] = []
+    instance_of: list[tuple[str, type]] = []
+    predicates: list[tuple[str, Predicate]] = []
+    in_sets: list[tuple[str, InSet]] = []
+    if event_filter is None:
+        return equals, instance_of, predicates, in_sets
+
+    for field_name, filter_value in event_fields(event_filter):
+        # Skip fields explicitly set to EventParameterFlag.NOT_SPECIFIED, meaning "ignore this field"
+        if filter_value is EventParameterFlag.NOT_SPECIFIED:
+            continue
+
+        # If the filter_value is a type, the event's value must be an instance of that type
+        if isinstance(filter_value, type):
+            instance_of.append((field_name, filter_value))
+        # Predicates are checked by calling them, except for an InSet that ends up indexed
+        elif isinstance(filter_value, InSet):
+            in_sets.append((field_name, filter_value))
+        elif isinstance(filter_value, Predicate):
+            predicates.append((field_name, filter_value))
+        # Otherwise, require an exact match
+        else:
+            equals.append((field_name, filter_value))
+    return equals, instance_of, predicates, in_sets
+
+
+def _is_hashable(value: Any) -> bool:
+    try:
+        hash(value)
+    except TypeError:
+        return False
+    return True
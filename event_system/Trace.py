@@ -0,0 +1,165 @@
+import itertools
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any
+
+_trace_ids = itertools.count(1)
+
+
+@dataclass(slots=True)
+class Span:
+    """
+    One stage of a turn, with monotonic ``time.perf_counter_ns()`` timestamps.
+    """
+
+    stage: str
+    start_ns: int
+    end_ns: int
+
+    @property
+    def duration(self) -> float:
+        """The span's length in seconds."""
+        return (self.end_ns - self.start_ns) / 1e9
+
+
+class Trace:
+    """
+    The timeline of one conversational turn, from the end of the user's speech to the delivery of
+    the reply, carried along on the ``trace`` field of the MessageEvents the turn produces.
+
+    Each pipe a turn passes through records the stages it performed as :class:`Span` objects, and
+    hands the trace on to the events it publishes in response. Spans may be recorded from any
+    thread, since appending to a list is atomic. Traces only mean something in the process that
+    created them, so they don't cross an :class:`EventBridge` or go into an :class:`EventJournal`.
+
+    Stages recorded by the built-in pipes, in turn order:
+        vad_endpoint: from the first silent audio frame to the VAD deciding speech has ended
+        transcription: the speech to text call
+        chunker_hold: the time the RealtimeMessageChunker held the input before passing it on
+        ltm_retrieval: building the LLM context, including the long-term memory lookup
+        llm_first_token: from sending the LLM request to its first streamed token
+        chunk_emission: handing one reply chunk to the pipes listening to the LLM
+        tts_synthesis: generating the speech for one chunk
+        playback: playing one chunk, starting when its first audio goes out
+        output_delivery: the moment an OutputDeliveryEvent for the turn was handled
+    """
+
+    __slots__ = ("trace_id", "spans")
+
+    def __init__(self):
+        self.trace_id = next(_trace_ids)
+        self.spans: list[Span] = []
+
+    def record(self, stage: str, start_ns: int, end_ns: int | None = None) -> Span:
+        """
+        Adds a span. If `end_ns` is None, the span ends now.
+        """
+        span = Span(stage, start_ns, time.perf_counter_ns() if end_ns is None else end_ns)
+        self.spans.append(span)
+        return span
+
+    def mark(self, stage: str) -> Span:
+        """
+        Adds a zero-length span for something that happened now.
+        """
+        now = time.perf_counter_ns()
+        return self.record(stage, now, now)
+
+    @contextmanager
+    def span(self, stage: str) -> Iterator[None]:
+        """
+        Records the time spent in the ``with`` block as a span, even if the block raises.
+        """
+        start_ns = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.record(stage, start_ns)
+
+    def first(self, stage: str) -> Span | None:
+        """
+        Returns the earliest span of the given stage, or None if it wasn't recorded.
+        """
+        spans = [span for span in self.spans if span.stage == stage]
+        return min(spans, key=lambda span: span.start_ns) if spans else None
+
+    @property
+    def origin_ns(self) -> int:
+        """The start of the earliest span, which every offset in the waterfall is relative to."""
+        return min(span.start_ns for span in self.spans) if self.spans else 0
+
+    def time_to_first_audio(self) -> float | None:
+        """
+        The seconds from the start of the turn (normally the end of the user's speech) to the first
+        audio of the reply going out, or None if no playback was recorded.
+        """
+        playback = self.first("playback")
+        if playback is None:
+            return None
+        return (playback.start_ns - self.origin_ns) / 1e9
+
+    def waterfall(self, width: int = 50) -> str:
+        """
+        Formats the spans in start order as a table with a bar per span, times in milliseconds.
+        """
+        if not self.spans:
+            return f"turn {self.trace_id}: no spans"
+
+        spans = sorted(self.spans, key=lambda span: span.start_ns)
+        origin = spans[0].start_ns
+        total = max(max(span.end_ns for span in spans) - origin, 1)
+
+        first_audio = self.time_to_first_audio()
+        header = f"turn {self.trace_id}: {total / 1e6:.1f}ms"
+        if first_audio is not None:
+            header += f", first audio after {first_audio * 1e3:.1f}ms"
+
+        lines = [header]
+        for span in spans:
+            start = (span.start_ns - origin) * width // total
+            length = max((span.end_ns - span.start_ns) * width // total, 1)
+            bar = " " * start + "#" * length
+            lines.append(
+                f"  {span.stage:<18}{(span.start_ns - origin) / 1e6:>9.1f}"
+                f"{span.duration * 1e3:>9.1f}  |{bar:<{width}}|"
+            )
+        return "\n".join(lines)
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Returns the trace as JSON-serializable data, with offsets and durations in milliseconds.
+        """
+        origin = self.origin_ns
+        spans = sorted(self.spans, key=lambda span: span.start_ns)
+        first_audio = self.time_to_first_audio()
+        return {
+            "trace_id": self.trace_id,
+            "time_to_first_audio_ms": None if first_audio is None else first_audio * 1e3,
+            "spans": [
+                {
+                    "stage": span.stage,
+                    "offset_ms": (span.start_ns - origin) / 1e6,
+                    "duration_ms": span.duration * 1e3,
+                }
+                for span in spans
+            ],
+        }
+
+    def __repr__(self) -> str:
+        return f"Trace({self.trace_id}, {len(self.spans)} spans)"
+
+
+@contextmanager
+def traced(trace: Any, stage: str) -> Iterator[None]:
+    """
+    Like :meth:`Trace.span`, but does nothing if `trace` isn't a :class:`Trace`, e.g. because the
+    event being handled has no trace. Pipes can then trace unconditionally.
+    """
+    if not isinstance(trace, Trace):
+        yield
+        return
+
+    with trace.span(stage):
+        yield
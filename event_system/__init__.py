@@ -1,5 +1,20 @@
 from . import events as events
+from .ChromeTrace import ChromeTraceRecorder as ChromeTraceRecorder
 from .Event import Event as Event
+from .Event import EventLane as EventLane
 from .Event import EventParameterFlag as EventParameterFlag
 from .EventBus import EventBus as EventBus
 from .EventBusSingleton import EventBusSingleton as EventBusSingleton
+from .Instrumentation import Instrumentation as Instrumentation
+from .LatencyTracer import LatencyTracer as LatencyTracer
+from .Mailbox import Mailbox as Mailbox
+from .Mailbox import OverflowPolicy as OverflowPolicy
+from .Predicates import AtLeast as AtLeast
+from .Predicates import InSet as InSet
+from .Predicates import NotEqual as NotEqual
+from .Predicates import Predicate as Predicate
+from .Predicates import Range as Range
+from .Predicates import Where as Where
+from .SubscriptionIndex import DispatchMode as DispatchMode
+from .SubscriptionIndex import Subscription as Subscription
+from .Trace import Trace as Trace
@@ -1,7 +1,8 @@
 from dataclasses import dataclass
 from enum import Enum
+from typing import ClassVar
 
-from event_system import Event, EventParameterFlag
+from event_system import Event, EventLane, EventParameterFlag
 
 
 class AudioType(Enum):
@@ -14,15 +15,23 @@ class AudioDirection(Enum):
     OUTPUT = 2
 
 
-@dataclass
+@dataclass(slots=True)
 class VolumeUpdatedEvent(Event):
+    # only the latest volume per slider matters
+    coalesce_key: ClassVar[tuple[str, ...]] = ("audio_type", "audio_direction")
+
     volume: float | EventParameterFlag = EventParameterFlag.NOT_SPECIFIED
     audio_type: AudioType | EventParameterFlag = EventParameterFlag.NOT_SPECIFIED
     audio_direction: AudioDirection | EventParameterFlag = EventParameterFlag.NOT_SPECIFIED
 
 
-@dataclass
+# SpeakingStateUpdate deliberately doesn't coalesce: handlers react to the start of speech
+# (e.g. barge-in interrupts), so a True followed by a False must not collapse into just the False.
+@dataclass(slots=True)
 class SpeakingStateUpdate(Event):
+    # barge-in has to interrupt speech output even while message chunks are queued
+    lane: ClassVar[EventLane] = EventLane.CONTROL
+
     is_speaking: bool | EventParameterFlag = EventParameterFlag.NOT_SPECIFIED
     audio_type: AudioType | EventParameterFlag = EventParameterFlag.NOT_SPECIFIED
     audio_direction: AudioDirection | EventParameterFlag = EventParameterFlag.NOT_SPECIFIED
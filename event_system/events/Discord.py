@@ -21,21 +21,21 @@ PartialMessageableChannel = Union[
 MessageableChannel = Union[PartialMessageableChannel, GroupChannel]
 
 
-@dataclass
+@dataclass(slots=True)
 class VoiceChannelConnectedEvent(Event):
     voice_client: VoiceClient | EventParameterFlag = EventParameterFlag.NOT_SPECIFIED
 
 
-@dataclass
+@dataclass(slots=True)
 class VoiceChannelDisconnectedEvent(Event):
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class TextChannelConnectedEvent(Event):
     channel: MessageableChannel | EventParameterFlag = EventParameterFlag.NOT_SPECIFIED
 
 
-@dataclass
+@dataclass(slots=True)
 class BotReadyEvent(Event):
     client: Client | EventParameterFlag = EventParameterFlag.NOT_SPECIFIED
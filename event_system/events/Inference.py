@@ -0,0 +1,105 @@
+from dataclasses import dataclass
+
+from event_system import Event, EventParameterFlag
+
+
+@dataclass(slots=True)
+class TranscriptionRequest(Event):
+    """
+    A dataclass representing a request for a transcriber hosted in another process.
+
+    Parameters:
+    model (str): the name of the process hosting the transcriber
+    request_id (int): identifies the matching TranscriptionResult
+    audio (bytes): 16-bit mono PCM audio
+    sample_rate (int): the sample rate of the audio
+    input_gain (float): the gain to apply before transcribing
+    """
+
+    model: str | EventParameterFlag = EventParameterFlag.NOT_SPECIFIED
+    request_id: int | EventParameterFlag = EventParameterFlag.NOT_SPECIFIED
+    audio: bytes | EventParameterFlag = EventParameterFlag.NOT_SPECIFIED
+    sample_rate: int | EventParameterFlag = EventParameterFlag.NOT_SPECIFIED
+    input_gain: float | EventParameterFlag = EventParameterFlag.NOT_SPECIFIED
+
+
+@dataclass(slots=True)
+class TranscriptionResult(Event):
+    """
+    A dataclass representing the transcript produced for a TranscriptionRequest.
+
+    Parameters:
+    model (str): the name of the process hosting the transcriber
+    request_id (int): the id of the request
+    text (str): the transcript
+    tags (tuple[str, ...] | None): extra audio tags, or None if the transcriber doesn't support them
+    """
+
+    model: str | EventParameterFlag = EventParameterFlag.NOT_SPECIFIED
+    request_id: int | EventParameterFlag = EventParameterFlag.NOT_SPECIFIED
+    text: str | EventParameterFlag = EventParameterFlag.NOT_SPECIFIED
+    tags: tuple[str, ...] | None | EventParameterFlag = EventParameterFlag.NOT_SPECIFIED
+
+
+@dataclass(slots=True)
+class SpeechSynthesisRequest(Event):
+    """
+    A dataclass representing a request for a text to speech model hosted in another process.
+
+    Parameters:
+    model (str): the name of the process hosting the model
+    request_id (int): identifies the matching SpeechSynthesisResult
+    text (str): the text to speak
+    """
+
+    model: str | EventParameterFlag = EventParameterFlag.NOT_SPECIFIED
+    request_id: int | EventParameterFlag = EventParameterFlag.NOT_SPECIFIED
+    text: str | EventParameterFlag = EventParameterFlag.NOT_SPECIFIED
+
+
+@dataclass(slots=True)
+class SpeechSynthesisResult(Event):
+    """
+    A dataclass representing the audio produced for a SpeechSynthesisRequest.
+
+    Parameters:
+    model (str): the name of the process hosting the model
+    request_id (int): the id of the request
+    audio (bytes | None): 16-bit mono PCM audio, or None if synthesis failed
+    frame_rate (int): the sample rate of the audio
+    """
+
+    model: str | EventParameterFlag = EventParameterFlag.NOT_SPECIFIED
+    request_id: int | EventParameterFlag = EventParameterFlag.NOT_SPECIFIED
+    audio: bytes | None | EventParameterFlag = EventParameterFlag.NOT_SPECIFIED
+    frame_rate: int | EventParameterFlag = EventParameterFlag.NOT_SPECIFIED
+
+
+@dataclass(slots=True)
+class ModelReadyEvent(Event):
+    """
+    A dataclass representing an event raised by a process hosting a model once the model is loaded
+    and warmed up, and requests to it no longer wait for that.
+
+    Parameters:
+    model (str): the name of the process hosting the model
+    """
+
+    model: str | EventParameterFlag = EventParameterFlag.NOT_SPECIFIED
+
+
+@dataclass(slots=True)
+class ModelErrorEvent(Event):
+    """
+    A dataclass representing an event raised by a process hosting a model instead of a result, when
+    handling a request failed.
+
+    Parameters:
+    model (str): the name of the process hosting the model
+    request_id (int): the id of the request that failed
+    error (str): the traceback of the exception the request raised
+    """
+
+    model: str | EventParameterFlag = EventParameterFlag.NOT_SPECIFIED
+    request_id: int | EventParameterFlag = EventParameterFlag.NOT_SPECIFIED
+    error: str | EventParameterFlag = EventParameterFlag.NOT_SPECIFIED
@@ -6,7 +6,7 @@ from .Pipeline import SystemOutputType
 from .System import CommandType
 
 
-@dataclass
+@dataclass(slots=True)
 class NoTagsEvent(Event):
     """
     A dataclass representing an event raised when the language model does not provide any tags for routing a message.
@@ -15,7 +15,7 @@ class NoTagsEvent(Event):
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class InvalidTagEvent(Event):
     """
     A dataclass representing an event raised when the language model does not provide a valid tag for routing a message.
@@ -28,7 +28,7 @@ class InvalidTagEvent(Event):
     tag: str | EventParameterFlag = EventParameterFlag.NOT_SPECIFIED
 
 
-@dataclass
+@dataclass(slots=True)
 class InactiveOutputEvent(Event):
     """
     A dataclass representing an event raised when the language model provides a valid tag, but that output is not available.
@@ -42,7 +42,7 @@ class InactiveOutputEvent(Event):
     tag: SystemOutputType | EventParameterFlag = EventParameterFlag.NOT_SPECIFIED
 
 
-@dataclass
+@dataclass(slots=True)
 class InactiveCommandEvent(Event):
     """
     A dataclass representing an event raised when the language model provides a valid command, but that command is not available.
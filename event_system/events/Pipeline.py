@@ -1,14 +1,15 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 from typing import TYPE_CHECKING, Union
 
 from event_system import Event, EventParameterFlag
+from event_system.Trace import Trace
 
 if TYPE_CHECKING:
     from pipesys import Pipe
 
 
-@dataclass
+@dataclass(slots=True)
 class MessageEvent(Event):
     """
     An event that pipes raise when they have a message to pass along.
@@ -16,6 +17,10 @@ class MessageEvent(Event):
 
     message: str | EventParameterFlag = EventParameterFlag.NOT_SPECIFIED
     sender: Union['Pipe', type["Pipe"], EventParameterFlag] = EventParameterFlag.NOT_SPECIFIED
+    trace: Trace | EventParameterFlag = field(
+        default=EventParameterFlag.NOT_SPECIFIED, kw_only=True
+    )
+    """The latency trace of the turn this message belongs to, if it is being traced."""
 
     def __str__(self) -> str:
         if not isinstance(self.message, str):
@@ -74,7 +79,7 @@ system_output_parse_dict = {
 }
 
 
-@dataclass
+@dataclass(slots=True)
 class UserInputEvent(MessageEvent):
     """
     A class representing an event to be raised when the system receives input from a user.
@@ -101,7 +106,34 @@ class UserInputEvent(MessageEvent):
         return f"[{self.user_input_type.name.lower()}] {self.user_name}: {self.message}"
 
 
-@dataclass
+@dataclass(slots=True)
+class PartialTranscriptEvent(Event):
+    """
+    A dataclass representing an interim transcript of speech the user hasn't finished yet, raised
+    by voice inputs with incremental transcription enabled so that pipes can start work before the
+    final UserInputEvent arrives. It isn't a MessageEvent, so pipes listening for messages don't
+    treat it as input.
+
+    Parameters:
+    stable (str): the words of the utterance so far that won't change anymore
+    unstable (str): the words after them, which later transcripts may still revise
+    sender (Pipe): the input pipe transcribing the speech
+    user_input_type (SystemInputType): where the speech comes from
+    user_name (str): who is speaking, if the input knows
+    """
+
+    stable: str | EventParameterFlag = EventParameterFlag.NOT_SPECIFIED
+    unstable: str | EventParameterFlag = EventParameterFlag.NOT_SPECIFIED
+    sender: Union['Pipe', type["Pipe"], EventParameterFlag] = EventParameterFlag.NOT_SPECIFIED
+    user_input_type: SystemInputType | EventParameterFlag = EventParameterFlag.NOT_SPECIFIED
+    user_name: str | EventParameterFlag = EventParameterFlag.NOT_SPECIFIED
+
+    def __str__(self) -> str:
+        words = [part for part in (self.stable, self.unstable) if isinstance(part, str) and part]
+        return " ".join(words)
+
+
+@dataclass(slots=True)
 class OutputRoutingEvent(MessageEvent):
     """
     A dataclass representing an event to be raised to deliver output to a specific destination.
@@ -110,14 +142,14 @@ class OutputRoutingEvent(MessageEvent):
     destination: SystemOutputType | EventParameterFlag = EventParameterFlag.NOT_SPECIFIED
 
 
-@dataclass
+@dataclass(slots=True)
 class OutputDeliveryEvent(MessageEvent):
     """
     A dataclass representing an event to be raised when an output is successfully delivered.
     """
 
 
-@dataclass
+@dataclass(slots=True)
 class OutputAvailabilityEvent(Event):
     """
     A dataclass representing an event to be raised when the system's outputs or commands change availability.
@@ -127,7 +159,7 @@ class OutputAvailabilityEvent(Event):
     output_available: bool | EventParameterFlag = EventParameterFlag.NOT_SPECIFIED
 
 
-@dataclass
+@dataclass(slots=True)
 class InputActivityEvent(Event):
     """
     A dataclass representing an event to be raised when the system's inputs change availability.
@@ -1,8 +1,10 @@
 from asyncio import Task
+from collections.abc import Callable, Coroutine
 from dataclasses import dataclass
 from enum import Enum
+from typing import Any, ClassVar
 
-from event_system import Event, EventParameterFlag
+from event_system import Event, EventLane, EventParameterFlag
 
 
 class CommandType(Enum):
@@ -14,6 +16,8 @@ class CommandType(Enum):
     LISTEN = 2
     SLEEP = 3
     WAKE = 4
+    TRACE = 5
+    """Starts or stops recording a pipeline trace, see :class:`ChromeTraceRecorder`."""
 
     @staticmethod
     def from_string(str: str) -> "CommandType|None":
@@ -39,15 +43,18 @@ command_event_parse_dict = {
     "listening": CommandType.LISTEN,
     "sleep": CommandType.SLEEP,
     "wake": CommandType.WAKE,
+    "trace": CommandType.TRACE,
 }
 
 
-@dataclass
+@dataclass(slots=True)
 class CommandEvent(Event):
     """
     A dataclass representing a system-wide command to be executed.
     """
 
+    lane: ClassVar[EventLane] = EventLane.CONTROL
+
     command: CommandType | EventParameterFlag = EventParameterFlag.NOT_SPECIFIED
 
 
@@ -58,10 +65,12 @@ class StartupStage(Enum):
 
     BOOT = 1
     WARMUP = 2
+    """The pipes are created and are warming up their models, see :meth:`PipelineGraph.warm_up`."""
     READY = 3
+    """Every pipe that the pipeline waits for has warmed up, so input is processed from now on."""
 
 
-@dataclass
+@dataclass(slots=True)
 class StartupEvent(Event):
     """
     A dataclass representing an event to be raised when the system is starting up.
@@ -70,7 +79,35 @@ class StartupEvent(Event):
     stage: StartupStage | EventParameterFlag = EventParameterFlag.NOT_SPECIFIED
 
 
-@dataclass
+@dataclass(slots=True)
+class PipeReadyEvent(Event):
+    """
+    A dataclass representing an event to be raised when a pipe has finished warming up.
+
+    Parameters:
+    name (str): the name of the pipe in the pipeline
+    warm (bool): False if warming up failed, in which case the pipe works but its first use is slow
+    seconds (float): how long warming up took
+    """
+
+    name: str | EventParameterFlag = EventParameterFlag.NOT_SPECIFIED
+    warm: bool | EventParameterFlag = EventParameterFlag.NOT_SPECIFIED
+    seconds: float | EventParameterFlag = EventParameterFlag.NOT_SPECIFIED
+
+
+class RestartPolicy(Enum):
+    """
+    An enum representing when the task manager restarts a task that has ended.
+    """
+
+    NEVER = 1
+    ON_FAILURE = 2
+    """Restart the task if it raised an exception."""
+    ALWAYS = 3
+    """Restart the task whenever it ends, unless the system is stopping."""
+
+
+@dataclass(slots=True)
 class TaskCreatedEvent(Event):
     """
     A dataclass representing an event to be broadcast when an asyncio task has been created, which will register that task with the task manager.
@@ -78,13 +115,20 @@ class TaskCreatedEvent(Event):
     Parameters:
     task (Task): the task that was created
     pretty_sender (str): a pretty string representation of the sender of the task
+    restart_policy (RestartPolicy): when the task manager restarts the task, NEVER if not given
+    restart (Callable): creates the coroutine to restart the task with, e.g. the bound method the
+        task was created from; required unless the restart policy is NEVER
     """
 
     task: Task | EventParameterFlag = EventParameterFlag.NOT_SPECIFIED
     pretty_sender: str | EventParameterFlag = EventParameterFlag.NOT_SPECIFIED
+    restart_policy: RestartPolicy | EventParameterFlag = EventParameterFlag.NOT_SPECIFIED
+    restart: Callable[[], Coroutine[Any, Any, Any]] | EventParameterFlag = (
+        EventParameterFlag.NOT_SPECIFIED
+    )
 
 
-@dataclass
+@dataclass(slots=True)
 class CommandAvailabilityEvent(Event):
     """
     A dataclass representing an event to be raised when the system's commands change availability.
@@ -1,94 +1,159 @@
+import argparse
 import asyncio
 
-import qasync
-from PyQt5.QtWidgets import QApplication
+import settings
 
+import Runtime
 import Transcribers
-from event_system import EventBusSingleton
-from event_system.events.Pipeline import MessageEvent, OutputRoutingEvent, UserInputEvent
-from event_system.events.System import StartupEvent, StartupStage
-from pipesys.core import AdminPanel, DiscordClientRunner
-from pipesys.inputs import DiscordVoiceInput, SpeechToTextInput
-from pipesys.outputs import DiscordVoiceOutput, FileLogger, PipelineMonitor, TextToSpeechOutput
-from pipesys.processors import ConversationSessionProcessor, RealtimeMessageChunker
+from event_system import ChromeTraceRecorder, EventBusSingleton
+from event_system.EventJournal import EventJournal
+from event_system.events.Pipeline import MessageEvent, UserInputEvent
+from ModelRegistry import shared_text_to_speech, shared_transcriber
+from pipesys import Deferred, PipelineGraph
+from pipesys.inputs import SpeechToTextInput
+from pipesys.outputs import PipelineMonitor, TextToSpeechOutput
+from pipesys.processors import ConversationSessionProcessor
+from RemoteModels import RemoteTextToSpeech, RemoteTranscriber
 from TaskManager import TaskManager
 from TTS import MeloTTS
 
 
-async def main():
-    ## MANDATORY Runs all async tasks, must be created before task-producing modules
-    task_manager = TaskManager()
-    
+def build_graph() -> PipelineGraph:
+    ## The pipeline is validated as a whole before any pipe is created, so a misconfigured graph
+    ## fails before any model loads. Models passed as Deferred are only created once it's valid.
+    ## The same graph can be loaded from a file with PipelineGraph.from_file("pipeline.toml").
+    ## Pipes given by name are only imported if they're configured, along with the libraries they use.
+    graph = PipelineGraph()
+
     # region Core Modules
 
     ## Handles the discord client
-    # await DiscordClientRunner.create()
+    # graph.add("discord_client", "DiscordClientRunner")
 
     # endregion
 
     # region Input Modules
 
     ## Multi-user voice input via discord
-    # await DiscordVoiceInput.create(Transcribers.FasterWhisperTranscriber(), speech_timeout=0.3)
-
-    await PipelineMonitor.create(listen_to=UserInputEvent)
-    await PipelineMonitor.create(listen_to=MessageEvent)
-
-    await SpeechToTextInput.create(Transcribers.FasterWhisperTranscriber())
-    # console_input = await ConsoleInput.create(event_bus)
-    # discord_input = await DiscordInput.create()
+    # graph.add("discord_voice_input", "DiscordVoiceInput",
+    #     transcriber=Deferred(shared_transcriber, RemoteTranscriber, Transcribers.FasterWhisperTranscriber),
+    #     speech_timeout=0.3)
+
+    ## Prints every MessageEvent, including subclasses like UserInputEvent
+    graph.add("pipeline_monitor", PipelineMonitor, listen_to=MessageEvent)
+
+    ## Speech models run in their own processes so inference doesn't compete with the event loop
+    ## Shared models are loaded once, however many modules are configured with the same model
+    graph.add(
+        "speech_input",
+        SpeechToTextInput,
+        transcriber=Deferred(
+            shared_transcriber, RemoteTranscriber, Transcribers.FasterWhisperTranscriber
+        ),
+    )
+    # graph.add("console_input", "ConsoleInput")
+    # graph.add("discord_input", "DiscordInput")
 
     # endregion
 
     # region Processing Modules
 
     ## The chunker accumulates messages over a time period and sends them to the next processor as a batch
-    #message_chunker = await RealtimeMessageChunker.create(
-    #    listen_to=UserInputEvent, processor_delay=0.2
-    #)
+    # graph.add("message_chunker", "RealtimeMessageChunker", listen_to=UserInputEvent, processor_delay=0.2)
 
     ## The conversation session processor queries the LLM
-    conversation_session_processor = await ConversationSessionProcessor.create(
-        listen_to=UserInputEvent
+    ## Pipes listening to it are called directly rather than through the event bus
+    conversation_session_processor = graph.add(
+        "conversation_session_processor", ConversationSessionProcessor, listen_to=UserInputEvent
     )
 
     ## The message router sends the results to the output modules based on a tagging system
     ## For example, if the LLM produces an output with the string "[voice]", the message router will send the text after that tag to the voice output module
-    # message_router = pipesys.processors.MessageRouter(listen_to=conversation_session_processor)
+    # graph.add("message_router", "MessageRouter", listen_to=conversation_session_processor)
 
     # endregion
 
     # region Output Modules
 
-    # console_output = await pipesys.outputs.ConsoleOutput.create(listen_to=conversation_session_processor)
-    await TextToSpeechOutput.create(listen_to=conversation_session_processor)
-    #await DiscordVoiceOutput.create(
-    #    listen_to=conversation_session_processor, text_to_speech=MeloTTS()
-    #)
+    # graph.add("console_output", "ConsoleOutput", listen_to=conversation_session_processor)
+    graph.add(
+        "text_to_speech_output",
+        TextToSpeechOutput,
+        listen_to=conversation_session_processor,
+        text_to_speech=Deferred(shared_text_to_speech, RemoteTextToSpeech, MeloTTS),
+    )
+    # graph.add("discord_voice_output", "DiscordVoiceOutput",
+    #     listen_to=conversation_session_processor,
+    #     text_to_speech=Deferred(shared_text_to_speech, RemoteTextToSpeech, MeloTTS))
 
-    #await FileLogger.create(listen_to=conversation_session_processor)
-    await AdminPanel.create(listen_to=conversation_session_processor)
+    # graph.add("file_logger", "FileLogger", listen_to=conversation_session_processor)
 
-    # visual_output = await pipesys.outputs.VisualOutput.create(listen_to=conversation_session_processor, parent=admin_events)
+    ## GUI pipes are given by name so that Qt is only imported when one of them is configured.
+    ## Without them, the pipeline runs headless on the plain asyncio loop.
+    graph.add("admin_panel", "AdminPanel", listen_to=conversation_session_processor)
 
-    # discord_output = await DiscordOutput.create(listen_to=conversation_session_processor)
+    # graph.add("visual_output", "VisualOutput", listen_to=conversation_session_processor)
+
+    # graph.add("discord_output", "DiscordOutput", listen_to=conversation_session_processor)
 
     # endregion
 
-    # Some modules wait for this event to be triggered before preloading models, doing JIT compilation, etc.
-    print("warming up...")
-    await EventBusSingleton.publish(StartupEvent(StartupStage.WARMUP))
+    return graph
+
+
+async def main(graph: PipelineGraph):
+    ## MANDATORY Lets audio and worker threads publish events onto this loop
+    EventBusSingleton.get().attach_loop(asyncio.get_running_loop())
+
+    ## OPTIONAL Records how long every event handler takes and prints a report on shutdown
+    # EventBusSingleton.get().enable_instrumentation(dump_on_stop=True)
 
-    print("running!")
-    # run tasks
-    await task_manager.run()
+    ## OPTIONAL Records every event to a journal that benchmarks/replay_journal.py can replay, if
+    ## settings.journal_path is set. It's closed after shutdown, so the end of the session is kept
+    journal: EventJournal | None = None
+    if settings.journal_path:
+        journal = EventJournal(settings.journal_path)
+        journal.record(EventBusSingleton.get())
+
+    ## OPTIONAL Prints a latency waterfall for every turn and writes them to a file on shutdown,
+    ## with LatencyTracer from event_system
+    # LatencyTracer(path="latency.json", print_turns=True).start(EventBusSingleton.get())
+
+    ## Records a timeline of handler calls, inference calls and audio callbacks while the "trace"
+    ## command has toggled it on, or from the start if settings.chrome_trace_on_start is set
+    ChromeTraceRecorder(settings.chrome_trace_path).listen(
+        EventBusSingleton.get(), start=settings.chrome_trace_on_start
+    )
+
+    ## MANDATORY Runs all async tasks and restarts crashed ones, must be created before
+    ## task-producing modules
+    task_manager = TaskManager(shutdown_deadline=settings.task_shutdown_deadline)
+
+    try:
+        await graph.build()
+
+        ## Warms up every module's models at once in worker threads, then publishes READY, which
+        ## input modules wait for before taking input. Modules report their readiness with
+        ## PipeReadyEvents.
+        print("warming up...")
+        seconds = await graph.warm_up()
+
+        print(f"running! (ready after {seconds:.1f}s)")
+        # run tasks
+        await task_manager.run()
+        print(task_manager.report())
+    finally:
+        if journal is not None:
+            journal.stop()
 
 
 if __name__ == "__main__":
-    # initialize pyqt5 event loop
-    # this is necessary for compatibility between asyncio and pyqt5
-    app = QApplication([])
-    loop = qasync.QEventLoop(app)
-    asyncio.set_event_loop(loop)
-    with loop:
-        loop.run_until_complete(main())
+    parser = argparse.ArgumentParser(description="Runs the Nyako-System pipeline.")
+    parser.add_argument(
+        "--uvloop", action="store_true", help="run on uvloop if the pipeline has no GUI pipes"
+    )
+    args = parser.parse_args()
+
+    graph = build_graph()
+    # GUI pipes need a Qt event loop, anything else runs on the stock asyncio loop
+    Runtime.run(lambda: main(graph), gui=graph.requires_gui, use_uvloop=args.uvloop)
@@ -0,0 +1,29 @@
+import importlib
+import sys
+from collections.abc import Callable
+from typing import Any
+
+
+def lazy_exports(package: str, exports: dict[str, str]) -> Callable[[str], Any]:
+    """
+    Returns a module ``__getattr__`` for `package` that imports each exported pipe from its
+    submodule the first time it's accessed, so that a pipeline only loads the libraries (discord,
+    pyaudio, PyQt5, ...) of the pipes it actually uses.
+
+    Parameters:
+    package (str): the ``__name__`` of the package
+    exports (dict[str, str]): maps each exported name to the submodule it's defined in, relative to
+        the package
+    """
+
+    def import_export(name: str) -> Any:
+        module = exports.get(name)
+        if module is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+
+        value = getattr(importlib.import_module(module, package), name)
+        # importing the submodule bound its name on the package, so rebind it to the export
+        setattr(sys.modules[package], name, value)
+        return value
+
+    return import_export
@@ -1,25 +1,167 @@
+import itertools
 from abc import ABC
-from typing import Union
+from typing import ClassVar, Union
 
-from event_system import EventBusSingleton
+from event_system import DispatchMode, Event, EventBusSingleton, InSet, Mailbox, Subscription
+from event_system.EventBus import EventHandler
 from event_system.events.Pipeline import MessageEvent
 
 MessageSource = Union[MessageEvent, 'Pipe', type[MessageEvent]]
+
+_direct_counter = itertools.count()
+
+
 class Pipe(ABC):
     """
     Marker interface for classes which take input and give output as part of a pipeline using EventBus.
+
+    Pipes subscribe through :meth:`subscribe`, which keeps the subscription handles so that
+    :meth:`close` can remove everything a pipe subscribed when it is torn down at runtime.
+
+    Pipes that publish their messages with :meth:`emit` can also be connected to their listeners
+    directly, see :class:`PipelineGraph`. Listeners that subscribe to such a pipe with
+    :meth:`subscribe_to_message_sources` are then called by :meth:`emit` without a bus lookup.
     """
 
+    emits_directly: ClassVar[bool] = False
+    """Whether the pipe publishes its messages with :meth:`emit`. Only such pipes can have direct
+        listeners, since other pipes would never call them."""
+
+    requires_gui: ClassVar[bool] = False
+    """Whether the pipe creates Qt widgets, so the pipeline has to run on a Qt event loop."""
+
+    warmup_critical: ClassVar[bool] = True
+    """Whether the pipeline waits for the pipe's :meth:`warmup` before it's READY. Pipes that are
+        only used later, e.g. once a voice channel is joined, can warm up in the background."""
+
+    _direct_listeners: dict[int, Subscription] | None = None
+    """Subscriptions that :meth:`emit` calls directly, or None if direct dispatch isn't enabled."""
+
+    def subscribe(
+        self,
+        event: Event | type[Event],
+        handler: EventHandler,
+        mode: DispatchMode = DispatchMode.SEQUENTIAL,
+        ordered: bool = False,
+        include_subclasses: bool = False,
+        mailbox: Mailbox | None = None,
+        weak: bool = False,
+    ) -> Subscription:
+        """
+        Subscribes a handler on the EventBusSingleton, see :meth:`EventBus.subscribe`, and keeps the
+        handle until the pipe is closed.
+        """
+        subscription = EventBusSingleton.subscribe(
+            event, handler, mode, ordered, include_subclasses, mailbox, weak
+        )
+        self._track(subscription)
+        return subscription
+
+    async def warmup(self):
+        """
+        Warms up the pipe's models, so that the first input doesn't pay for lazy initialization or
+        JIT compilation. Called for every pipe at once by :meth:`PipelineGraph.warm_up`, so blocking
+        work should run in an executor, where it overlaps the other pipes' warmups.
+
+        Does nothing by default.
+        """
+
+    def close(self):
+        """
+        Cancels every subscription made with :meth:`subscribe`, and every direct connection to
+        another pipe.
+        """
+        for subscription in getattr(self, "_subscriptions", ()):
+            subscription.cancel()
+        self._subscriptions = []
+
+    def enable_direct_dispatch(self):
+        """
+        Makes listeners that subscribe to this pipe from now on be called directly by :meth:`emit`.
+
+        Raises:
+            TypeError: If the pipe doesn't publish its messages with :meth:`emit`.
+        """
+        if not self.emits_directly:
+            raise TypeError(f"{type(self).__name__} doesn't publish its messages with emit().")
+        if self._direct_listeners is None:
+            self._direct_listeners = {}
+
+    async def emit(self, event: MessageEvent):
+        """
+        Publishes a message from this pipe.
+
+        Direct listeners whose filters accept the event are called first, in the order they
+        connected, then the event is published on the bus for every other subscriber, such as
+        monitors and loggers.
+        """
+        if self._direct_listeners:
+            listeners = [s for s in self._direct_listeners.values() if s.accepts(event)]
+            await EventBusSingleton.get().dispatch(event, listeners)
+        await EventBusSingleton.publish(event)
+
     def subscribe_to_message_sources(
-        self, listen_to: MessageSource | list[MessageSource], callback
+        self,
+        listen_to: MessageSource | list[MessageSource],
+        callback,
+        mode: DispatchMode = DispatchMode.SEQUENTIAL,
+        include_subclasses: bool = False,
+        mailbox: Mailbox | None = None,
     ):
         if not isinstance(listen_to, list):
             listen_to = [listen_to]
 
+        events = [source for source in listen_to if not isinstance(source, Pipe)]
+        pipes = []
         for source in listen_to:
-            if isinstance(source, Pipe):
+            if not isinstance(source, Pipe):
+                continue
+            if source._direct_listeners is not None:
                 event = MessageEvent(sender=source)
+                self._track(source._connect(event, callback, mode, include_subclasses, mailbox))
             else:
-                event = source
+                pipes.append(source)
+
+        # messages from any of the listened-to pipes go through a single indexed subscription
+        if len(pipes) == 1:
+            events.insert(0, MessageEvent(sender=pipes[0]))
+        elif pipes:
+            events.insert(0, MessageEvent(sender=InSet(*pipes)))
+
+        for event in events:
+            self.subscribe(
+                event, callback, mode, include_subclasses=include_subclasses, mailbox=mailbox
+            )
+
+    def _connect(
+        self,
+        event: MessageEvent,
+        handler: EventHandler,
+        mode: DispatchMode,
+        include_subclasses: bool,
+        mailbox: Mailbox | None,
+    ) -> Subscription:
+        subscription = Subscription(
+            handler,
+            next(_direct_counter),
+            event,
+            mode,
+            include_subclasses=include_subclasses,
+            mailbox=mailbox,
+            event_class=type(event),
+            on_cancel=self._disconnect,
+        )
+        self._direct_listeners[subscription.seq] = subscription
+        return subscription
+
+    def _disconnect(self, subscription: Subscription):
+        if self._direct_listeners.pop(subscription.seq, None) is not None:
+            if subscription.mailbox is not None:
+                subscription.mailbox.release()
 
-            EventBusSingleton.subscribe(event, callback)
+    def _track(self, subscription: Subscription):
+        # Pipes don't call a common __init__, so the list is created on first use
+        try:
+            self._subscriptions.append(subscription)
+        except AttributeError:
+            self._subscriptions = [subscription]
@@ -0,0 +1,554 @@
+import asyncio
+import importlib
+import inspect
+import json
+import time
+import tomllib
+import traceback
+from pathlib import Path
+from typing import Any, Callable, NamedTuple
+
+from event_system import EventBusSingleton
+from event_system.ChromeTrace import record_span
+from event_system.events.Pipeline import MessageEvent
+from event_system.events.System import PipeReadyEvent, StartupEvent, StartupStage
+from pipesys.Pipe import Pipe
+
+_PIPE_PACKAGES = ("pipesys.inputs", "pipesys.processors", "pipesys.outputs", "pipesys.core")
+
+
+class PipelineConfigError(Exception):
+    """
+    Raised when a pipeline definition is invalid. The message lists every problem that was found.
+    """
+
+
+class Deferred:
+    """
+    An option value that is only created when the pipeline is built, e.g. a model that shouldn't
+    load if the pipeline turns out to be misconfigured.
+
+    Example:
+        graph.add("speech_input", SpeechToTextInput,
+                  transcriber=Deferred(RemoteTranscriber, Transcribers.FasterWhisperTranscriber))
+    """
+
+    __slots__ = ("factory", "args", "kwargs")
+
+    def __init__(self, factory: Callable, *args: Any, **kwargs: Any):
+        self.factory = factory
+        self.args = args
+        self.kwargs = kwargs
+
+    def __repr__(self) -> str:
+        return f"Deferred({getattr(self.factory, '__qualname__', self.factory)})"
+
+
+class _PipeReference(NamedTuple):
+    """A ``{ pipe = "name" }`` option value in a pipeline file."""
+
+    name: str
+
+
+class PipeNode:
+    """
+    A pipe in a :class:`PipelineGraph`. Pass the node as a `listen_to` source, or as any other
+    option value, to refer to the pipe it creates.
+    """
+
+    def __init__(self, name: str, pipe_type: type, listen_to: list[Any], options: dict[str, Any]):
+        self.name = name
+        self.pipe_type = pipe_type
+        self.listen_to = listen_to
+        self.options = options
+        self.pipe: Pipe | None = None
+        """The pipe, once the graph has been built."""
+
+    def __repr__(self) -> str:
+        return f"PipeNode({self.name!r}, {self.pipe_type.__name__})"
+
+
+class PipelineGraph:
+    """
+    A declarative description of which pipes to create and what they listen to, which is validated
+    as a whole before any pipe is created.
+
+    Pipes can be added with the Python API or loaded from a TOML or JSON file (see
+    :meth:`from_file`). :meth:`build` checks that every pipe type exists, that every option is a
+    parameter of the pipe's ``create`` method, that required parameters are given, and that the
+    references between pipes name existing pipes and don't form a cycle. Only then are the pipes
+    created, in dependency order, so a misconfigured graph fails before any model loads.
+
+    Edges from a pipe to the pipes listening to it are static, so the graph connects them directly:
+    when the source pipe publishes with :meth:`Pipe.emit`, its listeners are called without a bus
+    lookup, and the message is then published on the bus for dynamic subscribers like monitors.
+    Listening to an event type (e.g. ``UserInputEvent``) stays a dynamic edge through the bus.
+
+    Example:
+        graph = PipelineGraph()
+        processor = graph.add("processor", ConversationSessionProcessor, listen_to=UserInputEvent)
+        graph.add("tts", TextToSpeechOutput, listen_to=processor)
+        pipes = await graph.build()
+        await graph.warm_up()
+    """
+
+    def __init__(self):
+        self.nodes: dict[str, PipeNode] = {}
+        self._background_warmups: set[asyncio.Task] = set()
+
+    def add(
+        self,
+        name: str,
+        pipe_type: type | str,
+        listen_to: Any = None,
+        **options: Any,
+    ) -> PipeNode:
+        """
+        Adds a pipe to the graph.
+
+        Args:
+            name: A unique name for the pipe.
+            pipe_type: The pipe class. It's created with its ``create`` classmethod, or with its
+                       constructor if it has none. Can also be given by name, as in a pipeline
+                       file, so that e.g. Qt is only imported for GUI pipes that are configured.
+            listen_to: The sources the pipe listens to: nodes (or their names), MessageEvent types
+                       or filter instances, or a list of them. None if the pipe doesn't listen.
+            options: The other arguments of ``create``. Nodes are replaced by their pipes and
+                     :class:`Deferred` values are created when the graph is built.
+
+        Raises:
+            PipelineConfigError: If a pipe with the same name was already added, or if there's no
+                                 pipe type with the given name.
+        """
+        if name in self.nodes:
+            raise PipelineConfigError(f"Pipe {name!r} is defined twice.")
+
+        if isinstance(pipe_type, str):
+            try:
+                pipe_type = _resolve_pipe_type(pipe_type)
+            except PipelineConfigError as e:
+                raise PipelineConfigError(f"{name}: {e}") from None
+
+        if listen_to is None:
+            listen_to = []
+        elif not isinstance(listen_to, list):
+            listen_to = [listen_to]
+
+        node = self.nodes[name] = PipeNode(name, pipe_type, listen_to, options)
+        return node
+
+    @property
+    def requires_gui(self) -> bool:
+        """Whether any pipe in the graph creates Qt widgets, see :attr:`Pipe.requires_gui`."""
+        return any(getattr(node.pipe_type, "requires_gui", False) for node in self.nodes.values())
+
+    @classmethod
+    def from_file(cls, path: str | Path) -> "PipelineGraph":
+        """
+        Loads a graph from a TOML or JSON file, see :meth:`from_dict`.
+        """
+        path = Path(path)
+        if path.suffix == ".json":
+            definition = json.loads(path.read_text())
+        else:
+            with path.open("rb") as file:
+                definition = tomllib.load(file)
+        return cls.from_dict(definition)
+
+    @classmethod
+    def from_dict(cls, definition: dict[str, Any]) -> "PipelineGraph":
+        """
+        Creates a graph from a parsed pipeline file. Every entry of its ``pipes`` table is a pipe:
+
+            [pipes.processor]
+            type = "ConversationSessionProcessor"
+            listen_to = ["UserInputEvent"]
+
+            [pipes.tts]
+            type = "TextToSpeechOutput"
+            listen_to = ["processor"]
+
+            [pipes.tts.text_to_speech]
+            object = "RemoteModels:RemoteTextToSpeech"
+            args = [{ object = "TTS:MeloTTS" }]
+
+        ``type`` is the name of a pipe in pipesys or a "module:Class" path. ``listen_to`` names
+        other pipes in the file or MessageEvent types. Any other key is an option for the pipe's
+        ``create`` method. A table with an ``object`` key is the imported object, called with its
+        ``args`` and ``kwargs`` when the graph is built if it has either; a table with a ``pipe``
+        key refers to the named pipe.
+
+        Raises:
+            PipelineConfigError: If a type or object can't be found.
+        """
+        graph = cls()
+        pipes = definition.get("pipes", {})
+        problems: list[str] = []
+
+        for name, entry in pipes.items():
+            entry = dict(entry)
+            try:
+                pipe_type = _resolve_pipe_type(entry.pop("type", None))
+            except PipelineConfigError as e:
+                problems.append(f"{name}: {e}")
+                continue
+
+            listen_to = entry.pop("listen_to", [])
+            if not isinstance(listen_to, list):
+                listen_to = [listen_to]
+            sources = []
+            for source in listen_to:
+                if source in pipes:
+                    sources.append(source)
+                elif (event_type := _message_event_type(source)) is not None:
+                    sources.append(event_type)
+                else:
+                    problems.append(f"{name}: listens to unknown pipe or event {source!r}.")
+
+            try:
+                options = {key: _from_config(value) for key, value in entry.items()}
+            except PipelineConfigError as e:
+                problems.append(f"{name}: {e}")
+                continue
+
+            graph.add(name, pipe_type, sources, **options)
+
+        if problems:
+            raise PipelineConfigError("\n".join(problems))
+        return graph
+
+    def validate(self) -> list[PipeNode]:
+        """
+        Checks the whole graph without creating anything.
+
+        Returns:
+            list[PipeNode]: The nodes in the order they must be created.
+
+        Raises:
+            PipelineConfigError: Listing every problem found.
+        """
+        problems: list[str] = []
+        dependencies: dict[str, list[str]] = {}
+        for node in self.nodes.values():
+            if not isinstance(node.pipe_type, type):
+                problems.append(f"{node.name}: {node.pipe_type!r} is not a pipe class.")
+                dependencies[node.name] = []
+                continue
+
+            referenced = self._check_sources(node, problems)
+            referenced.extend(
+                name for value in node.options.values() for name in self._references(value)
+            )
+            dependencies[node.name] = self._check_references(node, referenced, problems)
+            problems.extend(f"{node.name}: {problem}" for problem in _check_signature(node))
+
+        order, cycle = _creation_order(dependencies)
+        if cycle:
+            problems.append(f"Pipes refer to each other in a cycle: {' -> '.join(cycle)}.")
+
+        if problems:
+            raise PipelineConfigError("\n".join(problems))
+        return [self.nodes[name] for name in order]
+
+    def _check_sources(self, node: PipeNode, problems: list[str]) -> list[str]:
+        """
+        Checks that the node listens to pipes and MessageEvent types, each of them once, and returns
+        the names of the pipes it listens to.
+        """
+        referenced: list[str] = []
+        for source in node.listen_to:
+            name = self._reference_name(source)
+            if name is not None:
+                if name in referenced:
+                    problems.append(f"{node.name}: listens to {name!r} more than once.")
+                referenced.append(name)
+            elif not _is_message_source(source):
+                problems.append(
+                    f"{node.name}: can't listen to {source!r}, "
+                    "which is neither a pipe nor a MessageEvent type."
+                )
+        return referenced
+
+    def _check_references(
+        self, node: PipeNode, referenced: list[str], problems: list[str]
+    ) -> list[str]:
+        """
+        Checks that every pipe the node refers to is in the graph, and returns the ones that are.
+        """
+        missing = [name for name in referenced if name not in self.nodes]
+        problems.extend(f"{node.name}: refers to unknown pipe {name!r}." for name in missing)
+        return [name for name in referenced if name in self.nodes]
+
+    async def build(self, direct_dispatch: bool = True) -> dict[str, Pipe]:
+        """
+        Validates the graph, then creates its pipes in dependency order.
+
+        Args:
+            direct_dispatch: If True, pipes that publish with :meth:`Pipe.emit` call the pipes that
+                             listen to them directly. If False, every edge goes through the bus.
+
+        Returns:
+            dict[str, Pipe]: The created pipes, by name.
+
+        Raises:
+            PipelineConfigError: If the graph is invalid. Nothing has been created in that case.
+            Exception: Whatever a pipe's factory raises, after the pipes created before it have
+                       been closed.
+        """
+        order = self.validate()
+
+        sources = {
+            name
+            for node in order
+            for source in node.listen_to
+            if (name := self._reference_name(source)) is not None
+        }
+
+        created: list[PipeNode] = []
+        try:
+            for node in order:
+                await self._create(node, direct_dispatch and node.name in sources)
+                created.append(node)
+        except BaseException:
+            # the pipes created so far are subscribed to the bus, so they'd handle events on their
+            # own if they were left behind
+            for node in reversed(created):
+                await self._close(node)
+            raise
+
+        return {name: node.pipe for name, node in self.nodes.items()}
+
+    async def _create(self, node: PipeNode, direct_dispatch: bool):
+        listen_to = [self._resolve_source(source) for source in node.listen_to]
+        options = {key: self._resolve(value) for key, value in node.options.items()}
+        if listen_to:
+            options["listen_to"] = listen_to if len(listen_to) > 1 else listen_to[0]
+
+        create = getattr(node.pipe_type, "create", None) or node.pipe_type
+        pipe = create(**options)
+        if inspect.isawaitable(pipe):
+            pipe = await pipe
+        node.pipe = pipe
+
+        if direct_dispatch and getattr(pipe, "emits_directly", False):
+            pipe.enable_direct_dispatch()
+
+    async def _close(self, node: PipeNode):
+        pipe, node.pipe = node.pipe, None
+        try:
+            closed = getattr(pipe, "close", lambda: None)()
+            if inspect.isawaitable(closed):
+                await closed
+        except Exception:
+            print(f"Closing {node.name} failed:")
+            traceback.print_exc()
+
+    async def warm_up(self) -> float:
+        """
+        Publishes StartupEvent(WARMUP), warms up every pipe of the built graph at once with
+        :meth:`Pipe.warmup`, and publishes StartupEvent(READY) once the pipes the pipeline waits
+        for (see :attr:`Pipe.warmup_critical`) are warm. The other pipes keep warming up in the
+        background.
+
+        Each pipe reports its readiness with a PipeReadyEvent. A pipe whose warmup fails is reported
+        as not warm, and doesn't hold up READY: it still works, but its first use is slow.
+
+        Returns:
+            float: The seconds it took until READY.
+        """
+        started = time.perf_counter()
+        await EventBusSingleton.publish(StartupEvent(StartupStage.WARMUP))
+
+        critical = []
+        for node in self.nodes.values():
+            if node.pipe is None:
+                raise RuntimeError(f"{node.name} hasn't been created, build the graph first.")
+
+            warmup = asyncio.create_task(self._warm_up_pipe(node.name, node.pipe))
+            if getattr(node.pipe, "warmup_critical", True):
+                critical.append(warmup)
+            else:
+                # kept so that the task isn't garbage collected before it's done
+                self._background_warmups.add(warmup)
+                warmup.add_done_callback(self._background_warmups.discard)
+
+        await asyncio.gather(*critical)
+        await EventBusSingleton.publish(StartupEvent(StartupStage.READY))
+        return time.perf_counter() - started
+
+    async def _warm_up_pipe(self, name: str, pipe: Any):
+        started = time.perf_counter()
+        warm = True
+        try:
+            warmup = getattr(pipe, "warmup", None)
+            if warmup is not None:
+                with record_span(name, "warmup", asynchronous=True):
+                    await warmup()
+        except Exception:
+            warm = False
+            print(f"Warming up {name} failed, its first use will be slow:")
+            traceback.print_exc()
+
+        await EventBusSingleton.publish(PipeReadyEvent(name, warm, time.perf_counter() - started))
+
+    def _reference_name(self, source: Any) -> str | None:
+        """The name of the pipe a `listen_to` source refers to, if it refers to one in the graph."""
+        if isinstance(source, (PipeNode, _PipeReference)):
+            return source.name
+        if isinstance(source, str):
+            return source
+        return None
+
+    def _references(self, value: Any) -> list[str]:
+        if isinstance(value, (PipeNode, _PipeReference)):
+            return [value.name]
+        if isinstance(value, (list, tuple)):
+            return [name for item in value for name in self._references(item)]
+        if isinstance(value, dict):
+            return self._references(list(value.values()))
+        if isinstance(value, Deferred):
+            return self._references([*value.args, *value.kwargs.values()])
+        return []
+
+    def _resolve(self, value: Any) -> Any:
+        if isinstance(value, (PipeNode, _PipeReference)):
+            return self.nodes[value.name].pipe
+        # containers are only copied if they contain something to resolve, so that a list or dict
+        # given as an option stays the same object
+        if isinstance(value, list):
+            resolved = [self._resolve(item) for item in value]
+            return value if all(a is b for a, b in zip(resolved, value)) else resolved
+        if isinstance(value, dict):
+            resolved = {key: self._resolve(item) for key, item in value.items()}
+            return value if all(resolved[key] is item for key, item in value.items()) else resolved
+        if isinstance(value, Deferred):
+            args = [self._resolve(arg) for arg in value.args]
+            kwargs = {key: self._resolve(arg) for key, arg in value.kwargs.items()}
+            return value.factory(*args, **kwargs)
+        return value
+
+    def _resolve_source(self, source: Any) -> Any:
+        name = self._reference_name(source)
+        return self.nodes[name].pipe if name is not None else source
+
+
+def _is_message_source(source: Any) -> bool:
+    if isinstance(source, type):
+        return issubclass(source, MessageEvent)
+    return isinstance(source, (MessageEvent, Pipe))
+
+
+def _check_signature(node: PipeNode) -> list[str]:
+    create = getattr(node.pipe_type, "create", None) or node.pipe_type
+    try:
+        parameters = inspect.signature(create).parameters
+    except (TypeError, ValueError):
+        return []
+
+    accepts_any = any(p.kind is inspect.Parameter.VAR_KEYWORD for p in parameters.values())
+    given = set(node.options)
+    if node.listen_to:
+        given.add("listen_to")
+
+    problems = []
+    if not accepts_any:
+        for name in sorted(given - set(parameters)):
+            problems.append(f"{node.pipe_type.__name__} has no option {name!r}.")
+
+    for name, parameter in parameters.items():
+        required = parameter.default is inspect.Parameter.empty and parameter.kind not in (
+            inspect.Parameter.VAR_POSITIONAL,
+            inspect.Parameter.VAR_KEYWORD,
+        )
+        if required and name not in given:
+            problems.append(f"{node.pipe_type.__name__} requires {name!r}.")
+    return problems
+
+
+def _creation_order(dependencies: dict[str, list[str]]) -> tuple[list[str], list[str]]:
+    """
+    Orders the names so that every name comes after its dependencies. Returns the order and, if the
+    dependencies contain a cycle, the names along it.
+    """
+    order: list[str] = []
+    state: dict[str, int] = {}  # 1 while visiting, 2 once ordered
+    path: list[str] = []
+
+    def visit(name: str) -> list[str]:
+        if state.get(name) == 2:
+            return []
+        if state.get(name) == 1:
+            return path[path.index(name) :] + [name]
+
+        state[name] = 1
+        path.append(name)
+        for dependency in dependencies[name]:
+            cycle = visit(dependency)
+            if cycle:
+                return cycle
+        path.pop()
+        state[name] = 2
+        order.append(name)
+        return []
+
+    for name in dependencies:
+        cycle = visit(name)
+        if cycle:
+            return order, cycle
+    return order, []
+
+
+def _resolve_pipe_type(name: Any) -> type:
+    if not isinstance(name, str):
+        raise PipelineConfigError("every pipe needs a 'type'.")
+
+    if ":" in name:
+        return _import(name)
+
+    for package in _PIPE_PACKAGES:
+        pipe_type = getattr(importlib.import_module(package), name, None)
+        if isinstance(pipe_type, type):
+            return pipe_type
+    raise PipelineConfigError(f"unknown pipe type {name!r}.")
+
+
+def _message_event_type(name: Any) -> type[MessageEvent] | None:
+    if not isinstance(name, str):
+        return None
+
+    pending = [MessageEvent]
+    while pending:
+        event_type = pending.pop()
+        if event_type.__name__ == name:
+            return event_type
+        pending.extend(event_type.__subclasses__())
+    return None
+
+
+def _from_config(value: Any) -> Any:
+    if isinstance(value, list):
+        return [_from_config(item) for item in value]
+    if not isinstance(value, dict):
+        return value
+
+    if "pipe" in value:
+        return _PipeReference(value["pipe"])
+    if "object" in value:
+        target = _import(value["object"])
+        if "args" in value or "kwargs" in value:
+            args = [_from_config(arg) for arg in value.get("args", [])]
+            kwargs = {key: _from_config(arg) for key, arg in value.get("kwargs", {}).items()}
+            return Deferred(target, *args, **kwargs)
+        return target
+    return {key: _from_config(item) for key, item in value.items()}
+
+
+def _import(path: str) -> Any:
+    module_name, _, qualname = path.partition(":")
+    try:
+        target = importlib.import_module(module_name)
+        for attribute in qualname.split("."):
+            target = getattr(target, attribute)
+    except (ImportError, AttributeError) as e:
+        raise PipelineConfigError(f"can't import {path!r}: {e}") from e
+    return target
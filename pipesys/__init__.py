@@ -4,4 +4,7 @@ from .Pipe import Pipe as Pipe, MessageSource as MessageSource  # noqa: I001
 from . import inputs as inputs
 from . import outputs as outputs
 from . import processors as processors
-from . import core as core
\ No newline at end of file
+from . import core as core
+from .PipelineGraph import Deferred as Deferred
+from .PipelineGraph import PipelineConfigError as PipelineConfigError
+from .PipelineGraph import PipelineGraph as PipelineGraph
@@ -34,6 +34,8 @@ from pipesys import MessageSource, Pipe
 
 
 class AdminPanel(Pipe):
+    requires_gui = True
+
     def __init__(self, listen_to: MessageSource):
         super().__init__()
 
@@ -63,9 +65,9 @@ class AdminPanel(Pipe):
         task = asyncio.create_task(self.run_admin_panel())
         await EventBusSingleton.publish(TaskCreatedEvent(task, "Admin Panel"))
 
-        EventBusSingleton.subscribe(CommandEvent(CommandType.STOP), self.on_stop)
-        EventBusSingleton.subscribe(BotReadyEvent, self.update_discord_control_panel)
-        EventBusSingleton.subscribe(StartupEvent(StartupStage.WARMUP), self.publish_volume_defaults)
+        self.subscribe(CommandEvent(CommandType.STOP), self.on_stop)
+        self.subscribe(BotReadyEvent, self.update_discord_control_panel)
+        self.subscribe(StartupEvent(StartupStage.WARMUP), self.publish_volume_defaults)
 
         return self
 
@@ -215,21 +217,20 @@ class AdminPanel(Pipe):
 
     def volume_updated(self, value, audio_type, audio_dir):
         # Handle volume update here
-        asyncio.create_task(
-            EventBusSingleton.publish(VolumeUpdatedEvent(float(value) / 100, audio_type, audio_dir))
+        # sliders fire for every tick while dragged; the bus only delivers the latest value per slider
+        EventBusSingleton.publish_threadsafe(
+            VolumeUpdatedEvent(float(value) / 100, audio_type, audio_dir)
         )
 
     def toggle_command_access(self, state, command_type):
         # Handle command access toggle here
-        asyncio.create_task(
-            EventBusSingleton.publish(
-                CommandAvailabilityEvent(command_type, state == Qt.CheckState.Checked)
-            )
+        EventBusSingleton.publish_threadsafe(
+            CommandAvailabilityEvent(command_type, state == Qt.CheckState.Checked)
         )
 
     def trigger_command(self, command_type):
         # Handle command trigger here
-        asyncio.create_task(EventBusSingleton.publish(CommandEvent(command_type)))
+        EventBusSingleton.publish_threadsafe(CommandEvent(command_type))
 
     def on_message(self, event: MessageEvent):
         if(not isinstance(event.message, str)):
@@ -256,6 +257,7 @@ if __name__ == "__main__":
     loop = qasync.QEventLoop(app)
 
     asyncio.set_event_loop(loop)
+    EventBusSingleton.get().attach_loop(loop)
 
     panel = AdminPanel(listen_to=MessageEvent)
     panel.window.show()
@@ -1,3 +1,17 @@
-from .AdminPanel import AdminPanel as AdminPanel
-from .DiscordClientRunner import DiscordClientRunner as DiscordClientRunner
-from .SleepManager import SleepManager as SleepManager
+from typing import TYPE_CHECKING
+
+from pipesys.LazyExports import lazy_exports
+
+if TYPE_CHECKING:
+    from .AdminPanel import AdminPanel as AdminPanel
+    from .DiscordClientRunner import DiscordClientRunner as DiscordClientRunner
+    from .SleepManager import SleepManager as SleepManager
+
+__getattr__ = lazy_exports(
+    __name__,
+    {
+        "AdminPanel": ".AdminPanel",
+        "DiscordClientRunner": ".DiscordClientRunner",
+        "SleepManager": ".SleepManager",
+    },
+)
@@ -4,7 +4,7 @@ from aioconsole import ainput
 
 from event_system import EventBus, EventBusSingleton
 from event_system.events.Pipeline import SystemInputType, UserInputEvent
-from event_system.events.System import TaskCreatedEvent
+from event_system.events.System import RestartPolicy, TaskCreatedEvent
 from pipesys.Pipe import Pipe
 
 
@@ -18,7 +18,9 @@ class ConsoleInput(Pipe):
         self.event_bus = EventBusSingleton.get()
 
         task = asyncio.create_task(self.run())
-        await self.event_bus.publish(TaskCreatedEvent(task, "Console Input"))
+        await self.event_bus.publish(
+            TaskCreatedEvent(task, "Console Input", RestartPolicy.ON_FAILURE, self.run)
+        )
         return self
 
     async def run(self):
@@ -18,11 +18,11 @@ class DiscordInput(Pipe):
         self = DiscordInput()
 
         # a part of the 'discord' package, separate from the event system which uses EventBus
-        EventBusSingleton.subscribe(CommandEvent(CommandType.STOP), self.onStop)
+        self.subscribe(CommandEvent(CommandType.STOP), self.onStop)
 
-        EventBusSingleton.subscribe(TextChannelConnectedEvent, self.onTextChannelConnect)
+        self.subscribe(TextChannelConnectedEvent, self.onTextChannelConnect)
 
-        EventBusSingleton.subscribe(BotReadyEvent, self.onBotReady)
+        self.subscribe(BotReadyEvent, self.onBotReady)
 
         return self
 
@@ -1,47 +1,108 @@
 import asyncio
-import collections
+import queue
 import threading
-from asyncio import AbstractEventLoop
+import time
+import traceback
 
+import numpy as np
 import pyaudio
 from pydub import AudioSegment
+from settings import (
+    INPUT_SAMPLING_RATE,
+    FramesPerBuffer,
+    debug_mode,
+    max_utterance_seconds,
+    speech_sensitivity_threshold,
+)
 
+import VAD_utils
 from audio_playback import PyAudioPlayer
 from event_system import EventBusSingleton
+from event_system.ChromeTrace import record_span
 from event_system.events.Audio import (
     AudioDirection,
     AudioType,
     SpeakingStateUpdate,
     VolumeUpdatedEvent,
 )
-from event_system.events.Pipeline import SystemInputType, UserInputEvent
-from event_system.events.System import CommandEvent, CommandType, TaskCreatedEvent
+from event_system.events.Pipeline import (
+    PartialTranscriptEvent,
+    SystemInputType,
+    UserInputEvent,
+)
+from event_system.events.System import (
+    CommandEvent,
+    CommandType,
+    StartupEvent,
+    StartupStage,
+    TaskCreatedEvent,
+)
+from event_system.Instrumentation import LatencyHistogram
+from event_system.Trace import Trace
+from ModelRegistry import release_model, shared_transcriber
 from pipesys import Pipe
-from settings import INPUT_SAMPLING_RATE, FramesPerBuffer, debug_mode, speech_sensitivity_threshold
+from SpeechBuffer import SpeechBuffer
+from StablePrefix import StablePrefix
 from Transcribers import Transcriber, WhisperTranscriber
 from VAD_utils import detect_voice_activity
 
 
 class SpeechToTextInput(Pipe):
-    asyncio_main_loop: AbstractEventLoop
     transcriber: Transcriber
     audio: pyaudio.PyAudio
 
-    def __init__(self, pre_buffer_seconds: float):
+    def __init__(self, pre_buffer_seconds: float, partial_interval: float | None):
         self.audio = pyaudio.PyAudio()
+        self.stream: pyaudio.Stream | None = None
         self.noSpeechTime = 0
+        self.silence_started_ns = 0
         self.speechRecordingTriggered = False
-        self.speechBuffer: bytes = b""
         self.input_gain: float = 1.0
         self.stopped = False
-        self.asyncio_main_loop = asyncio.get_event_loop()
-        
-        # rolling buffer of recent audio because the VAD cuts off the beginning of the audio
-        pre_buffer_frames = int((INPUT_SAMPLING_RATE / FramesPerBuffer) * pre_buffer_seconds)
-        self.pre_speech_buffer = collections.deque(maxlen=pre_buffer_frames)
+
+        # keeps recent audio as a pre-roll too, because the VAD cuts off the beginning of the audio.
+        # The headroom lets the next utterance be recorded while the last one is transcribed
+        max_utterance_samples = int(INPUT_SAMPLING_RATE * max_utterance_seconds)
+        self.speech_buffer = SpeechBuffer(
+            pre_roll_samples=int(INPUT_SAMPLING_RATE * pre_buffer_seconds),
+            max_utterance_samples=max_utterance_samples,
+            headroom_samples=max_utterance_samples,
+        )
+
+        # the PyAudio callback only queues frames, and VAD endpointing and transcription each run
+        # on a worker thread, so that capture never waits for them
+        self.frames: queue.SimpleQueue[tuple[bytes, int] | None] = queue.SimpleQueue()
+        # (samples, endpoint or capture time, whether the transcript is final, whether the user
+        # stopped speaking). A monologue that fills the buffer is transcribed in final parts before
+        # the user stops
+        self.utterances: queue.SimpleQueue[tuple[np.ndarray, int, bool, bool] | None] = (
+            queue.SimpleQueue()
+        )
+        self.endpoint_thread = threading.Thread(
+            target=self.endpoint_frames, name="speech endpointing", daemon=True
+        )
+        self.transcription_thread = threading.Thread(
+            target=self.transcribe_utterances, name="speech transcription", daemon=True
+        )
+        self.callback_durations = LatencyHistogram()
+        self.overflows = 0
+
+        # frames between interim transcripts while the user speaks, None if they're disabled
+        self.partial_frames: int | None = None
+        if partial_interval is not None:
+            frames_per_second = INPUT_SAMPLING_RATE / FramesPerBuffer
+            self.partial_frames = max(round(partial_interval * frames_per_second), 1)
+        self.frames_since_partial = 0
+        # only used by the transcription thread
+        self.stable_prefix = StablePrefix()
 
     @classmethod
-    async def create(cls, transcriber: Transcriber | None, pre_buffer_seconds: float = 0.2):
+    async def create(
+        cls,
+        transcriber: Transcriber | None,
+        pre_buffer_seconds: float = 0.2,
+        partial_interval: float | None = None,
+    ):
         """
         Creates an instance of the SpeechToTextInput module.
 
@@ -49,19 +110,23 @@ class SpeechToTextInput(Pipe):
         event_bus (EventBus): the event bus to use
         transcriber (nyako_stt.Transcriber): the transcriber to use
         publish_channel (str): the channel
+        partial_interval (float | None): if given, the speech is re-transcribed every this many
+            seconds while the user speaks, and published as PartialTranscriptEvents
 
         Returns:
         SpeechToTextInput: the created instance
         """
-        self = SpeechToTextInput(pre_buffer_seconds)
+        self = SpeechToTextInput(pre_buffer_seconds, partial_interval)
 
         if transcriber:
             self.transcriber = transcriber
         else:
-            self.transcriber = WhisperTranscriber()
+            # shared with any other pipe that uses the default transcriber
+            self.transcriber = shared_transcriber(WhisperTranscriber)
 
-        EventBusSingleton.subscribe(CommandEvent(CommandType.STOP), self.stop)
-        EventBusSingleton.subscribe(
+        self.subscribe(StartupEvent(StartupStage.READY), self.open_microphone)
+        self.subscribe(CommandEvent(CommandType.STOP), self.stop)
+        self.subscribe(
             VolumeUpdatedEvent(audio_type=AudioType.SYSTEM, audio_direction=AudioDirection.INPUT),
             self.on_input_volume_update,
         )
@@ -70,13 +135,20 @@ class SpeechToTextInput(Pipe):
         await EventBusSingleton.publish(TaskCreatedEvent(task, pretty_sender="Speech to Text"))
         return self
 
-    def stop(self, event: CommandEvent):
-        self.stream.stop_stream()
-        self.stream.close()
-        self.stopped = True
+    async def warmup(self):
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(
+            loop.run_in_executor(None, VAD_utils.warmup),
+            loop.run_in_executor(None, self.transcriber.warmup),
+        )
 
-    # simple keepalive deal
-    async def run(self):
+    def open_microphone(self, event: StartupEvent):
+        # opened once the models are warm, so that the first utterance isn't slowed down by them
+        if self.stream is not None or self.stopped:
+            return
+
+        self.endpoint_thread.start()
+        self.transcription_thread.start()
         self.stream = self.audio.open(
             rate=INPUT_SAMPLING_RATE,
             channels=1,
@@ -85,6 +157,22 @@ class SpeechToTextInput(Pipe):
             frames_per_buffer=FramesPerBuffer,
             stream_callback=self.microphone_input_callback,
         )
+
+    def close(self):
+        super().close()
+        release_model(self.transcriber)
+
+    def stop(self, event: CommandEvent):
+        if self.stream is not None:
+            self.stream.stop_stream()
+            self.stream.close()
+            print(self.capture_report())
+        self.stopped = True
+        # the workers finish the queued frames, skipping their transcription, and end
+        self.frames.put(None)
+
+    # simple keepalive deal
+    async def run(self):
         while not self.stopped:
             await asyncio.sleep(0.1)
 
@@ -101,7 +189,23 @@ class SpeechToTextInput(Pipe):
         self.stream.start_stream()
 
     def microphone_input_callback(self, in_data, frame_count, time_info, status):
-        self.pre_speech_buffer.append(in_data)
+        # runs on PortAudio's thread, so it only queues the frame for the endpointing worker
+        started = time.perf_counter_ns()
+        with record_span("microphone_input_callback", "audio"):
+            if status & pyaudio.paInputOverflow:
+                self.overflows += 1
+            self.frames.put((in_data, started))
+        self.callback_durations.add(time.perf_counter_ns() - started)
+        return (in_data, pyaudio.paContinue)
+
+    def endpoint_frames(self):
+        while (frame := self.frames.get()) is not None:
+            with record_span("endpoint_frame", "audio"):
+                self.process_microphone_input(*frame)
+        self.utterances.put(None)
+
+    def process_microphone_input(self, in_data: bytes, captured_ns: int):
+        self.speech_buffer.append(in_data)
 
         is_speaking_probability = detect_voice_activity(in_data)
 
@@ -111,86 +215,138 @@ class SpeechToTextInput(Pipe):
         ):
             self.speechRecordingTriggered = True
 
-            # add pre-speech buffer here
-            self.speechBuffer = b"".join(self.pre_speech_buffer)
+            # the utterance starts with the pre-roll, which includes this frame
+            self.speech_buffer.start_utterance()
+            self.frames_since_partial = 0
 
             # raise user speaking state update event
-            asyncio.run_coroutine_threadsafe(
-                EventBusSingleton.publish(
-                    SpeakingStateUpdate(True, AudioType.SYSTEM, AudioDirection.INPUT)
-                ),
-                self.asyncio_main_loop,
+            EventBusSingleton.publish_threadsafe(
+                SpeakingStateUpdate(True, AudioType.SYSTEM, AudioDirection.INPUT)
             )
 
-        if self.speechRecordingTriggered:
-            self.speechBuffer += in_data
-
         if is_speaking_probability < 0.5:
+            if self.noSpeechTime == 0:
+                self.silence_started_ns = captured_ns
             self.noSpeechTime += 0.032
             if self.noSpeechTime > 1 and self.speechRecordingTriggered:
                 # stop recording and reset no speech time
                 self.speechRecordingTriggered = False
                 self.noSpeechTime = 0
 
-                speech_buffer_audiosegment = AudioSegment(
-                    data=self.speechBuffer,
-                    sample_width=2,
-                    frame_rate=INPUT_SAMPLING_RATE,
-                    channels=1,
-                )
-                
-                if(debug_mode):
-                    # spin off thread here for debug audio playback
-                    t = threading.Thread(target = play_debug_audio, args=(speech_buffer_audiosegment,))
-                    t.start()
-
-                # decode speech
-                transcript = self.transcriber.transcribe_speech(
-                    speech_buffer_audiosegment, input_gain=self.input_gain
-                )
-
-                if self.transcriber.supports_extra_tagging():
-                    tags = self.transcriber.get_extra_tagging()
-                    tags_string = ", ".join(tags)  # Convert the list of tags to a string
-                    transcript = (
-                        f"(Audio: {tags_string})" + transcript
-                    )  # Prepend the tags to the transcript
-
-                # raise user speaking state update event
-                asyncio.run_coroutine_threadsafe(
-                    EventBusSingleton.publish(
-                        SpeakingStateUpdate(False, AudioType.SYSTEM, AudioDirection.INPUT)
-                    ),
-                    self.asyncio_main_loop,
-                )
-
-                # debug
-                if debug_mode:
-                    print("Transcript: " + transcript)
-
-                # clear buffer after STT
-                self.speechBuffer = b""
-
-                # make sure text is not empty or only whitespace
-                if not transcript.strip():
-                    return (in_data, pyaudio.paContinue)
-
-                # send transcript to next modules
-                asyncio.run_coroutine_threadsafe(
-                    EventBusSingleton.publish(
-                        UserInputEvent(transcript, self, SystemInputType.VOICE, priority=2)
-                    ),
-                    self.asyncio_main_loop,
-                )
+                # the turn's latency is measured from the end of the user's speech
+                utterance = self.speech_buffer.hold_utterance()
+                self.utterances.put((utterance, self.silence_started_ns, True, True))
         else:
             self.noSpeechTime = 0
 
-        return (in_data, pyaudio.paContinue)
+        if self.speech_buffer.full:
+            # a monologue longer than the buffer is transcribed in parts, without a pre-roll for
+            # the next part so that no audio is transcribed twice
+            self.utterances.put((self.speech_buffer.hold_utterance(), captured_ns, True, False))
+            self.speech_buffer.start_utterance(pre_roll=False)
+
+        if self.speechRecordingTriggered and self.partial_frames is not None:
+            self.frames_since_partial += 1
+            if self.frames_since_partial >= self.partial_frames:
+                self.frames_since_partial = 0
+                self.utterances.put((self.speech_buffer.hold(), captured_ns, False, False))
+
+    def transcribe_utterances(self):
+        # a single worker, so transcripts are published in the order the utterances were spoken
+        while (utterance := self.utterances.get()) is not None:
+            samples, captured_ns, final, endpoint = utterance
+            try:
+                if self.stopped:
+                    continue
+                if final:
+                    self.transcribe_utterance(samples, captured_ns, endpoint)
+                elif self.utterances.empty():
+                    # otherwise a newer interim transcript or the final one is already waiting
+                    self.transcribe_partial(samples)
+            except Exception:
+                print("Error transcribing speech:")
+                traceback.print_exc()
+            finally:
+                self.speech_buffer.release()
+
+    def transcribe_utterance(self, samples: np.ndarray, endpoint_ns: int, endpoint: bool):
+        trace = Trace()
+        trace.record("vad_endpoint", endpoint_ns)
+
+        if debug_mode:
+            speech_buffer_audiosegment = AudioSegment(
+                data=samples.tobytes(),
+                sample_width=2,
+                frame_rate=INPUT_SAMPLING_RATE,
+                channels=1,
+            )
+            # spin off thread here for debug audio playback
+            t = threading.Thread(target=play_debug_audio, args=(speech_buffer_audiosegment,))
+            t.start()
+
+        # decode speech
+        with trace.span("transcription"), record_span("transcribe_speech", "inference"):
+            transcript = self.transcriber.transcribe_samples(samples, input_gain=self.input_gain)
+
+        if self.partial_frames is not None:
+            # keeps the words interim transcripts already published as stable
+            transcript = self.stable_prefix.finalize(transcript)
+            self.stable_prefix = StablePrefix()
+
+        if self.transcriber.supports_extra_tagging():
+            tags = self.transcriber.get_extra_tagging()
+            tags_string = ", ".join(tags)  # Convert the list of tags to a string
+            # Prepend the tags to the transcript
+            transcript = f"(Audio: {tags_string})" + transcript
+
+        # the endpointing thread has moved on since, so the job says whether the user stopped
+        # speaking rather than its state
+        if endpoint:
+            # raise user speaking state update event
+            EventBusSingleton.publish_threadsafe(
+                SpeakingStateUpdate(False, AudioType.SYSTEM, AudioDirection.INPUT)
+            )
+
+        # debug
+        if debug_mode:
+            print("Transcript: " + transcript)
+
+        # make sure text is not empty or only whitespace
+        if not transcript.strip():
+            return
+
+        # send transcript to next modules
+        EventBusSingleton.publish_threadsafe(
+            UserInputEvent(transcript, self, SystemInputType.VOICE, priority=2, trace=trace)
+        )
+
+    def transcribe_partial(self, samples: np.ndarray):
+        with record_span("transcribe_partial", "inference"):
+            transcript = self.transcriber.transcribe_samples(samples, input_gain=self.input_gain)
+
+        stable, unstable = self.stable_prefix.update(transcript)
+        EventBusSingleton.publish_threadsafe(
+            PartialTranscriptEvent(stable, unstable, self, SystemInputType.VOICE)
+        )
+
+    def capture_report(self) -> str:
+        """
+        Formats how long the PyAudio callback took, and how often the input stream overflowed.
+        """
+        durations = self.callback_durations
+        return (
+            f"microphone callback: {durations.count} frames, "
+            f"p50 {durations.percentile(0.5) * 1e6:.1f}us, "
+            f"p99 {durations.percentile(0.99) * 1e6:.1f}us, {self.overflows} overflows"
+        )
 
 
-_debug_player = PyAudioPlayer()
+_debug_player: PyAudioPlayer | None = None
 def play_debug_audio(audio_segment):
     """
     Play the audio segment using PyAudio
     """
+    global _debug_player
+    if _debug_player is None:
+        _debug_player = PyAudioPlayer()
     _debug_player.play_audio(audio_segment)  # Play the audio segment
\ No newline at end of file
@@ -1,4 +1,19 @@
-from .ConsoleInput import ConsoleInput as ConsoleInput
-from .discord_voice_input.DiscordVoiceInput import DiscordVoiceInput as DiscordVoiceInput
-from .DiscordInput import DiscordInput as DiscordInput
-from .SpeechToTextInput import SpeechToTextInput as SpeechToTextInput
+from typing import TYPE_CHECKING
+
+from pipesys.LazyExports import lazy_exports
+
+if TYPE_CHECKING:
+    from .ConsoleInput import ConsoleInput as ConsoleInput
+    from .discord_voice_input.DiscordVoiceInput import DiscordVoiceInput as DiscordVoiceInput
+    from .DiscordInput import DiscordInput as DiscordInput
+    from .SpeechToTextInput import SpeechToTextInput as SpeechToTextInput
+
+__getattr__ = lazy_exports(
+    __name__,
+    {
+        "ConsoleInput": ".ConsoleInput",
+        "DiscordVoiceInput": ".discord_voice_input.DiscordVoiceInput",
+        "DiscordInput": ".DiscordInput",
+        "SpeechToTextInput": ".SpeechToTextInput",
+    },
+)
@@ -1,10 +1,18 @@
 import asyncio
+import queue
+import time
+import traceback
+from collections.abc import Callable
+from functools import partial
 from threading import Thread
 
 import discord
 from pydub import AudioSegment
+from settings import debug_mode, speech_sensitivity_threshold
 
-from event_system import EventBusSingleton
+import VAD_utils
+from event_system import Event, EventBusSingleton
+from event_system.ChromeTrace import record_span
 from event_system.events.Audio import (
     AudioDirection,
     AudioType,
@@ -16,14 +24,30 @@ from event_system.events.Discord import (
     VoiceChannelConnectedEvent,
     VoiceChannelDisconnectedEvent,
 )
-from event_system.events.Pipeline import SystemInputType, UserInputEvent
-from event_system.events.System import CommandEvent, CommandType, TaskCreatedEvent
+from event_system.events.Pipeline import (
+    PartialTranscriptEvent,
+    SystemInputType,
+    UserInputEvent,
+)
+from event_system.events.System import (
+    CommandEvent,
+    CommandType,
+    RestartPolicy,
+    StartupEvent,
+    StartupStage,
+    TaskCreatedEvent,
+)
+from event_system.Trace import Trace
+from ModelRegistry import release_model, shared_transcriber
 from pipesys import Pipe
 from pipesys.inputs.discord_voice_input.StreamSink import StreamSink
-from settings import debug_mode, speech_sensitivity_threshold
+from StablePrefix import StablePrefix
 from Transcribers import Transcriber, WhisperTranscriber
 from VAD_utils import detect_voice_activity
 
+# a transcription queued on a user's worker thread, see DiscordVoiceInput._queue_transcription
+TranscriptionJob = Callable[[], None]
+
 
 class DiscordVoiceInput(Pipe):
     """
@@ -31,59 +55,81 @@ class DiscordVoiceInput(Pipe):
     and transcribes the audio into text events for downstream processing.
     """
 
-    def __init__(self, speech_timeout: float):
+    def __init__(self, speech_timeout: float, partial_interval: float | None = None):
         """
         Initialize a DiscordVoiceInput instance.
 
         :param speech_timeout: The amount of silence (in seconds) required to consider speech ended.
+        :param partial_interval: The seconds of speech between interim transcripts, or None.
         """
         self.voice_connection: discord.VoiceClient | None = None
         self.client: discord.Client | None = None
         self.stream_sink = StreamSink()
 
         self.no_speech_time_by_user: dict[int, float] = {}
+        self.silence_started_ns_by_user: dict[int, int] = {}
         self.speech_recording_triggered_by_user: dict[int, bool] = {}
         self.speech_buffer_by_user: dict[int, list[AudioSegment]] = {}
 
+        # incremental transcription, see _maybe_transcribe_partial
+        self.partial_interval = partial_interval
+        self.speech_since_partial_by_user: dict[int, float] = {}
+        self.partial_pending_by_user: set[int] = set()
+        self.stable_prefix_by_user: dict[int, StablePrefix] = {}
+        # each user's transcriptions run one at a time on their own worker thread, in the order
+        # they were queued, so a user's transcripts are published in order
+        self.transcription_jobs_by_user: dict[int, queue.SimpleQueue[TranscriptionJob | None]] = {}
+        self.user_name_by_user: dict[int, str] = {}
+
         self.input_gain = 1.0
         self.speech_timeout = speech_timeout
         self.stopped = False
+        # audio is only processed once the models are warm, see on_ready
+        self.ready = False
 
-        # Default to WhisperTranscriber if none is provided in create().
-        self.transcriber: Transcriber = WhisperTranscriber()
+        # set by create(), which only acquires the default WhisperTranscriber if none is given
+        self.transcriber: Transcriber
 
     @classmethod
     async def create(
-        cls, transcriber: Transcriber | None, speech_timeout: float = 0.3
+        cls,
+        transcriber: Transcriber | None,
+        speech_timeout: float = 0.3,
+        partial_interval: float | None = None,
     ) -> "DiscordVoiceInput":
         """
         Factory method to create and launch the DiscordVoiceInput pipe as an async task.
 
         :param transcriber: A Transcriber instance (WhisperTranscriber by default).
         :param speech_timeout: The amount of silence (in seconds) required to consider speech ended.
+        :param partial_interval: If given, a user's speech is re-transcribed every this many seconds
+            while they speak, and published as PartialTranscriptEvents.
         :return: An instance of DiscordVoiceInput.
         """
-        instance = cls(speech_timeout)
+        instance = cls(speech_timeout, partial_interval)
 
-        if transcriber:
-            instance.transcriber = transcriber
+        # shared with any other pipe that uses the default transcriber
+        instance.transcriber = transcriber or shared_transcriber(WhisperTranscriber)
 
         # Subscribe to relevant events
-        EventBusSingleton.subscribe(CommandEvent(CommandType.STOP), instance.stop)
-        EventBusSingleton.subscribe(
+        instance.subscribe(StartupEvent(StartupStage.READY), instance.on_ready)
+        instance.subscribe(CommandEvent(CommandType.STOP), instance.stop)
+        instance.subscribe(
             VolumeUpdatedEvent(audio_type=AudioType.DISCORD, audio_direction=AudioDirection.INPUT),
             instance.on_input_volume_update,
         )
 
-        EventBusSingleton.subscribe(VoiceChannelConnectedEvent, instance.on_voice_channel_connected)
-        EventBusSingleton.subscribe(
+        instance.subscribe(VoiceChannelConnectedEvent, instance.on_voice_channel_connected)
+        instance.subscribe(
             VoiceChannelDisconnectedEvent, instance.on_voice_channel_disconnected
         )
-        EventBusSingleton.subscribe(BotReadyEvent, instance.on_bot_ready)
+        instance.subscribe(BotReadyEvent, instance.on_bot_ready)
 
         # Create a long-running task for reading audio data
         task = asyncio.create_task(instance.run())
-        await EventBusSingleton.publish(TaskCreatedEvent(task, "Discord Voice Input"))
+        await EventBusSingleton.publish(
+            TaskCreatedEvent(task, "Discord Voice Input", RestartPolicy.ON_FAILURE, instance.run)
+        )
         return instance
 
     async def run(self):
@@ -91,7 +137,7 @@ class DiscordVoiceInput(Pipe):
         Main loop that polls audio data from the stream_sink and processes it.
         """
         while not self.stopped:
-            if self.stream_sink.has_data() and self.voice_connection:
+            if self.ready and self.stream_sink.has_data() and self.voice_connection:
                 data = self.stream_sink.pop_data()
                 if data is not None:
                     user_id, audio_segment = data
@@ -111,7 +157,8 @@ class DiscordVoiceInput(Pipe):
         3. Buffers audio for transcription when speaking is detected.
         """
         # Detect speech
-        is_speaking_probability = detect_voice_activity(audio_segment)
+        with record_span("detect_voice_activity", "audio", user=user_id):
+            is_speaking_probability = detect_voice_activity(audio_segment)
 
         # If the user transitions to speaking
         if (
@@ -123,6 +170,7 @@ class DiscordVoiceInput(Pipe):
         # If user is currently speaking, buffer the segment
         if self.speech_recording_triggered_by_user.get(user_id, False):
             self._append_to_speech_buffer(user_id, audio_segment)
+            self._maybe_transcribe_partial(user_id, audio_segment)
 
         # If user transitions from speaking to silence
         if (
@@ -142,6 +190,9 @@ class DiscordVoiceInput(Pipe):
             )
 
         self.speech_recording_triggered_by_user[user_id] = True
+        if self.partial_interval is not None:
+            self.stable_prefix_by_user[user_id] = StablePrefix()
+            self.speech_since_partial_by_user[user_id] = 0.0
         print(f"User {user_id} started speaking")
 
     def _append_to_speech_buffer(self, user_id: int, audio_segment: AudioSegment):
@@ -152,17 +203,49 @@ class DiscordVoiceInput(Pipe):
             self.speech_buffer_by_user[user_id] = []
         self.speech_buffer_by_user[user_id].append(audio_segment)
 
+    def _maybe_transcribe_partial(self, user_id: int, audio_segment: AudioSegment):
+        """
+        Starts an interim transcription of the user's speech so far once partial_interval seconds
+        of speech have been buffered since the last one, unless the last one is still running.
+        """
+        if self.partial_interval is None:
+            return
+
+        buffered = self.speech_since_partial_by_user.get(user_id, 0.0)
+        buffered += audio_segment.duration_seconds
+        self.speech_since_partial_by_user[user_id] = buffered
+        if buffered < self.partial_interval or user_id in self.partial_pending_by_user:
+            return
+
+        self.speech_since_partial_by_user[user_id] = 0.0
+        self.partial_pending_by_user.add(user_id)
+        self._queue_transcription(
+            user_id,
+            partial(
+                self._transcribe_partial_and_publish,
+                user_id,
+                list(self.speech_buffer_by_user[user_id]),
+                self.stable_prefix_by_user[user_id],
+            ),
+        )
+
     async def _handle_user_silence(self, user_id: int):
         """
         Tracks silence duration. If it exceeds self.speech_timeout, mark user as no longer speaking and
         transcribe buffered audio.
         """
+        if self.no_speech_time_by_user.get(user_id, 0) == 0:
+            self.silence_started_ns_by_user[user_id] = time.perf_counter_ns()
         self.no_speech_time_by_user[user_id] = self.no_speech_time_by_user.get(user_id, 0) + 0.03
 
         if self.no_speech_time_by_user[user_id] >= self.speech_timeout:
             self.speech_recording_triggered_by_user[user_id] = False
             print(f"User {user_id} stopped speaking")
 
+            # the turn's latency is measured from the end of the user's speech
+            trace = Trace()
+            trace.record("vad_endpoint", self.silence_started_ns_by_user[user_id])
+
             # Attempt to fetch the user display name
             user_name = str(user_id)
             if self.client:
@@ -173,30 +256,71 @@ class DiscordVoiceInput(Pipe):
                 except (discord.NotFound, discord.HTTPException):
                     pass
 
-            # Transcription in a separate thread since transcriber process may be both long and blocking
+            self.user_name_by_user[user_id] = user_name
+
+            # Transcription on a worker thread since transcriber process may be both long and blocking
             speech_buffer = self.speech_buffer_by_user[user_id]
             self.speech_buffer_by_user[user_id] = []
-            loop = asyncio.get_running_loop()
+            stable_prefix = self.stable_prefix_by_user.pop(user_id, None)
+            self._queue_transcription(
+                user_id,
+                partial(
+                    self._transcribe_speech_and_publish,
+                    speech_buffer,
+                    user_name,
+                    trace,
+                    stable_prefix,
+                ),
+            )
+
+            self.no_speech_time_by_user[user_id] = 0
+
+    def _queue_transcription(self, user_id: int, job: TranscriptionJob):
+        """
+        Queues a transcription on the user's worker thread, starting it on the user's first one.
+        """
+        jobs = self.transcription_jobs_by_user.get(user_id)
+        if jobs is None:
+            jobs = self.transcription_jobs_by_user[user_id] = queue.SimpleQueue()
             Thread(
-                target=self._transcribe_speech_and_publish,
-                args=(speech_buffer, user_name, loop),
+                target=self._run_transcriptions,
+                args=(jobs,),
+                name=f"discord transcription {user_id}",
                 daemon=True,
             ).start()
+        jobs.put(job)
 
-            self.no_speech_time_by_user[user_id] = 0
+    def _run_transcriptions(self, jobs: queue.SimpleQueue[TranscriptionJob | None]):
+        """
+        A user's transcription worker, which runs their transcriptions in order until stopped.
+        """
+        while (job := jobs.get()) is not None:
+            try:
+                job()
+            except Exception:
+                print("Error transcribing speech:")
+                traceback.print_exc()
 
     def _transcribe_speech_and_publish(
-        self, speech_buffer: list[AudioSegment], user_name: str, loop: asyncio.AbstractEventLoop
+        self,
+        speech_buffer: list[AudioSegment],
+        user_name: str,
+        trace: Trace,
+        stable_prefix: StablePrefix | None,
     ):
         """
         Concatenates all audio segments in the buffer, transcribes the audio, and publishes a UserInputEvent.
-        Runs in a separate thread to avoid blocking the main async loop.
+        Runs on the user's transcription worker to avoid blocking the main async loop.
         """
         combined_audio = AudioSegment.empty()
         for segment in speech_buffer:
             combined_audio += segment
 
-        transcription = self.transcriber.transcribe_speech(combined_audio, self.input_gain)
+        with trace.span("transcription"), record_span("transcribe_speech", "inference"):
+            transcription = self.transcriber.transcribe_speech(combined_audio, self.input_gain)
+        if stable_prefix is not None:
+            # keeps the words interim transcripts already published as stable
+            transcription = stable_prefix.finalize(transcription)
         if not transcription:
             return
 
@@ -204,19 +328,54 @@ class DiscordVoiceInput(Pipe):
             print(f"[voice] {user_name}: {transcription}")
 
         # Publish the transcribed text as user input
-        publish_coroutine = EventBusSingleton.publish(
+        events: list[Event] = [
             UserInputEvent(
-                transcription, self, SystemInputType.DISCORD_VOICE, user_name=user_name, priority=2
+                transcription,
+                self,
+                SystemInputType.DISCORD_VOICE,
+                user_name=user_name,
+                priority=2,
+                trace=trace,
             )
-        )
-        asyncio.run_coroutine_threadsafe(publish_coroutine, loop)
+        ]
 
         # If no one else is speaking, send event indicating speech ended
         if not any(self.speech_recording_triggered_by_user.values()):
-            end_speaking_coroutine = EventBusSingleton.publish(
-                SpeakingStateUpdate(False, AudioType.DISCORD, AudioDirection.INPUT)
+            events.append(SpeakingStateUpdate(False, AudioType.DISCORD, AudioDirection.INPUT))
+
+        EventBusSingleton.publish_threadsafe(*events)
+
+    def _transcribe_partial_and_publish(
+        self, user_id: int, speech_buffer: list[AudioSegment], stable_prefix: StablePrefix
+    ):
+        """
+        Transcribes the user's speech so far and publishes it as a PartialTranscriptEvent, unless
+        the final transcript is already queued after it. Runs on the user's transcription worker,
+        like the final transcription.
+        """
+        try:
+            # the final transcription would wait for this one, and make it obsolete anyway
+            if not self.transcription_jobs_by_user[user_id].empty():
+                return
+
+            combined_audio = AudioSegment.empty()
+            for segment in speech_buffer:
+                combined_audio += segment
+
+            with record_span("transcribe_partial", "inference", user=user_id):
+                transcription = self.transcriber.transcribe_speech(combined_audio, self.input_gain)
+            stable, unstable = stable_prefix.update(transcription)
+            EventBusSingleton.publish_threadsafe(
+                PartialTranscriptEvent(
+                    stable,
+                    unstable,
+                    self,
+                    SystemInputType.DISCORD_VOICE,
+                    user_name=self.user_name_by_user.get(user_id, str(user_id)),
+                )
             )
-            asyncio.run_coroutine_threadsafe(end_speaking_coroutine, loop)
+        finally:
+            self.partial_pending_by_user.discard(user_id)
 
     def on_input_volume_update(self, event: VolumeUpdatedEvent):
         """
@@ -227,11 +386,35 @@ class DiscordVoiceInput(Pipe):
         else:
             self.input_gain = 1.0
 
+    async def warmup(self):
+        """
+        Loads and warms up the VAD and the transcriber in worker threads, at the same time.
+        """
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(
+            loop.run_in_executor(None, VAD_utils.warmup),
+            loop.run_in_executor(None, self.transcriber.warmup),
+        )
+
+    def on_ready(self, event: StartupEvent):
+        """
+        Event handler: Starts processing voice data once the pipeline is ready, so that the first
+        utterance isn't slowed down by models that are still warming up.
+        """
+        self.ready = True
+
+    def close(self):
+        super().close()
+        release_model(self.transcriber)
+
     def stop(self, event: CommandEvent):
         """
         Event handler: Stops processing voice data when a STOP command is received.
         """
         self.stopped = True
+        # the workers finish the transcriptions already queued, and end
+        for jobs in self.transcription_jobs_by_user.values():
+            jobs.put(None)
 
     def on_bot_ready(self, event: BotReadyEvent):
         """
@@ -7,6 +7,8 @@ from discord import VoiceClient
 from discord.sinks.core import Sink
 from pydub import AudioSegment
 
+from event_system.ChromeTrace import record_span
+
 
 class StreamSink(Sink):
     # calls callback with every frame of audio data, along with the sender's user id
@@ -44,8 +46,13 @@ class StreamSink(Sink):
         self.channels = vc.decoder.CHANNELS
         self.sample_width = vc.decoder.SAMPLE_SIZE // vc.decoder.CHANNELS
 
-    # method for adding data to the buffer
+    # called from discord's audio receiving thread with every decoded packet
     def write(self, data, user) -> None:
+        with record_span("voice_packet_callback", "audio", user=user):
+            self.buffer_data(data, user)
+
+    # method for adding data to the buffer
+    def buffer_data(self, data, user) -> None:
         # creating byte buffer for user if it doesn't exist
         if user not in self.byte_buffer:
             self.byte_buffer[user] = bytearray()
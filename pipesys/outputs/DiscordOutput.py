@@ -22,7 +22,7 @@ class DiscordOutput(Pipe):
     async def create(cls, listen_to: Pipe | MessageEvent | type[MessageEvent]):
         self = DiscordOutput(listen_to)
 
-        EventBusSingleton.subscribe(TextChannelConnectedEvent, self.set_channel)
+        self.subscribe(TextChannelConnectedEvent, self.set_channel)
 
         await EventBusSingleton.publish(OutputAvailabilityEvent(SystemOutputType.DISCORD, True))
         return self
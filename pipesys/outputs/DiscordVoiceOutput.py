@@ -1,9 +1,12 @@
 import asyncio
+import time
 from io import BytesIO
 
 import discord
 from pydub import AudioSegment
 
+from event_system.ChromeTrace import record_complete, record_span
+from event_system.Event import EventParameterFlag
 from event_system.EventBusSingleton import EventBusSingleton
 from event_system.events.Audio import AudioDirection, AudioType, SpeakingStateUpdate
 from event_system.events.Discord import VoiceChannelConnectedEvent, VoiceChannelDisconnectedEvent
@@ -13,7 +16,9 @@ from event_system.events.Pipeline import (
     OutputDeliveryEvent,
     SystemOutputType,
 )
-from event_system.events.System import StartupEvent, StartupStage, TaskCreatedEvent
+from event_system.events.System import RestartPolicy, TaskCreatedEvent
+from event_system.Trace import Trace, traced
+from ModelRegistry import release_model, shared_text_to_speech
 from pipesys.Pipe import MessageSource, Pipe
 from TTS import SileroTTS, TextToSpeech
 
@@ -23,36 +28,47 @@ class DiscordVoiceOutput(Pipe):
     Module that receives text input from a pipe, converts it to speech, and plays it on the discord voice channel the bot is currently connected to.
     """
 
+    # nothing is spoken before a voice channel is joined, so the pipeline doesn't wait for warmup
+    warmup_critical = False
+
     text_to_speech: TextToSpeech
     voice_connection: discord.VoiceClient | None = None
 
     def __init__(self):
         self.audio_queue = asyncio.Queue()
         self.voice_connection = None
-        self.asyncio_main_loop: asyncio.AbstractEventLoop = asyncio.get_event_loop()
 
     @classmethod
-    async def create(cls, listen_to: MessageSource, text_to_speech: TextToSpeech = SileroTTS()):
+    async def create(cls, listen_to: MessageSource, text_to_speech: TextToSpeech | None = None):
         self = DiscordVoiceOutput()
 
-        self.text_to_speech = text_to_speech
+        # created here rather than as a default argument, so that importing this module doesn't
+        # load a model
+        self.text_to_speech = text_to_speech or shared_text_to_speech(SileroTTS)
 
-        EventBusSingleton.subscribe(StartupEvent(StartupStage.WARMUP), self.on_warmup)
-        EventBusSingleton.subscribe(VoiceChannelConnectedEvent, self.on_voice_channel_connected)
-        EventBusSingleton.subscribe(VoiceChannelDisconnectedEvent, self.on_voice_channel_disconnected)
+        self.subscribe(VoiceChannelConnectedEvent, self.on_voice_channel_connected)
+        self.subscribe(VoiceChannelDisconnectedEvent, self.on_voice_channel_disconnected)
         self.subscribe_to_message_sources(listen_to, self.handle_message)
 
-        EventBusSingleton.subscribe(
+        self.subscribe(
             SpeakingStateUpdate(audio_direction=AudioDirection.INPUT),
             self.on_user_speaking_state_change,
         )
         task = asyncio.create_task(self.playback_loop())
-        await EventBusSingleton.publish(TaskCreatedEvent(task, "Voice Output Playback"))
+        await EventBusSingleton.publish(
+            TaskCreatedEvent(
+                task, "Voice Output Playback", RestartPolicy.ON_FAILURE, self.playback_loop
+            )
+        )
 
         return self
 
-    def on_warmup(self, event: StartupEvent):
-        self.text_to_speech.warmup()
+    async def warmup(self):
+        await asyncio.get_running_loop().run_in_executor(None, self.text_to_speech.warmup)
+
+    def close(self):
+        super().close()
+        release_model(self.text_to_speech)
 
     async def on_voice_channel_connected(self, event: VoiceChannelConnectedEvent):
         if(not isinstance(event.voice_client, discord.VoiceClient)):
@@ -86,8 +102,11 @@ class DiscordVoiceOutput(Pipe):
         if not self.voice_connection or not isinstance(event.message, str):
             return
 
-        # Generate audio in parallel
-        audio_segment = self.text_to_speech.generate_speech(event.message)
+        # Generate audio in a worker thread so the event loop keeps running
+        with traced(event.trace, "tts_synthesis"):
+            audio_segment = await asyncio.get_running_loop().run_in_executor(
+                None, self.generate_speech, event.message
+            )
         if audio_segment is None:
             return
 
@@ -96,11 +115,11 @@ class DiscordVoiceOutput(Pipe):
             return
 
         # Enqueue
-        await self.audio_queue.put((audio_data, event.message))
+        await self.audio_queue.put((audio_data, event.message, event.trace))
 
     async def playback_loop(self):
         while True:
-            audio_data, message = await self.audio_queue.get()
+            audio_data, message, trace = await self.audio_queue.get()
             # Wait while voice is busy
             while self.voice_connection and self.voice_connection.is_playing():
                 await asyncio.sleep(0.1)
@@ -109,24 +128,40 @@ class DiscordVoiceOutput(Pipe):
                 continue
 
             buffer = BytesIO(audio_data)
+            started_ns = time.perf_counter_ns()
             self.voice_connection.play(
                 discord.PCMAudio(buffer),
-                after=lambda e: self.finished_playing_callback(e, message),
+                after=lambda e, message=message, trace=trace, started_ns=started_ns: (
+                    self.finished_playing_callback(e, message, trace, started_ns)
+                ),
                 wait_finish=False,
             )
 
+    def generate_speech(self, text: str) -> AudioSegment | None:
+        # runs in the executor's worker thread
+        with record_span("generate_speech", "inference"):
+            return self.text_to_speech.generate_speech(text)
+
     def convert_for_output(self, audio_segment: AudioSegment) -> AudioSegment:
         return audio_segment.set_channels(2).set_frame_rate(48000).set_sample_width(2)
 
-    def finished_playing_callback(self, ex: Exception | None, message: str):
-        asyncio.run_coroutine_threadsafe(
-            EventBusSingleton.publish(
-                SpeakingStateUpdate(False, AudioType.DISCORD, AudioDirection.OUTPUT)
-            ),
-            self.asyncio_main_loop,
-        )
+    def finished_playing_callback(
+        self,
+        ex: Exception | None,
+        message: str,
+        trace: Trace | EventParameterFlag = EventParameterFlag.NOT_SPECIFIED,
+        started_ns: int = 0,
+    ):
+        # called from discord's audio player thread
+        record_complete("play", "audio", started_ns)
         if ex is None:
-            asyncio.run_coroutine_threadsafe(
-                EventBusSingleton.publish(OutputDeliveryEvent(message=message)),
-                self.asyncio_main_loop,
+            if isinstance(trace, Trace):
+                trace.record("playback", started_ns)
+            EventBusSingleton.publish_threadsafe(
+                SpeakingStateUpdate(False, AudioType.DISCORD, AudioDirection.OUTPUT),
+                OutputDeliveryEvent(message=message, trace=trace),
+            )
+        else:
+            EventBusSingleton.publish_threadsafe(
+                SpeakingStateUpdate(False, AudioType.DISCORD, AudioDirection.OUTPUT)
             )
@@ -3,7 +3,6 @@ from datetime import datetime
 
 import aiofiles
 
-from event_system import EventBusSingleton
 from event_system.events.Pipeline import MessageEvent, UserInputEvent
 from pipesys import MessageSource, Pipe
 from settings import chat_model_prompt
@@ -37,7 +36,7 @@ class FileLogger(Pipe):
     async def create(cls, listen_to: MessageEvent | Pipe | type[MessageEvent]):
         self = FileLogger(listen_to)
 
-        EventBusSingleton.subscribe(UserInputEvent, self.on_message)
+        self.subscribe(UserInputEvent, self.on_message)
 
         async with aiofiles.open(self.logfile_path, mode="w", encoding="utf-8") as logfile:
             await logfile.write(f"system: {chat_model_prompt}")
@@ -4,10 +4,15 @@ from pipesys import MessageSource, Pipe
 
 
 class PipelineMonitor(Pipe):
+    """
+    Prints every message it sees, including subclasses of the event types it listens to.
+    Listening to MessageEvent therefore also shows user input, routed output and deliveries.
+    """
+
     def __init__(self, listen_to: MessageSource):
         super().__init__()
 
-        self.subscribe_to_message_sources(listen_to, self.on_message)
+        self.subscribe_to_message_sources(listen_to, self.on_message, include_subclasses=True)
 
     @classmethod
     async def create(cls, listen_to: MessageSource):
@@ -2,7 +2,8 @@ import asyncio
 import threading
 
 from audio_playback import AudioPlayer, PyAudioPlayer
-from event_system import EventBusSingleton
+from event_system import EventBusSingleton, EventParameterFlag
+from event_system.ChromeTrace import record_span
 from event_system.events.Audio import (
     AudioDirection,
     AudioType,
@@ -15,7 +16,8 @@ from event_system.events.Pipeline import (
     OutputDeliveryEvent,
     SystemOutputType,
 )
-from event_system.events.System import StartupEvent, StartupStage
+from event_system.Trace import Trace, traced
+from ModelRegistry import release_model, shared_text_to_speech
 from pipesys import MessageSource, Pipe
 from TTS import MeloTTS, TextToSpeech
 
@@ -31,18 +33,19 @@ class TextToSpeechOutput(Pipe):
     async def create(
         cls,
         listen_to: MessageSource,
-        text_to_speech: TextToSpeech = MeloTTS(),
-        audio_player: AudioPlayer = PyAudioPlayer(),
+        text_to_speech: TextToSpeech | None = None,
+        audio_player: AudioPlayer | None = None,
     ):
         self = TextToSpeechOutput()
 
-        self.text_to_speech = text_to_speech
-        self.audio_player = audio_player
+        # created here rather than as default arguments, so that importing this module doesn't
+        # load a model that a RemoteTextToSpeech might be hosting in another process instead
+        self.text_to_speech = text_to_speech or shared_text_to_speech(MeloTTS)
+        self.audio_player = audio_player or PyAudioPlayer()
 
         # subscribe to events
-        EventBusSingleton.subscribe(StartupEvent(StartupStage.WARMUP), self.on_warmup)
         self.subscribe_to_message_sources(listen_to, self.on_message)
-        EventBusSingleton.subscribe(
+        self.subscribe(
             VolumeUpdatedEvent(audio_type=AudioType.SYSTEM, audio_direction=AudioDirection.OUTPUT),
             self.on_volume_update,
         )
@@ -60,7 +63,7 @@ class TextToSpeechOutput(Pipe):
             return
 
         # avoid blocking with speech output processing
-        thread = threading.Thread(target=self.say, args=(msg, asyncio.get_event_loop()))
+        thread = threading.Thread(target=self.say, args=(msg, event.trace))
         thread.start()
 
     async def on_volume_update(self, event: VolumeUpdatedEvent):
@@ -69,19 +72,25 @@ class TextToSpeechOutput(Pipe):
 
         self.audio_player.set_volume(event.volume)
 
-    def say(self, text, loop):
-        audio = self.text_to_speech.generate_speech(text)
+    def say(self, text, trace: Trace | EventParameterFlag = EventParameterFlag.NOT_SPECIFIED):
+        with traced(trace, "tts_synthesis"), record_span("generate_speech", "inference"):
+            audio = self.text_to_speech.generate_speech(text)
 
         if audio is None:
             return
 
-        self.audio_player.play_audio(audio)
-        asyncio.run_coroutine_threadsafe(
-            EventBusSingleton.publish(OutputDeliveryEvent(message=text, sender=self)), loop
+        with traced(trace, "playback"), record_span("play_audio", "audio"):
+            self.audio_player.play_audio(audio)
+        EventBusSingleton.publish_threadsafe(
+            OutputDeliveryEvent(message=text, sender=self, trace=trace)
         )
 
-    def on_warmup(self, event: StartupEvent):
-        self.text_to_speech.warmup()
+    async def warmup(self):
+        await asyncio.get_running_loop().run_in_executor(None, self.text_to_speech.warmup)
+
+    def close(self):
+        super().close()
+        release_model(self.text_to_speech)
 
     async def publish_speaking_start(self):
         await EventBusSingleton.publish(
@@ -5,7 +5,7 @@ from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QPixmap
 from PyQt5.QtWidgets import QLabel, QMainWindow, QVBoxLayout, QWidget
 
-from event_system import EventBusSingleton
+from event_system import DispatchMode, EventBusSingleton
 from event_system.events.Pipeline import MessageEvent
 from event_system.events.System import CommandEvent, CommandType, TaskCreatedEvent
 from pipesys import MessageSource, Pipe
@@ -18,6 +18,8 @@ class VisualOutput(Pipe):
     Current implementation is a simple window that displays emotion images based on sentiment analysis of the conversation.
     """
 
+    requires_gui = True
+
     stopped: bool = False
 
     def __init__(self, parent, listen_to: MessageSource):
@@ -43,7 +45,8 @@ class VisualOutput(Pipe):
         self.set_emote("images/neutral.png")
         self.set_text("[listening]")
 
-        self.subscribe_to_message_sources(listen_to, self.on_message)
+        # classification waits on the OpenAI API, so don't hold up the other outputs
+        self.subscribe_to_message_sources(listen_to, self.on_message, DispatchMode.CONCURRENT)
 
     @classmethod
     async def create(cls, listen_to: MessageSource, parent=None):
@@ -57,7 +60,7 @@ class VisualOutput(Pipe):
         """
         self = VisualOutput(parent, listen_to)
 
-        EventBusSingleton.subscribe(CommandEvent(CommandType.STOP), self.on_stop)
+        self.subscribe(CommandEvent(CommandType.STOP), self.on_stop)
 
         task = asyncio.create_task(self.run_visual_output())
         await EventBusSingleton.publish(TaskCreatedEvent(task, "Visual Output"))
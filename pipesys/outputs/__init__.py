@@ -1,7 +1,25 @@
-from .ConsoleOutput import ConsoleOutput as ConsoleOutput
-from .DiscordOutput import DiscordOutput as DiscordOutput
-from .DiscordVoiceOutput import DiscordVoiceOutput as DiscordVoiceOutput
-from .FileLogger import FileLogger as FileLogger
-from .PipelineMonitor import PipelineMonitor as PipelineMonitor
-from .TextToSpeechOutput import TextToSpeechOutput as TextToSpeechOutput
-from .VisualOutput import VisualOutput as VisualOutput
+from typing import TYPE_CHECKING
+
+from pipesys.LazyExports import lazy_exports
+
+if TYPE_CHECKING:
+    from .ConsoleOutput import ConsoleOutput as ConsoleOutput
+    from .DiscordOutput import DiscordOutput as DiscordOutput
+    from .DiscordVoiceOutput import DiscordVoiceOutput as DiscordVoiceOutput
+    from .FileLogger import FileLogger as FileLogger
+    from .PipelineMonitor import PipelineMonitor as PipelineMonitor
+    from .TextToSpeechOutput import TextToSpeechOutput as TextToSpeechOutput
+    from .VisualOutput import VisualOutput as VisualOutput
+
+__getattr__ = lazy_exports(
+    __name__,
+    {
+        "ConsoleOutput": ".ConsoleOutput",
+        "DiscordOutput": ".DiscordOutput",
+        "DiscordVoiceOutput": ".DiscordVoiceOutput",
+        "FileLogger": ".FileLogger",
+        "PipelineMonitor": ".PipelineMonitor",
+        "TextToSpeechOutput": ".TextToSpeechOutput",
+        "VisualOutput": ".VisualOutput",
+    },
+)
@@ -1,7 +1,7 @@
 import openai
-
 import settings
-from event_system import EventBusSingleton
+
+from event_system import Mailbox, OverflowPolicy
 from event_system.events.Pipeline import (
     MessageEvent,
     OutputAvailabilityEvent,
@@ -9,11 +9,14 @@ from event_system.events.Pipeline import (
     SystemOutputType,
 )
 from event_system.events.System import CommandEvent, CommandType
+from event_system.Trace import Trace, traced
 from LLM.nyako_llm import ConversationSession
 from pipesys import MessageSource, Pipe
 
 
 class ConversationSessionProcessor(Pipe):
+    emits_directly = True
+
     conversation_session: ConversationSession
     available_outputs: set[SystemOutputType]
     buffer_size: int
@@ -23,11 +26,16 @@ class ConversationSessionProcessor(Pipe):
         listen_to: MessageSource | list[MessageSource],
         track_outputs_from: MessageSource,
         buffer_size=10,
+        mailbox_size=64,
     ):
         super().__init__()
         self.buffer_size = buffer_size
 
-        self.subscribe_to_message_sources(listen_to, self.on_message)
+        # streaming a whole reply is slow, so inputs queue up here instead of stalling their producers.
+        # When the inputs outpace the LLM, the oldest unanswered ones are dropped, since the
+        # producers (chat and voice input) must never wait on it
+        self.mailbox = Mailbox(mailbox_size, OverflowPolicy.DROP_OLDEST)
+        self.subscribe_to_message_sources(listen_to, self.on_message, mailbox=self.mailbox)
         self.subscribe_to_message_sources(track_outputs_from, self.on_output_delivered)
 
     @classmethod
@@ -36,11 +44,14 @@ class ConversationSessionProcessor(Pipe):
         listen_to: MessageSource | list[MessageSource],
         track_llm_outputs_from: MessageSource = OutputDeliveryEvent,
         buffer_size=10,
+        mailbox_size=64,
     ):
-        self = ConversationSessionProcessor(listen_to, track_llm_outputs_from, buffer_size)
+        self = ConversationSessionProcessor(
+            listen_to, track_llm_outputs_from, buffer_size, mailbox_size
+        )
 
-        EventBusSingleton.subscribe(OutputAvailabilityEvent, self.on_outputs_change)
-        EventBusSingleton.subscribe(CommandEvent(CommandType.STOP), self.on_stop)
+        self.subscribe(OutputAvailabilityEvent, self.on_outputs_change)
+        self.subscribe(CommandEvent(CommandType.STOP), self.on_stop)
 
         # valid output tags
         self.available_outputs = set()
@@ -51,13 +62,17 @@ class ConversationSessionProcessor(Pipe):
         return self
 
     async def on_message(self, event: MessageEvent):
+        trace = event.trace if isinstance(event.trace, Trace) else None
         try:
             async for response_chunk in self.conversation_session.stream_query(
-                str(event), self.buffer_size
+                str(event), self.buffer_size, trace
             ):
-                await EventBusSingleton.publish(MessageEvent(response_chunk, self))
-        except openai.APIError as e:
-            print(e.message)
+                with traced(trace, "chunk_emission"):
+                    await self.emit(MessageEvent(response_chunk, self, trace=event.trace))
+        except* openai.APIError as errors:
+            # API errors may come from the LLM stream or from listeners dispatched concurrently
+            for e in errors.exceptions:
+                print(e.message)
         self.conversation_session.update_system_prompt(self.get_system_prompt())
 
     async def on_output_delivered(self, event: MessageEvent):
@@ -85,6 +100,14 @@ class ConversationSessionProcessor(Pipe):
         else:
             return settings.chat_model_prompt
 
+    @property
+    def dropped_inputs(self) -> int:
+        """The number of inputs dropped unanswered because the mailbox was full."""
+        return self.mailbox.dropped
+
     async def on_stop(self, event: CommandEvent):
+        self.mailbox.close()
+        if self.dropped_inputs:
+            print(f"{self.dropped_inputs} inputs were dropped while the LLM was busy")
         if settings.memorize_enabled:
             await self.conversation_session.memorize_all()
@@ -19,12 +19,14 @@ from settings import debug_mode
 
 
 class MessageRouter(Pipe):
+    emits_directly = True
+
     def __init__(self, listen_to: Pipe):
         self.active_outputs: set[SystemOutputType] = set()
         self.active_commands: set[CommandType] = set()
-        EventBusSingleton.subscribe(OutputAvailabilityEvent, self.on_output_state_changed)
-        EventBusSingleton.subscribe(CommandAvailabilityEvent, self.on_command_state_changed)
-        EventBusSingleton.subscribe(MessageEvent(sender=listen_to), self.on_message)
+        self.subscribe(OutputAvailabilityEvent, self.on_output_state_changed)
+        self.subscribe(CommandAvailabilityEvent, self.on_command_state_changed)
+        self.subscribe_to_message_sources(listen_to, self.on_message)
 
     async def on_message(self, event: MessageEvent):
         """
@@ -114,11 +116,9 @@ class MessageRouter(Pipe):
         for output_type in output_types:
             if output_type in self.active_outputs:
                 if debug_mode:
-                    await EventBusSingleton.publish(
-                        OutputRoutingEvent(message, self, SystemOutputType.ALL)
-                    )
+                    await self.emit(OutputRoutingEvent(message, self, SystemOutputType.ALL))
                 else:
-                    await EventBusSingleton.publish(OutputRoutingEvent(message, self, output_type))
+                    await self.emit(OutputRoutingEvent(message, self, output_type))
             else:
                 await EventBusSingleton.publish(InactiveOutputEvent(message, output_type))
 
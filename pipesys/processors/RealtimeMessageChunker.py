@@ -1,15 +1,24 @@
 import asyncio
+import time
 from datetime import datetime
 
-from event_system import EventBusSingleton
+from event_system import EventBusSingleton, EventParameterFlag
 from event_system.events.Audio import AudioDirection, SpeakingStateUpdate
 from event_system.events.Pipeline import MessageEvent, UserInputEvent
-from event_system.events.System import CommandEvent, CommandType, TaskCreatedEvent
+from event_system.events.System import (
+    CommandEvent,
+    CommandType,
+    RestartPolicy,
+    TaskCreatedEvent,
+)
+from event_system.Trace import Trace
 from pipesys import MessageSource, Pipe
 from settings import default_no_input_interval_seconds, default_processor_delay
 
 
 class RealtimeMessageChunker(Pipe):
+    emits_directly = True
+
     no_input_interval_seconds: int
     processor_delay: float
 
@@ -21,6 +30,8 @@ class RealtimeMessageChunker(Pipe):
 
         self.last_input_time: datetime = datetime.now()
         self.event_queue: list[UserInputEvent] = []
+        # when the oldest event in the queue was queued, for the chunker_hold span
+        self.hold_started_ns = 0
         self.last_no_input_sent_time: datetime = datetime.now()
 
         self.subscribe_to_message_sources(listen_to, self.on_message)
@@ -37,12 +48,16 @@ class RealtimeMessageChunker(Pipe):
         self = RealtimeMessageChunker(listen_to)
 
         task = asyncio.create_task(self.chunk_messages())
-        await EventBusSingleton.publish(TaskCreatedEvent(task, pretty_sender="Message Chunker"))
+        await EventBusSingleton.publish(
+            TaskCreatedEvent(
+                task, "Message Chunker", RestartPolicy.ON_FAILURE, self.chunk_messages
+            )
+        )
 
-        EventBusSingleton.subscribe(CommandEvent(CommandType.SLEEP), self.on_sleep)
-        EventBusSingleton.subscribe(CommandEvent(CommandType.WAKE), self.on_wake)
-        EventBusSingleton.subscribe(CommandEvent(CommandType.STOP), self.on_stop)
-        EventBusSingleton.subscribe(
+        self.subscribe(CommandEvent(CommandType.SLEEP), self.on_sleep)
+        self.subscribe(CommandEvent(CommandType.WAKE), self.on_wake)
+        self.subscribe(CommandEvent(CommandType.STOP), self.on_stop)
+        self.subscribe(
             SpeakingStateUpdate(audio_direction=AudioDirection.INPUT),
             self.on_user_speaking_state_update,
         )
@@ -98,15 +113,24 @@ class RealtimeMessageChunker(Pipe):
 
     async def process_messages(self) -> None:
         messages_to_process = [str(event) for event in self.event_queue]
+
+        # the batch continues the turn of its oldest traced input
+        traces = [event.trace for event in self.event_queue if isinstance(event.trace, Trace)]
+        trace = traces[0] if traces else EventParameterFlag.NOT_SPECIFIED
+        if traces:
+            trace.record("chunker_hold", self.hold_started_ns)
+
         self.event_queue = []
 
         # join the messages into a string separated by newlines
         messages = "\n\n".join(messages_to_process)
 
-        await self.send(messages)
+        await self.send(messages, trace)
 
-    async def send(self, message: str):
-        await EventBusSingleton.publish(MessageEvent(message, self))
+    async def send(
+        self, message: str, trace: Trace | EventParameterFlag = EventParameterFlag.NOT_SPECIFIED
+    ):
+        await self.emit(MessageEvent(message, self, trace=trace))
 
     async def on_message(self, event: UserInputEvent):
         if not isinstance(event.priority, int):
@@ -123,10 +147,13 @@ class RealtimeMessageChunker(Pipe):
         # if `event` has a higher priority than all queued events, clear queue and add
         if self.queue_max_priority() < event.priority:
             self.event_queue = []
+            self.hold_started_ns = time.perf_counter_ns()
             self.event_queue.append(event)
             return
 
         # event has the same priority, just add it
+        if not self.event_queue:
+            self.hold_started_ns = time.perf_counter_ns()
         self.event_queue.append(event)
 
     def queue_max_priority(self):
@@ -1,5 +1,19 @@
-from .ConversationSessionProcessor import (
-    ConversationSessionProcessor as ConversationSessionProcessor,
+from typing import TYPE_CHECKING
+
+from pipesys.LazyExports import lazy_exports
+
+if TYPE_CHECKING:
+    from .ConversationSessionProcessor import (
+        ConversationSessionProcessor as ConversationSessionProcessor,
+    )
+    from .MessageRouter import MessageRouter as MessageRouter
+    from .RealtimeMessageChunker import RealtimeMessageChunker as RealtimeMessageChunker
+
+__getattr__ = lazy_exports(
+    __name__,
+    {
+        "ConversationSessionProcessor": ".ConversationSessionProcessor",
+        "MessageRouter": ".MessageRouter",
+        "RealtimeMessageChunker": ".RealtimeMessageChunker",
+    },
 )
-from .MessageRouter import MessageRouter as MessageRouter
-from .RealtimeMessageChunker import RealtimeMessageChunker as RealtimeMessageChunker
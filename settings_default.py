@@ -1,5 +1,5 @@
-import torch
-from openai import AsyncOpenAI
+import sys
+from typing import Any
 
 ## big flags
 
@@ -13,6 +13,8 @@ memorize_enabled = False
 FramesPerBuffer = 512  # every buffer is 32ms of audio (at 16kHz)
 INPUT_SAMPLING_RATE = 16000
 speech_sensitivity_threshold = 0.6
+# longer utterances are transcribed in parts of this length
+max_utterance_seconds = 60.0
 
 # Silero text to speech parameters
 sample_rate_out = 24000
@@ -34,15 +36,10 @@ speaker = "en_56"
 # en_74 : valley girl?
 # en_80 : robotic
 
-device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-print("Running on " + device.type + ".")
+# device, DISCORD_BOT_TOKEN, OPENAI_API_KEY and ASYNCOPENAI are created on first use, see __getattr__
+# at the bottom, so that importing settings doesn't import torch or read keys a pipeline doesn't use
 
-# tokens, keys
-DISCORD_BOT_TOKEN = open("discord_bot_token.txt").read().strip()
-OPENAI_API_KEY = open("openai_api_key.txt").read().strip()
-
-# openai access object and params
-ASYNCOPENAI = AsyncOpenAI(api_key=OPENAI_API_KEY)
+# openai params
 summarization_model = "gpt-4o-mini"
 chat_model = "gpt-4o-mini"
 
@@ -66,3 +63,46 @@ similarity_threshold = 0.4  # 0.0 is disabled
 # input chunker params
 default_no_input_interval_seconds = 60
 default_processor_delay = 1
+
+# pipeline trace, toggled by the "trace" command and written when it's toggled off or on shutdown
+# open the file in https://ui.perfetto.dev or chrome://tracing
+chrome_trace_path = "pipeline.trace.json"
+chrome_trace_on_start = False
+
+# if set, every event of the session is recorded to this file, for benchmarks/replay_journal.py
+journal_path = None
+
+# seconds that tasks get to end by themselves after a stop command before they're cancelled
+task_shutdown_deadline = 5.0
+
+
+def _device():
+    import torch
+
+    device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+    print("Running on " + device.type + ".")
+    return device
+
+
+def _async_openai():
+    from openai import AsyncOpenAI
+
+    # looked up on the module so that a key that was already read isn't read again
+    return AsyncOpenAI(api_key=sys.modules[__name__].OPENAI_API_KEY)
+
+
+_LAZY_SETTINGS = {
+    "device": _device,
+    "DISCORD_BOT_TOKEN": lambda: open("discord_bot_token.txt").read().strip(),
+    "OPENAI_API_KEY": lambda: open("openai_api_key.txt").read().strip(),
+    "ASYNCOPENAI": _async_openai,
+}
+
+
+def __getattr__(name: str) -> Any:
+    # only called for names that aren't set yet, so each value is created once
+    create = _LAZY_SETTINGS.get(name)
+    if create is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = globals()[name] = create()
+    return value
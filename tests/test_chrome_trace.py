@@ -0,0 +1,63 @@
+import asyncio
+import json
+import threading
+
+from event_system import DispatchMode, EventBusSingleton
+from event_system.ChromeTrace import ChromeTraceRecorder, record_span
+from event_system.EventBus import EventBus
+from event_system.events.Pipeline import MessageEvent
+from event_system.events.System import CommandEvent, CommandType
+
+
+def test_chrome_trace_records_dispatches_handlers_and_threads(tmp_path):
+    bus = EventBus()
+    recorder = ChromeTraceRecorder(tmp_path / "pipeline.trace.json")
+
+    def on_message(event: MessageEvent):
+        pass
+
+    async def on_message_async(event: MessageEvent):
+        await asyncio.sleep(0)
+
+    def transcribe():
+        with record_span("transcribe_speech", "inference"):
+            pass
+
+    async def scenario():
+        bus.subscribe(MessageEvent, on_message)
+        bus.subscribe(MessageEvent, on_message_async, mode=DispatchMode.CONCURRENT)
+        recorder.listen(bus)
+
+        await bus.publish(MessageEvent("not recorded"))
+        await bus.publish(CommandEvent(CommandType.TRACE))
+        await bus.publish(MessageEvent("hi"))
+        worker = threading.Thread(target=transcribe, name="transcriber")
+        worker.start()
+        worker.join()
+        await bus.publish(CommandEvent(CommandType.TRACE))
+
+    asyncio.run(scenario())
+
+    assert not recorder.recording
+    assert bus.chrome_trace is None
+    events = json.loads(recorder.path.read_text())["traceEvents"]
+
+    names = {(event["name"], event["ph"]) for event in events}
+    assert ("dispatch MessageEvent", "b") in names
+    assert ("dispatch MessageEvent", "e") in names
+    assert ("transcribe_speech", "X") in names
+    handlers = [event for event in events if event.get("cat") == "handler"]
+    assert [event["ph"] for event in handlers if event["ph"] != "e"] == ["X", "b"]
+    assert all(event["args"] == {"event": "MessageEvent"} for event in handlers if "args" in event)
+
+    thread_names = {event["args"]["name"] for event in events if event["ph"] == "M"}
+    assert "transcriber" in thread_names
+
+
+def test_record_span_does_nothing_while_not_recording():
+    recorder = ChromeTraceRecorder()
+    with record_span("transcribe_speech", "inference"):
+        pass
+
+    assert recorder.to_json()["traceEvents"] == []
+    assert EventBusSingleton.get().chrome_trace is None
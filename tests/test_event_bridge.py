@@ -0,0 +1,81 @@
+import asyncio
+import multiprocessing
+
+from event_system import EventParameterFlag
+from event_system.EventBridge import EventBridge
+from event_system.EventBus import EventBus
+from event_system.EventCodec import EventCodec
+from event_system.events.Inference import TranscriptionRequest, TranscriptionResult
+from event_system.events.Pipeline import MessageEvent, SystemInputType, UserInputEvent
+from event_system.events.System import CommandEvent, CommandType
+
+
+async def wait_until(condition):
+    while not condition():
+        await asyncio.sleep(0.001)
+
+
+def test_codec_round_trips_plain_fields_and_drops_process_local_ones():
+    codec = EventCodec([MessageEvent, UserInputEvent, CommandEvent])
+
+    decoded = codec.decode(codec.encode(UserInputEvent("hi", object(), SystemInputType.VOICE, "beau", 2)))
+    assert decoded == UserInputEvent(
+        "hi", EventParameterFlag.NOT_SPECIFIED, SystemInputType.VOICE, "beau", 2
+    )
+
+    assert codec.decode(codec.encode(CommandEvent(CommandType.STOP))) == CommandEvent(CommandType.STOP)
+
+
+def test_codec_passes_large_bytes_through_shared_memory():
+    codec = EventCodec([TranscriptionRequest], shared_memory_threshold=1024)
+    audio = bytes(range(256)) * 64
+
+    encoded = codec.encode(TranscriptionRequest("stt", 1, audio, 16000, 1.0))
+    assert len(encoded) < len(audio)
+    assert codec.decode(encoded).audio == audio
+
+
+def test_codec_rejects_unregistered_types():
+    codec = EventCodec([MessageEvent])
+    try:
+        codec.encode(CommandEvent(CommandType.STOP))
+    except TypeError:
+        pass
+    else:
+        raise AssertionError("expected a TypeError")
+
+
+def test_bridge_forwards_filtered_events_in_both_directions():
+    codec = EventCodec([TranscriptionRequest, TranscriptionResult])
+    local_end, remote_end = multiprocessing.Pipe()
+    local_bus, remote_bus = EventBus(), EventBus()
+    results: list[TranscriptionResult] = []
+
+    async def transcribe(request: TranscriptionRequest):
+        await remote_bus.publish(
+            TranscriptionResult(request.model, request.request_id, f"{len(request.audio)} bytes", None)
+        )
+
+    remote_bus.subscribe(TranscriptionRequest(model="stt"), transcribe)
+    local_bus.subscribe(TranscriptionResult, results.append)
+
+    async def scenario():
+        loop = asyncio.get_running_loop()
+        local_bus.attach_loop(loop)
+        remote_bus.attach_loop(loop)
+
+        local = EventBridge(local_bus, local_end, codec, forward=[TranscriptionRequest(model="stt")])
+        remote = EventBridge(remote_bus, remote_end, codec, forward=[TranscriptionResult])
+        local.start()
+        remote.start()
+
+        await local_bus.publish(TranscriptionRequest("tts", 0, b"", 16000, 1.0))  # not forwarded
+        await local_bus.publish(TranscriptionRequest("stt", 1, b"\0" * 320, 16000, 1.0))
+        await asyncio.wait_for(wait_until(lambda: results), timeout=5)
+
+        local.close()
+        await asyncio.wait_for(wait_until(remote.disconnected.is_set), timeout=5)
+        remote.close()
+
+    asyncio.run(scenario())
+    assert results == [TranscriptionResult("stt", 1, "320 bytes", None)]
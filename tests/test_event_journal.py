@@ -0,0 +1,87 @@
+import asyncio
+
+from event_system import EventParameterFlag
+from event_system.EventBus import EventBus
+from event_system.EventJournal import EventJournal
+from event_system.events.Audio import AudioDirection, AudioType, SpeakingStateUpdate
+from event_system.events.Pipeline import MessageEvent, SystemInputType, UserInputEvent
+from event_system.events.System import CommandEvent, CommandType
+
+
+def record_session(path) -> list:
+    bus = EventBus()
+    journal = EventJournal(path)
+    pipe = object()
+    events = [
+        SpeakingStateUpdate(True, AudioType.SYSTEM, AudioDirection.INPUT),
+        UserInputEvent("hello", pipe, SystemInputType.VOICE, "beau", 2),
+        MessageEvent("hi ", pipe),
+        MessageEvent("there", pipe),
+        CommandEvent(CommandType.STOP),
+    ]
+
+    async def scenario():
+        journal.record(bus)
+        for event in events:
+            await bus.publish(event)
+            await asyncio.sleep(0.01)
+        journal.stop()
+        await bus.publish(MessageEvent("not recorded"))
+
+    asyncio.run(scenario())
+    return events
+
+
+def test_journal_records_events_with_monotonic_timestamps(tmp_path):
+    path = tmp_path / "session.journal"
+    record_session(path)
+
+    entries = list(EventJournal(path).read())
+    timestamps = [timestamp for timestamp, _ in entries]
+
+    assert [type(event) for _, event in entries] == [
+        SpeakingStateUpdate,
+        UserInputEvent,
+        MessageEvent,
+        MessageEvent,
+        CommandEvent,
+    ]
+    assert entries[1][1] == UserInputEvent(
+        "hello", EventParameterFlag.NOT_SPECIFIED, SystemInputType.VOICE, "beau", 2
+    )
+    assert timestamps == sorted(timestamps)
+    assert timestamps[-1] - timestamps[0] >= 0.03
+
+
+def test_journal_replays_selected_events_with_a_substitute_sender(tmp_path):
+    path = tmp_path / "session.journal"
+    record_session(path)
+
+    bus = EventBus()
+    source = object()
+    chunks: list[str] = []
+    inputs: list[str] = []
+    bus.subscribe(MessageEvent(sender=source), lambda e: chunks.append(e.message))
+    bus.subscribe(UserInputEvent, lambda e: inputs.append(e.message))
+
+    published = asyncio.run(
+        EventJournal(path).replay(bus, speed=None, include=[MessageEvent, UserInputEvent], sender=source)
+    )
+
+    assert published == 3
+    assert chunks == ["hi ", "there"]
+    assert inputs == ["hello"]
+
+
+def test_journal_replays_at_accelerated_speed(tmp_path):
+    path = tmp_path / "session.journal"
+    record_session(path)
+
+    async def timed_replay(speed):
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        await EventJournal(path).replay(EventBus(), speed=speed)
+        return loop.time() - started
+
+    assert asyncio.run(timed_replay(1.0)) >= 0.03
+    assert asyncio.run(timed_replay(100.0)) < 0.03
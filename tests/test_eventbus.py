@@ -1,9 +1,36 @@
 import asyncio
+import gc
+import threading
 
+from event_system import (
+    AtLeast,
+    DispatchMode,
+    Event,
+    EventLane,
+    EventParameterFlag,
+    InSet,
+    Mailbox,
+    NotEqual,
+    OverflowPolicy,
+    Range,
+    Where,
+)
 from event_system.EventBus import EventBus
+from event_system.events.Audio import (
+    AudioDirection,
+    AudioType,
+    SpeakingStateUpdate,
+    VolumeUpdatedEvent,
+)
+from event_system.events.Pipeline import MessageEvent, UserInputEvent
 from event_system.events.System import CommandEvent, CommandType
 
 
+async def wait_until(condition):
+    while not condition():
+        await asyncio.sleep(0.001)
+
+
 def test_eventbus_filtering():
     bus = EventBus()
     calls: list[CommandEvent] = []
@@ -25,3 +52,605 @@ def test_eventbus_filtering():
 
     assert len(calls) == 1
     assert calls[0].command is CommandType.STOP
+
+
+def test_eventbus_indexed_filters_preserve_subscription_order():
+    bus = EventBus()
+    calls: list[str] = []
+    sender_a = object()
+    sender_b = object()
+
+    bus.subscribe(MessageEvent(sender=sender_a), lambda e: calls.append("a"))
+    bus.subscribe(MessageEvent, lambda e: calls.append("any"))
+    bus.subscribe(MessageEvent(sender=sender_b), lambda e: calls.append("b"))
+    bus.subscribe(MessageEvent(message="hi", sender=sender_a), lambda e: calls.append("a-hi"))
+
+    asyncio.run(bus.publish(MessageEvent("hi", sender_a)))
+    assert calls == ["a", "any", "a-hi"]
+
+    calls.clear()
+    asyncio.run(bus.publish(MessageEvent("bye", sender_b)))
+    assert calls == ["any", "b"]
+
+
+def test_eventbus_type_valued_and_unhashable_filters():
+    bus = EventBus()
+    calls: list[MessageEvent] = []
+
+    bus.subscribe(MessageEvent(message=str), calls.append)
+    bus.subscribe(MessageEvent(sender=["unhashable"]), calls.append)
+
+    asyncio.run(bus.publish(MessageEvent(EventParameterFlag.NOT_SPECIFIED, sender=None)))
+    assert calls == []
+
+    asyncio.run(bus.publish(MessageEvent("text")))
+    assert len(calls) == 1
+
+    calls.clear()
+    asyncio.run(bus.publish(MessageEvent(sender=["unhashable"])))
+    assert len(calls) == 1
+
+
+def test_eventbus_unsubscribe_removes_indexed_handlers():
+    bus = EventBus()
+    calls: list[CommandEvent] = []
+
+    bus.subscribe(CommandEvent(CommandType.STOP), calls.append)
+    bus.subscribe(CommandEvent, calls.append)
+    bus.unsubscribe(CommandEvent, calls.append)
+
+    asyncio.run(bus.publish(CommandEvent(CommandType.STOP)))
+    assert calls == []
+
+
+def test_eventbus_concurrent_publish_does_not_wait_on_slow_handlers():
+    bus = EventBus()
+    calls: list[str] = []
+
+    async def slow(event: CommandEvent):
+        await asyncio.sleep(0.05)
+        calls.append("slow")
+
+    async def fast(event: CommandEvent):
+        calls.append("fast")
+
+    bus.subscribe(CommandEvent, slow)
+    bus.subscribe(CommandEvent, fast)
+
+    asyncio.run(bus.publish(CommandEvent(CommandType.STOP)))
+    assert calls == ["slow", "fast"]
+
+    calls.clear()
+    asyncio.run(bus.publish(CommandEvent(CommandType.STOP), mode=DispatchMode.CONCURRENT))
+    assert calls == ["fast", "slow"]
+
+
+def test_eventbus_concurrent_publish_keeps_ordered_handlers_in_order():
+    bus = EventBus()
+    calls: list[str] = []
+
+    async def first(event: CommandEvent):
+        await asyncio.sleep(0.02)
+        calls.append("first")
+
+    async def second(event: CommandEvent):
+        calls.append("second")
+
+    bus.subscribe(CommandEvent, first, ordered=True)
+    bus.subscribe(CommandEvent, second, ordered=True)
+
+    asyncio.run(bus.publish(CommandEvent(CommandType.STOP), mode=DispatchMode.CONCURRENT))
+    assert calls == ["first", "second"]
+
+
+def test_eventbus_concurrent_publish_aggregates_exceptions():
+    bus = EventBus()
+
+    async def broken(event: CommandEvent):
+        raise ValueError("broken")
+
+    async def also_broken(event: CommandEvent):
+        raise KeyError("also broken")
+
+    bus.subscribe(CommandEvent, broken, mode=DispatchMode.CONCURRENT)
+    bus.subscribe(CommandEvent, also_broken, mode=DispatchMode.CONCURRENT)
+
+    try:
+        asyncio.run(bus.publish(CommandEvent(CommandType.STOP)))
+    except ExceptionGroup as group:
+        assert {type(e) for e in group.exceptions} == {ValueError, KeyError}
+    else:
+        raise AssertionError("expected an ExceptionGroup")
+
+
+def test_eventbus_subclass_delivery_is_opt_in():
+    bus = EventBus()
+    exact: list[MessageEvent] = []
+    polymorphic: list[MessageEvent] = []
+
+    bus.subscribe(MessageEvent, exact.append)
+    bus.subscribe(MessageEvent, polymorphic.append, include_subclasses=True)
+
+    asyncio.run(bus.publish(UserInputEvent("hello")))
+    asyncio.run(bus.publish(MessageEvent("hi")))
+
+    assert [type(e) for e in exact] == [MessageEvent]
+    assert [type(e) for e in polymorphic] == [UserInputEvent, MessageEvent]
+
+
+def test_eventbus_dispatch_tables_follow_subscription_changes():
+    bus = EventBus()
+    calls: list[str] = []
+    sender = object()
+
+    def on_any(event: MessageEvent):
+        calls.append("any")
+
+    bus.subscribe(UserInputEvent, lambda e: calls.append("exact"))
+    asyncio.run(bus.publish(UserInputEvent("hello", sender)))
+    assert calls == ["exact"]
+
+    # subscribing to a base class after the table was built must still reach the subclass
+    bus.subscribe(MessageEvent(sender=sender), on_any, include_subclasses=True)
+    calls.clear()
+    asyncio.run(bus.publish(UserInputEvent("hello", sender)))
+    assert calls == ["exact", "any"]
+
+    bus.unsubscribe(MessageEvent, on_any)
+    calls.clear()
+    asyncio.run(bus.publish(UserInputEvent("hello", sender)))
+    assert calls == ["exact"]
+
+
+def test_eventbus_mailbox_decouples_publisher_from_slow_handler():
+    bus = EventBus()
+    handled: list[str] = []
+    release = asyncio.Event()
+
+    async def slow(event: MessageEvent):
+        await release.wait()
+        handled.append(str(event))
+
+    mailbox = Mailbox(maxsize=2, policy=OverflowPolicy.DROP_OLDEST)
+    bus.subscribe(MessageEvent, slow, mailbox=mailbox)
+
+    async def scenario():
+        await bus.publish(MessageEvent("a"))
+        await asyncio.sleep(0)  # let the worker pick up "a"
+        for message in ["b", "c", "d"]:
+            await bus.publish(MessageEvent(message))
+
+        # the worker took "a" off the queue, "b" was dropped to make room for "d"
+        assert handled == []
+        assert mailbox.depth == 2
+        assert mailbox.dropped == 1
+
+        release.set()
+        while mailbox.depth or mailbox.delivered < 3:
+            await asyncio.sleep(0)
+        mailbox.close()
+
+    asyncio.run(scenario())
+    assert handled == ["a", "c", "d"]
+
+
+def test_eventbus_mailbox_coalesces_by_key():
+    bus = EventBus()
+    handled: list[float] = []
+
+    async def on_volume(event: VolumeUpdatedEvent):
+        handled.append(event.volume)
+
+    mailbox = Mailbox(
+        policy=OverflowPolicy.COALESCE, coalesce_key=lambda e: (e.audio_type, e.audio_direction)
+    )
+    bus.subscribe(VolumeUpdatedEvent, on_volume, mailbox=mailbox)
+
+    async def scenario():
+        for volume in [0.1, 0.2, 0.3]:
+            await bus.publish(VolumeUpdatedEvent(volume, AudioType.SYSTEM, AudioDirection.OUTPUT))
+        await bus.publish(VolumeUpdatedEvent(0.9, AudioType.DISCORD, AudioDirection.OUTPUT))
+
+        while mailbox.depth:
+            await asyncio.sleep(0)
+        mailbox.close()
+
+    asyncio.run(scenario())
+    assert handled == [0.3, 0.9]
+    assert mailbox.coalesced == 2
+
+
+def test_eventbus_publish_threadsafe_delivers_in_order():
+    bus = EventBus()
+    received: list[int] = []
+    bus.subscribe(MessageEvent, lambda e: received.append(int(e.message)))
+
+    async def scenario():
+        bus.attach_loop(asyncio.get_running_loop())
+
+        def produce(start: int):
+            for i in range(start, start + 100):
+                bus.publish_threadsafe(MessageEvent(str(i)))
+
+        threads = [threading.Thread(target=produce, args=(n * 100,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        await asyncio.wait_for(wait_until(lambda: len(received) == 400), timeout=5)
+
+    asyncio.run(scenario())
+    assert sorted(received) == list(range(400))
+    # each producer's events stay in the order it published them
+    for n in range(4):
+        own = [v for v in received if n * 100 <= v < (n + 1) * 100]
+        assert own == sorted(own)
+
+
+def test_eventbus_publish_threadsafe_requires_a_loop():
+    bus = EventBus()
+    try:
+        bus.publish_threadsafe(CommandEvent(CommandType.STOP))
+    except RuntimeError:
+        pass
+    else:
+        raise AssertionError("expected a RuntimeError")
+
+
+def test_eventbus_coalesces_threadsafe_events_by_key():
+    bus = EventBus()
+    received: list[VolumeUpdatedEvent] = []
+    bus.subscribe(VolumeUpdatedEvent, received.append)
+
+    async def scenario():
+        bus.attach_loop(asyncio.get_running_loop())
+
+        # one burst, as produced by dragging two sliders within a single loop iteration
+        bus.publish_threadsafe(
+            VolumeUpdatedEvent(0.1, AudioType.SYSTEM, AudioDirection.OUTPUT),
+            VolumeUpdatedEvent(0.5, AudioType.DISCORD, AudioDirection.OUTPUT),
+            VolumeUpdatedEvent(0.2, AudioType.SYSTEM, AudioDirection.OUTPUT),
+            VolumeUpdatedEvent(0.3, AudioType.SYSTEM, AudioDirection.OUTPUT),
+        )
+        await asyncio.sleep(0.01)
+
+    asyncio.run(scenario())
+    assert [(e.audio_type, e.volume) for e in received] == [
+        (AudioType.DISCORD, 0.5),
+        (AudioType.SYSTEM, 0.3),
+    ]
+
+
+def test_eventbus_does_not_coalesce_speaking_state_edges():
+    bus = EventBus()
+    received: list[bool] = []
+    bus.subscribe(SpeakingStateUpdate, lambda e: received.append(e.is_speaking))
+
+    async def scenario():
+        bus.attach_loop(asyncio.get_running_loop())
+        bus.publish_threadsafe(
+            SpeakingStateUpdate(True, AudioType.SYSTEM, AudioDirection.INPUT),
+            SpeakingStateUpdate(False, AudioType.SYSTEM, AudioDirection.INPUT),
+        )
+        await asyncio.sleep(0.01)
+
+    asyncio.run(scenario())
+    assert received == [True, False]
+
+
+def test_mailbox_coalesces_by_declared_key_by_default():
+    bus = EventBus()
+    handled: list[float] = []
+
+    async def on_volume(event: VolumeUpdatedEvent):
+        handled.append(event.volume)
+
+    mailbox = Mailbox(policy=OverflowPolicy.COALESCE)
+    bus.subscribe(VolumeUpdatedEvent, on_volume, mailbox=mailbox)
+
+    async def scenario():
+        await bus.publish(VolumeUpdatedEvent(0.1, AudioType.SYSTEM, AudioDirection.OUTPUT))
+        await bus.publish(VolumeUpdatedEvent(0.5, AudioType.DISCORD, AudioDirection.OUTPUT))
+        await bus.publish(VolumeUpdatedEvent(0.2, AudioType.SYSTEM, AudioDirection.OUTPUT))
+
+        await asyncio.wait_for(wait_until(lambda: mailbox.depth == 0), timeout=5)
+        mailbox.close()
+
+    asyncio.run(scenario())
+    assert handled == [0.2, 0.5]
+
+
+def test_eventbus_concurrent_publish_cancels_running_handlers_on_failure():
+    bus = EventBus()
+    finished: list[str] = []
+
+    async def slow(event: CommandEvent):
+        await asyncio.sleep(0.05)
+        finished.append("slow")
+
+    def broken(event: CommandEvent):
+        raise ValueError("broken")
+
+    bus.subscribe(CommandEvent, slow, mode=DispatchMode.CONCURRENT)
+    bus.subscribe(CommandEvent, broken)
+
+    async def scenario():
+        try:
+            await bus.publish(CommandEvent(CommandType.STOP))
+        except* ValueError as errors:
+            assert len(errors.exceptions) == 1
+        else:
+            raise AssertionError("expected an ExceptionGroup")
+
+    asyncio.run(scenario())
+    assert finished == []
+
+
+def test_mailbox_close_releases_blocked_publishers_without_enqueueing():
+    bus = EventBus()
+    mailbox = Mailbox(1, OverflowPolicy.BLOCK)
+    release = asyncio.Event()
+
+    async def stuck(event: MessageEvent):
+        await release.wait()
+
+    def broken(event: MessageEvent):
+        raise ValueError("broken")
+
+    bus.subscribe(MessageEvent, stuck, mailbox=mailbox)
+
+    async def scenario():
+        await bus.publish(MessageEvent("x"))
+        await asyncio.sleep(0)  # worker takes the first event
+        await bus.publish(MessageEvent("x"))  # fills the mailbox
+        blocked = asyncio.create_task(bus.publish(MessageEvent("x")))
+        await asyncio.sleep(0)
+        assert not blocked.done()
+
+        mailbox.close()
+        await asyncio.wait_for(blocked, timeout=5)
+        assert mailbox.depth == 0
+        assert mailbox.dropped == 1
+
+        await bus.publish(MessageEvent("x"))
+        assert mailbox.depth == 0
+        assert mailbox.dropped == 2
+
+        failing = Mailbox()
+        bus.subscribe(MessageEvent, broken, mailbox=failing)
+        await bus.publish(MessageEvent("x"))
+        await asyncio.sleep(0)
+        assert failing.delivered == 0
+        failing.close()
+
+    asyncio.run(scenario())
+
+
+def test_eventbus_publish_threadsafe_rejects_non_events():
+    bus = EventBus()
+    received: list[CommandEvent] = []
+    bus.subscribe(CommandEvent, received.append)
+
+    async def scenario():
+        bus.attach_loop(asyncio.get_running_loop())
+        try:
+            bus.publish_threadsafe(CommandEvent(CommandType.STOP), "not an event")
+        except TypeError:
+            pass
+        else:
+            raise AssertionError("expected a TypeError")
+
+        bus.publish_threadsafe(CommandEvent(CommandType.STOP))
+        await asyncio.wait_for(wait_until(lambda: received), timeout=5)
+
+    asyncio.run(scenario())
+    assert len(received) == 1
+
+
+def test_mailbox_handles_control_events_before_pending_data():
+    bus = EventBus()
+    handled: list[str] = []
+    release = asyncio.Event()
+
+    async def on_event(event: MessageEvent | CommandEvent):
+        await release.wait()
+        handled.append(event.command.name if isinstance(event, CommandEvent) else str(event))
+
+    mailbox = Mailbox(maxsize=1, policy=OverflowPolicy.DROP_NEWEST)
+    bus.subscribe(MessageEvent, on_event, mailbox=mailbox)
+    bus.subscribe(CommandEvent, on_event, mailbox=mailbox)
+
+    async def scenario():
+        await bus.publish(MessageEvent("a"))
+        await asyncio.sleep(0)  # the worker is busy with "a"
+        await bus.publish(MessageEvent("b"))
+        await bus.publish(MessageEvent("c"))  # dropped, the mailbox is full
+        await bus.publish(CommandEvent(CommandType.STOP))  # control events aren't bounded
+
+        assert mailbox.dropped == 1
+        release.set()
+        await asyncio.wait_for(wait_until(lambda: len(handled) == 3), timeout=5)
+        mailbox.close()
+
+    asyncio.run(scenario())
+    assert handled == ["a", "STOP", "b"]
+
+
+def test_eventbus_publish_threadsafe_dispatches_control_lane_during_slow_data_handler():
+    bus = EventBus()
+    handled: list[str] = []
+    release = asyncio.Event()
+
+    async def slow(event: MessageEvent):
+        await release.wait()
+        handled.append(str(event))
+
+    async def on_stop(event: CommandEvent):
+        handled.append("STOP")
+        release.set()
+
+    bus.subscribe(MessageEvent, slow)
+    bus.subscribe(CommandEvent(CommandType.STOP), on_stop)
+
+    async def scenario():
+        bus.attach_loop(asyncio.get_running_loop())
+        bus.publish_threadsafe(MessageEvent("a"), MessageEvent("b"))
+        await asyncio.sleep(0)  # the data lane is stuck in the handler for "a"
+        bus.publish_threadsafe(CommandEvent(CommandType.STOP))
+        await asyncio.wait_for(wait_until(lambda: len(handled) == 3), timeout=5)
+
+    asyncio.run(scenario())
+    assert handled == ["STOP", "a", "b"]
+
+    stats = {stats.lane: stats for stats in bus.lane_stats()}
+    assert stats[EventLane.CONTROL].dispatched == 1
+    assert stats[EventLane.DATA].dispatched == 2
+    assert stats[EventLane.DATA].max_latency >= stats[EventLane.DATA].mean_latency > 0
+
+
+def test_eventbus_filters_slotted_and_plain_events():
+    class PlainEvent(Event):
+        def __init__(self, message=EventParameterFlag.NOT_SPECIFIED):
+            self.message = message
+
+    bus = EventBus()
+    calls: list[str] = []
+    sender = object()
+
+    bus.subscribe(MessageEvent(sender=sender), lambda e: calls.append(f"slotted {e}"))
+    bus.subscribe(PlainEvent("hi"), lambda e: calls.append(f"plain {e.message}"))
+
+    assert not hasattr(MessageEvent("x", sender), "__dict__")
+
+    async def scenario():
+        await bus.publish(MessageEvent("x", sender))
+        await bus.publish(MessageEvent("y", object()))
+        await bus.publish(PlainEvent("hi"))
+        await bus.publish(PlainEvent("bye"))
+
+    asyncio.run(scenario())
+    assert calls == ["slotted x", "plain hi"]
+
+
+def test_eventbus_instrumentation_records_calls_and_rejections():
+    bus = EventBus()
+    sender = object()
+
+    async def slow(event: MessageEvent):
+        await asyncio.sleep(0.002)
+
+    def for_sender(event: MessageEvent):
+        pass
+
+    bus.subscribe(MessageEvent, slow)
+    bus.subscribe(MessageEvent(sender=sender), for_sender)
+
+    async def scenario():
+        await bus.publish(MessageEvent("untracked"))
+        instrumentation = bus.enable_instrumentation()
+        for _ in range(3):
+            await bus.publish(MessageEvent("a", sender))
+        await bus.publish(MessageEvent("b", object()))
+        return instrumentation
+
+    instrumentation = asyncio.run(scenario())
+    stats = {s.handler.rsplit(".", 1)[-1]: s for s in bus.handler_stats(MessageEvent)}
+
+    assert stats["slow"].calls == 4
+    assert stats["slow"].rejections == 0
+    assert stats["slow"].p50 >= 0.001
+    assert stats["slow"].total_time >= 4 * 0.002 * 0.9
+    assert stats["for_sender"].calls == 3
+    assert stats["for_sender"].rejections == 1
+    assert "for_sender" in instrumentation.report()
+
+    bus.disable_instrumentation()
+    assert bus.handler_stats() == []
+
+
+def test_eventbus_subscription_handle_cancels_subscription():
+    bus = EventBus()
+    calls: list[str] = []
+    mailbox = Mailbox()
+
+    subscription = bus.subscribe(MessageEvent, lambda e: calls.append(e.message))
+    first = bus.subscribe(UserInputEvent, calls.append, mailbox=mailbox)
+    second = bus.subscribe(UserInputEvent(message="x"), calls.append, mailbox=mailbox)
+
+    async def scenario():
+        await bus.publish(MessageEvent("a"))
+        subscription.cancel()
+        subscription.cancel()
+        await bus.publish(MessageEvent("b"))
+
+    asyncio.run(scenario())
+    assert calls == ["a"]
+    assert not subscription.active
+    assert MessageEvent not in bus._subscribers
+
+    first.cancel()
+    assert not mailbox.closed
+    second.cancel()
+    assert mailbox.closed
+
+
+def test_eventbus_weak_subscription_is_removed_with_its_object():
+    bus = EventBus()
+    calls: list[str] = []
+
+    class Listener:
+        async def on_message(self, event: MessageEvent):
+            calls.append(event.message)
+
+    listener = Listener()
+    subscription = bus.subscribe(MessageEvent, listener.on_message, weak=True)
+
+    async def scenario():
+        await bus.publish(MessageEvent("a"))
+        bus.unsubscribe(MessageEvent, Listener().on_message)
+        await bus.publish(MessageEvent("b"))
+
+    asyncio.run(scenario())
+    assert calls == ["a", "b"]
+
+    del listener
+    gc.collect()
+    assert not subscription.active
+    assert MessageEvent not in bus._subscribers
+
+    try:
+        bus.subscribe(MessageEvent, calls.append, weak=True)
+    except TypeError:
+        pass
+    else:
+        raise AssertionError("expected a TypeError")
+
+
+def test_eventbus_predicate_filters():
+    bus = EventBus()
+    calls: list[str] = []
+    sender_a, sender_b, sender_c = object(), object(), object()
+
+    bus.subscribe(MessageEvent(sender=InSet(sender_a, sender_b)), lambda e: calls.append("in"))
+    bus.subscribe(UserInputEvent(priority=AtLeast(2)), lambda e: calls.append("urgent"))
+    bus.subscribe(
+        UserInputEvent(message=NotEqual(""), priority=Range(0, 2)), lambda e: calls.append("low")
+    )
+    bus.subscribe(
+        UserInputEvent(message=Where(str.isupper), priority=EventParameterFlag.NOT_SPECIFIED),
+        lambda e: calls.append("shout"),
+    )
+
+    async def scenario():
+        await bus.publish(MessageEvent("x", sender_a))
+        await bus.publish(MessageEvent("x", sender_b))
+        await bus.publish(MessageEvent("x", sender_c))
+        await bus.publish(UserInputEvent("HEY", priority=2))
+        await bus.publish(UserInputEvent("hey", priority=1))
+        await bus.publish(UserInputEvent("", priority=1))
+
+    asyncio.run(scenario())
+    assert calls == ["in", "in", "urgent", "shout", "low"]
+    # the set of senders is hashed into the index rather than checked per subscription
+    assert "sender" in bus._dispatch_tables[MessageEvent]._indexed
@@ -0,0 +1,82 @@
+import asyncio
+import json
+
+from event_system import EventParameterFlag
+from event_system.EventBus import EventBus
+from event_system.EventCodec import EventCodec
+from event_system.events.Pipeline import MessageEvent, OutputDeliveryEvent
+from event_system.events.System import CommandEvent, CommandType
+from event_system.LatencyTracer import LatencyTracer
+from event_system.Trace import Trace, traced
+
+MS = 1_000_000
+
+
+def make_trace() -> Trace:
+    trace = Trace()
+    trace.record("vad_endpoint", 0, 300 * MS)
+    trace.record("transcription", 300 * MS, 500 * MS)
+    trace.record("llm_first_token", 500 * MS, 900 * MS)
+    trace.record("playback", 1000 * MS, 1500 * MS)
+    return trace
+
+
+def test_trace_reports_time_to_first_audio_and_waterfall():
+    trace = make_trace()
+
+    assert trace.time_to_first_audio() == 1.0
+    lines = trace.waterfall(width=10).splitlines()
+    assert lines[0] == f"turn {trace.trace_id}: 1500.0ms, first audio after 1000.0ms"
+    assert [line.split()[0] for line in lines[1:]] == [
+        "vad_endpoint",
+        "transcription",
+        "llm_first_token",
+        "playback",
+    ]
+    assert lines[-1].endswith("|      ### |")
+
+    spans = trace.to_dict()["spans"]
+    assert spans[1] == {"stage": "transcription", "offset_ms": 300.0, "duration_ms": 200.0}
+
+
+def test_traced_records_spans_only_for_traces():
+    trace = Trace()
+    with traced(trace, "tts_synthesis"):
+        pass
+    with traced(EventParameterFlag.NOT_SPECIFIED, "tts_synthesis"):
+        pass
+
+    assert [span.stage for span in trace.spans] == ["tts_synthesis"]
+    assert trace.spans[0].end_ns >= trace.spans[0].start_ns
+
+
+def test_latency_tracer_collects_delivered_turns(tmp_path):
+    bus = EventBus()
+    path = tmp_path / "latency.json"
+    tracer = LatencyTracer(max_turns=2, path=path)
+    traces = [make_trace() for _ in range(3)]
+
+    async def scenario():
+        tracer.start(bus)
+        for trace in traces:
+            await bus.publish(OutputDeliveryEvent("chunk one", trace=trace))
+            await bus.publish(OutputDeliveryEvent("chunk two", trace=trace))
+        await bus.publish(OutputDeliveryEvent("untraced"))
+        await bus.publish(CommandEvent(CommandType.STOP))
+        tracer.stop()
+
+    asyncio.run(scenario())
+
+    assert tracer.turns() == traces[1:]
+    assert [span.stage for span in traces[2].spans].count("output_delivery") == 2
+    turns = json.loads(path.read_text())["turns"]
+    assert [turn["trace_id"] for turn in turns] == [trace.trace_id for trace in traces[1:]]
+    assert turns[0]["time_to_first_audio_ms"] == 1000.0
+
+
+def test_traces_do_not_cross_process_boundaries():
+    codec = EventCodec([MessageEvent])
+    decoded = codec.decode(codec.encode(MessageEvent("hi", trace=make_trace())))
+
+    assert decoded.message == "hi"
+    assert decoded.trace is EventParameterFlag.NOT_SPECIFIED
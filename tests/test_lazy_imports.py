@@ -0,0 +1,29 @@
+import json
+import subprocess
+import sys
+
+
+def imported_after(code: str) -> set[str]:
+    """Runs `code` in a fresh interpreter and returns the modules it imported."""
+    code += "\nimport json, sys; print(json.dumps(sorted(sys.modules)))"
+    process = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    return set(json.loads(process.stdout.splitlines()[-1]))
+
+
+def test_pipes_are_only_imported_when_used():
+    modules = imported_after(
+        "from pipesys import PipelineGraph\n"
+        "graph = PipelineGraph()\n"
+        "graph.add('pipeline_monitor', 'PipelineMonitor')\n"
+    )
+
+    pipes = {name for name in modules if name.count(".") == 2 and name.startswith("pipesys.")}
+    assert pipes == {"pipesys.outputs.PipelineMonitor"}
+
+
+def test_settings_load_nothing_until_accessed():
+    modules = imported_after("import settings_default")
+
+    assert not {"torch", "openai"} & modules
@@ -0,0 +1,117 @@
+import threading
+import time
+
+import pytest
+
+# ModelRegistry imports numpy, and the shared models implement the Transcriber and TextToSpeech
+# interfaces, which need pydub
+pytest.importorskip("numpy")
+pytest.importorskip("pydub")
+
+from ModelRegistry import ModelRegistry, release_model  # noqa: E402
+from Transcribers import Transcriber  # noqa: E402
+
+
+class FakeTranscriber(Transcriber):
+    loads = 0
+
+    def __init__(self, size: str):
+        FakeTranscriber.loads += 1
+        self.size = size
+        self.active = 0
+        self.overlapped = False
+        self.warmups = 0
+        self.closed = False
+
+    def transcribe_speech(self, speech_buffer, input_gain=1.0) -> str:
+        self.active += 1
+        self.overlapped |= self.active > 1
+        time.sleep(0.01)
+        self.active -= 1
+        return f"{speech_buffer} ({self.size})"
+
+    def warmup(self):
+        self.warmups += 1
+
+    def supports_extra_tagging(self) -> bool:
+        return False
+
+    def get_extra_tagging(self) -> list[str]:
+        return []
+
+    def close(self):
+        self.closed = True
+
+
+def test_model_registry_shares_models_by_backend_and_config():
+    registry = ModelRegistry()
+    mic = registry.transcriber(FakeTranscriber, "small")
+    discord = registry.transcriber(FakeTranscriber, "small")
+    other = registry.transcriber(FakeTranscriber, "large")
+
+    model = mic._model()[0]
+    assert FakeTranscriber.loads == 2
+    assert discord._model()[0] is model
+    assert other._model()[0] is not model
+
+    # the leases serialize calls into the model they share
+    threads = [
+        threading.Thread(target=lease.transcribe_speech, args=("hi",))
+        for lease in (mic, discord, mic)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    mic.warmup()
+    discord.warmup()
+    assert not model.overlapped
+    assert model.warmups == 1
+
+    release_model(mic)
+    assert not model.closed
+    release_model(discord)
+    assert model.closed
+    assert list(registry.loaded().values()) == [1]
+
+    registry.unload_all()
+    assert registry.loaded() == {}
+    with pytest.raises(RuntimeError):
+        other.transcribe_speech("hi")
+
+
+class GatedTranscriber(FakeTranscriber):
+    gate = threading.Event()
+
+    def __init__(self, size: str):
+        if size == "broken":
+            raise OSError("no weights")
+        assert GatedTranscriber.gate.wait(1.0)
+        super().__init__(size)
+
+
+def test_model_registry_loads_models_outside_of_its_lock():
+    registry = ModelRegistry()
+    leases = []
+    threads = [
+        threading.Thread(
+            target=lambda: leases.append(registry.transcriber(GatedTranscriber, "slow"))
+        )
+        for _ in range(2)
+    ]
+    for thread in threads:
+        thread.start()
+
+    # other models load while the slow one is loading
+    fast = registry.transcriber(FakeTranscriber, "fast")
+    with pytest.raises(OSError, match="no weights"):
+        registry.transcriber(GatedTranscriber, "broken")
+    GatedTranscriber.gate.set()
+    for thread in threads:
+        thread.join()
+
+    # the pipes acquiring the slow model waited for it instead of loading it again
+    assert len(leases) == 2
+    assert leases[0]._model()[0] is leases[1]._model()[0]
+    assert sorted(registry.loaded().values()) == [1, 2]
+    release_model(fast)
@@ -0,0 +1,192 @@
+import asyncio
+import time
+
+import pytest
+
+from event_system import EventBusSingleton
+from event_system.events.Pipeline import MessageEvent, UserInputEvent
+from event_system.events.System import PipeReadyEvent, StartupEvent, StartupStage
+from pipesys import Pipe, PipelineConfigError, PipelineGraph
+
+
+class Relay(Pipe):
+    emits_directly = True
+
+    @classmethod
+    async def create(cls, listen_to):
+        self = cls()
+        self.subscribe_to_message_sources(listen_to, self.on_message)
+        return self
+
+    async def on_message(self, event: MessageEvent):
+        await self.emit(MessageEvent(f"relayed {event.message}", self))
+
+
+class Recorder(Pipe):
+    @classmethod
+    async def create(cls, listen_to, calls: list, tag: str = "recorder"):
+        self = cls()
+        self.calls = calls
+        self.tag = tag
+        self.subscribe_to_message_sources(listen_to, self.on_message)
+        return self
+
+    def on_message(self, event: MessageEvent):
+        self.calls.append((self.tag, event.message))
+
+
+def test_pipeline_graph_connects_static_edges_directly():
+    calls: list = []
+    graph = PipelineGraph()
+    relay = graph.add("relay", Relay, listen_to=UserInputEvent)
+    graph.add("direct", Recorder, listen_to=relay, calls=calls, tag="direct")
+
+    async def scenario():
+        pipes = await graph.build()
+        monitor = EventBusSingleton.subscribe(
+            MessageEvent(sender=pipes["relay"]), lambda e: calls.append(("bus", e.message))
+        )
+        await EventBusSingleton.publish(UserInputEvent("hi"))
+
+        monitor.cancel()
+        for pipe in pipes.values():
+            pipe.close()
+        return pipes
+
+    pipes = asyncio.run(scenario())
+    assert calls == [("direct", "relayed hi"), ("bus", "relayed hi")]
+    assert pipes["relay"]._direct_listeners == {}
+
+
+def test_pipeline_graph_rejects_invalid_graphs_before_creating_pipes():
+    created = []
+    graph = PipelineGraph()
+    graph.add("a", Recorder, listen_to="b", calls=created, colour="red")
+    graph.add("b", Recorder, listen_to="a", calls=created)
+    graph.add("c", Recorder, listen_to="missing", calls=created)
+    graph.add("d", Recorder, calls=created)
+
+    with pytest.raises(PipelineConfigError) as error:
+        asyncio.run(graph.build())
+
+    message = str(error.value)
+    assert "no option 'colour'" in message
+    assert "unknown pipe 'missing'" in message
+    assert "requires 'listen_to'" in message
+    assert "cycle" in message
+    assert all(node.pipe is None for node in graph.nodes.values())
+
+
+def test_pipeline_graph_rejects_listening_to_a_pipe_twice():
+    graph = PipelineGraph()
+    relay = graph.add("relay", Relay, listen_to=UserInputEvent)
+    graph.add("recorder", Recorder, listen_to=[relay, "relay"], calls=[])
+
+    with pytest.raises(PipelineConfigError, match="recorder: listens to 'relay' more than once"):
+        graph.validate()
+
+
+class Broken(Pipe):
+    @classmethod
+    async def create(cls, listen_to):
+        raise RuntimeError("no device")
+
+
+def test_pipeline_graph_closes_created_pipes_when_a_factory_fails():
+    calls: list = []
+    graph = PipelineGraph()
+    graph.add("recorder", Recorder, listen_to=UserInputEvent, calls=calls)
+    graph.add("broken", Broken, listen_to="recorder")
+
+    async def scenario():
+        with pytest.raises(RuntimeError, match="no device"):
+            await graph.build()
+        await EventBusSingleton.publish(UserInputEvent("hi"))
+
+    asyncio.run(scenario())
+    assert calls == []
+    assert all(node.pipe is None for node in graph.nodes.values())
+
+
+def test_pipeline_graph_from_dict_resolves_names():
+    graph = PipelineGraph.from_dict(
+        {
+            "pipes": {
+                "monitor": {"type": "PipelineMonitor", "listen_to": "MessageEvent"},
+                "relay": {"type": "tests.test_pipeline_graph:Relay", "listen_to": ["UserInputEvent"]},
+            }
+        }
+    )
+    assert [node.name for node in graph.validate()] == ["monitor", "relay"]
+    assert graph.nodes["relay"].listen_to == [UserInputEvent]
+
+    with pytest.raises(PipelineConfigError, match="unknown pipe type 'Nope'"):
+        PipelineGraph.from_dict({"pipes": {"x": {"type": "Nope"}}})
+
+
+class Window(Recorder):
+    requires_gui = True
+
+
+def test_pipeline_graph_requires_gui_only_for_gui_pipes():
+    graph = PipelineGraph()
+    graph.add("monitor", "PipelineMonitor", listen_to=MessageEvent)
+    assert not graph.requires_gui
+
+    graph.add("window", Window, listen_to="monitor", calls=[])
+    assert graph.requires_gui
+
+    with pytest.raises(PipelineConfigError, match="x: unknown pipe type 'Nope'"):
+        graph.add("x", "Nope")
+
+
+class WarmingPipe(Pipe):
+    @classmethod
+    async def create(cls, seconds: float, critical: bool = True, fails: bool = False):
+        self = cls()
+        self.seconds = seconds
+        self.warmup_critical = critical
+        self.fails = fails
+        return self
+
+    async def warmup(self):
+        started = time.perf_counter()
+        await asyncio.get_running_loop().run_in_executor(None, time.sleep, self.seconds)
+        self.warmed_up = (started, time.perf_counter())
+        if self.fails:
+            raise RuntimeError("no model")
+
+
+def test_pipeline_graph_warms_up_concurrently_and_gates_ready_on_critical_pipes(capsys):
+    events: list = []
+    graph = PipelineGraph()
+    graph.add("tts", WarmingPipe, seconds=0.2)
+    graph.add("stt", WarmingPipe, seconds=0.2)
+    graph.add("broken", WarmingPipe, seconds=0, fails=True)
+    graph.add("background", WarmingPipe, seconds=0.5, critical=False)
+
+    async def scenario():
+        subscriptions = [
+            EventBusSingleton.subscribe(PipeReadyEvent, lambda e: events.append((e.name, e.warm))),
+            EventBusSingleton.subscribe(
+                StartupEvent(StartupStage.READY), lambda e: events.append("READY")
+            ),
+        ]
+        pipes = await graph.build()
+        seconds = await graph.warm_up()
+        await asyncio.sleep(0.5)
+        for subscription in subscriptions:
+            subscription.cancel()
+        return pipes, seconds
+
+    pipes, seconds = asyncio.run(scenario())
+
+    # both 0.2s warmups ran at the same time, and READY didn't wait for the background pipe
+    tts_started, tts_ended = pipes["tts"].warmed_up
+    stt_started, stt_ended = pipes["stt"].warmed_up
+    assert tts_started < stt_ended and stt_started < tts_ended
+    assert seconds >= 0.2
+    assert events[0] == ("broken", False)
+    assert sorted(events[1:3]) == [("stt", True), ("tts", True)]
+    assert events[3:] == ["READY", ("background", True)]
+    assert "Warming up broken failed" in capsys.readouterr().out
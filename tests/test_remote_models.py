@@ -0,0 +1,40 @@
+import asyncio
+
+import pytest
+
+# RemoteModels implements the Transcriber interface, which needs numpy and pydub
+pytest.importorskip("numpy")
+pytest.importorskip("pydub")
+
+from event_system import EventBusSingleton  # noqa: E402
+from event_system.events.Inference import TranscriptionRequest, TranscriptionResult  # noqa: E402
+from RemoteModels import RemoteModelError, RemoteModelProcess  # noqa: E402
+
+
+def create_model():
+    return "model"
+
+
+def handle(model, request: TranscriptionRequest) -> TranscriptionResult:
+    if not request.audio:
+        raise ValueError("no audio")
+    return TranscriptionResult(request.model, request.request_id, f"{model}: {len(request.audio)}")
+
+
+def test_a_failed_request_raises_the_child_error_and_the_process_keeps_serving():
+    async def scenario():
+        loop = asyncio.get_running_loop()
+        EventBusSingleton.get().attach_loop(loop)
+        process = RemoteModelProcess(create_model, TranscriptionRequest, TranscriptionResult, handle)
+        try:
+            await loop.run_in_executor(None, process.wait_until_ready)
+
+            with pytest.raises(RemoteModelError, match="ValueError: no audio"):
+                await loop.run_in_executor(None, lambda: process.request(audio=b""))
+
+            result = await loop.run_in_executor(None, lambda: process.request(audio=b"1234"))
+            assert result.text == "model: 4"
+        finally:
+            process.close()
+
+    asyncio.run(scenario())
@@ -0,0 +1,27 @@
+import asyncio
+import sys
+
+import Runtime
+
+
+async def loop_type() -> type:
+    return type(asyncio.get_running_loop())
+
+
+def default_loop_type() -> type:
+    loop = asyncio.new_event_loop()
+    loop.close()
+    return type(loop)
+
+
+def test_run_headless_uses_the_stock_loop_without_qt():
+    assert Runtime.run(loop_type) is default_loop_type()
+    assert "PyQt5" not in sys.modules
+
+
+def test_run_headless_falls_back_without_uvloop(monkeypatch, capsys):
+    # None in sys.modules makes the import fail, as if uvloop weren't installed
+    monkeypatch.setitem(sys.modules, "uvloop", None)
+
+    assert Runtime.run(loop_type, use_uvloop=True) is default_loop_type()
+    assert "uvloop isn't installed" in capsys.readouterr().out
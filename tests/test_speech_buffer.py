@@ -0,0 +1,63 @@
+import threading
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from SpeechBuffer import SpeechBuffer  # noqa: E402
+
+
+def frame(*samples: int) -> bytes:
+    return np.array(samples, dtype=np.int16).tobytes()
+
+
+def test_utterance_includes_pre_roll_and_is_a_view():
+    buffer = SpeechBuffer(pre_roll_samples=2, max_utterance_samples=4)
+    buffer.append(frame(1, 2))
+    buffer.append(frame(3, 4))
+    buffer.start_utterance()
+    buffer.append(frame(5, 6))
+
+    utterance = buffer.utterance()
+    assert utterance.tolist() == [3, 4, 5, 6]
+    assert np.shares_memory(utterance, buffer._samples)
+    assert not utterance.flags.writeable
+
+
+def test_utterances_stay_contiguous_across_the_end_of_the_ring():
+    buffer = SpeechBuffer(pre_roll_samples=1, max_utterance_samples=4)
+    for i in range(7):
+        buffer.append(frame(i))
+    buffer.start_utterance()
+    buffer.append(frame(7, 8, 9))
+
+    assert buffer.utterance().tolist() == [6, 7, 8, 9]
+    assert not buffer.full
+
+    buffer.append(frame(10))
+    assert buffer.full
+    assert buffer.utterance().tolist() == [6, 7, 8, 9, 10]
+
+    buffer.end_utterance()
+    buffer.start_utterance(pre_roll=False)
+    buffer.append(frame(11))
+    assert buffer.utterance().tolist() == [11]
+
+
+def test_appending_waits_for_held_utterances_to_be_released():
+    buffer = SpeechBuffer(pre_roll_samples=0, max_utterance_samples=2, headroom_samples=2)
+    buffer.start_utterance()
+    buffer.append(frame(1, 2))
+    held = buffer.hold_utterance()
+    buffer.append(frame(3, 4))
+
+    appended = threading.Event()
+    appender = threading.Thread(target=lambda: (buffer.append(frame(5)), appended.set()))
+    appender.start()
+    # the next sample would overwrite the held utterance
+    assert not appended.wait(0.05)
+    assert held.tolist() == [1, 2]
+
+    buffer.release()
+    assert appended.wait(1.0)
+    appender.join()
@@ -0,0 +1,21 @@
+from event_system.events.Pipeline import PartialTranscriptEvent
+from StablePrefix import StablePrefix
+
+
+def test_words_are_committed_once_transcripts_agree_on_them():
+    prefix = StablePrefix()
+
+    assert prefix.update(" The quick") == ("", "The quick")
+    assert prefix.update(" The quick brown fax") == ("The quick", "brown fax")
+    # a revised word isn't committed until the next transcript agrees with it
+    assert prefix.update(" The quick brown fox,") == ("The quick brown", "fox,")
+    assert prefix.update(" the quick brown fox jumps") == ("The quick brown fox", "jumps")
+
+    # committed words are kept even if the final transcript revises them
+    assert prefix.finalize(" The quick brawn fox jumped.") == "The quick brown fox jumped."
+    assert prefix.finalized
+
+
+def test_partial_transcript_reads_as_the_whole_hypothesis():
+    assert str(PartialTranscriptEvent("The quick", "brown fox")) == "The quick brown fox"
+    assert str(PartialTranscriptEvent("", "The")) == "The"
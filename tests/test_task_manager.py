@@ -0,0 +1,76 @@
+import asyncio
+
+from event_system import EventBusSingleton
+from event_system.events.System import (
+    CommandEvent,
+    CommandType,
+    RestartPolicy,
+    TaskCreatedEvent,
+)
+from TaskManager import TaskManager, TaskState
+
+
+def test_task_manager_restarts_failed_tasks_with_backoff(capsys):
+    runs = []
+
+    async def flaky():
+        runs.append(asyncio.get_running_loop().time())
+        if len(runs) < 4:
+            raise RuntimeError(f"crash {len(runs)}")
+
+    async def scenario():
+        manager = TaskManager(initial_backoff=0.05)
+        await EventBusSingleton.publish(
+            TaskCreatedEvent(asyncio.create_task(flaky()), "flaky", RestartPolicy.ON_FAILURE, flaky)
+        )
+        await manager.run()
+        manager.close()
+        return manager.health()
+
+    [health] = asyncio.run(scenario())
+
+    assert health.state is TaskState.FINISHED
+    assert (health.restarts, health.failures) == (3, 3)
+    assert health.last_error == "RuntimeError('crash 3')"
+    # the delays double: 50ms, 100ms, 200ms
+    delays = [later - earlier for earlier, later in zip(runs, runs[1:])]
+    assert delays[0] >= 0.045 and delays[1] >= 0.095 and delays[2] >= 0.195
+    assert "Task for flaky failed" in capsys.readouterr().out
+
+
+def test_task_manager_cancels_tasks_after_the_shutdown_deadline():
+    stopped = []
+
+    async def forever():
+        while True:
+            await asyncio.sleep(0.01)
+
+    async def stops():
+        while not stopped:
+            await asyncio.sleep(0.01)
+
+    async def scenario():
+        manager = TaskManager(shutdown_deadline=0.1)
+        on_stop = EventBusSingleton.subscribe(
+            CommandEvent(CommandType.STOP), lambda e: stopped.append(e)
+        )
+        for name, task in (("forever", forever), ("stops", stops)):
+            await EventBusSingleton.publish(
+                TaskCreatedEvent(asyncio.create_task(task()), name, RestartPolicy.ALWAYS, task)
+            )
+
+        async def stop_soon():
+            await asyncio.sleep(0.05)
+            await EventBusSingleton.publish(CommandEvent(CommandType.STOP))
+
+        started = asyncio.get_running_loop().time()
+        await asyncio.gather(manager.run(), stop_soon())
+        elapsed = asyncio.get_running_loop().time() - started
+        manager.close()
+        on_stop.cancel()
+        return elapsed, {health.name: health.state for health in manager.health()}
+
+    elapsed, states = asyncio.run(scenario())
+
+    assert elapsed < 0.5
+    assert states == {"forever": TaskState.CANCELLED, "stops": TaskState.FINISHED}